@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+
+from ansible_collections.begoingto.aws_identity_center.plugins.plugin_utils.provisioning import \
+    DEFERRED_FACT, deferred_provisioning, defer_provisioning
+
+
+class ActionModule(ActionBase):
+    """
+    Run idc_permission_set and, when it deferred the provisioning of the permission set,
+    record the set in the deferred provisioning registry of the host, on the controller.
+    """
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+
+        result = merge_hash(result, self._execute_module(task_vars=task_vars))
+        if result.get('provisioning_deferred'):
+            registry = defer_provisioning(
+                deferred_provisioning(task_vars), self._task.args['instance_arn'], result['permission_set_arn']
+            )
+            result['ansible_facts'] = {DEFERRED_FACT: registry}
+        return result
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+
+from ansible_collections.begoingto.aws_identity_center.plugins.plugin_utils.provisioning import \
+    DEFERRED_FACT, deferred_provisioning
+
+
+class ActionModule(ActionBase):
+    """
+    Run idc_permission_set_provision on the permission sets deferred by earlier tasks, unless
+    permission_set_arns is given, and empty their registry once they are provisioned.
+    """
+
+    def run(self, tmp=None, task_vars=None):
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+
+        module_args = self._task.args.copy()
+        registry = None
+        if module_args.get('permission_set_arns') is None:
+            registry = deferred_provisioning(task_vars)
+            module_args['permission_set_arns'] = registry.get(module_args.get('instance_arn'), [])
+
+        result = merge_hash(result, self._execute_module(module_args=module_args, task_vars=task_vars))
+        if registry is not None and not result.get('failed') and not self._task.check_mode:
+            registry.pop(module_args.get('instance_arn'), None)
+            result['ansible_facts'] = {DEFERRED_FACT: registry}
+        return result
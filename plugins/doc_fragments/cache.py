@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+class ModuleDocFragment:
+    # Options of the persistent lookup cache shared by the modules of this collection
+    DOCUMENTATION = r"""
+options:
+  cache:
+    description:
+      - Keep the results of expensive lookups in a file on the executing host so that later tasks reuse them.
+      - Set to V(false) to always query AWS.
+    type: bool
+    default: true
+  cache_ttl:
+    description:
+      - Number of seconds a cached lookup stays valid.
+    type: int
+    default: 3600
+  cache_dir:
+    description:
+      - Directory holding the cache files.
+      - Defaults to C(~/.cache/begoingto.aws_identity_center).
+    type: path
+    required: false
+"""
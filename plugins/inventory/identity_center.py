@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+name: identity_center
+short_description: AWS IAM Identity Center inventory source
+version_added_collection: begoingto.aws_identity_center
+extends_documentation_fragment:
+  - inventory_cache
+  - constructed
+  - amazon.aws.boto3
+  - amazon.aws.common.plugins
+  - amazon.aws.region.plugins
+  - amazon.aws.assume_role.plugins
+description:
+  - Load the users, groups, permission sets and accounts of AWS IAM Identity Center into the inventory.
+  - Every user becomes a host of the C(idc_users) group and every organization account a host of the
+    C(idc_accounts) group. Every Identity Center group becomes an inventory group named C(idc_group_<display name>)
+    containing its member users.
+  - The permission sets are set on the C(identity_center) group as the C(idc_permission_sets) variable, keyed by name.
+  - Permission sets are described and group memberships are listed concurrently.
+  - Set O(cache=true) to reuse the crawl until O(cache_timeout) expires.
+  - The inventory file must end with C(identity_center.yml) or C(identity_center.yaml).
+  - "The hosts are directory entries, not machines; run plays against them with C(connection: local)."
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  plugin:
+    description: Token that ensures this is a source file for the plugin.
+    required: true
+    choices: ['begoingto.aws_identity_center.identity_center']
+  instance_arn:
+    description:
+      - The ARN of the IAM Identity Center instance.
+      - Defaults to the first instance returned by C(ListInstances).
+    type: str
+  include:
+    description:
+      - The kinds of entities to load.
+    type: list
+    elements: str
+    choices: ['users', 'groups', 'permission_sets', 'accounts']
+    default: ['users', 'groups', 'permission_sets', 'accounts']
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls used to describe permission sets and list group memberships.
+    type: int
+    default: 10
+"""
+
+EXAMPLES = r"""
+# my_inventory.identity_center.yml
+plugin: begoingto.aws_identity_center.identity_center
+region: us-east-1
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/inventory
+cache_timeout: 28800
+
+---
+# Only users and groups, with a group per user type
+plugin: begoingto.aws_identity_center.identity_center
+region: us-east-1
+include:
+  - users
+  - groups
+keyed_groups:
+  - key: user_type
+    prefix: idc_user_type
+"""
+
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from ansible_collections.amazon.aws.plugins.plugin_utils.inventory import AWSInventoryBase
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import describe_permission_sets
+
+try:
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:
+    pass  # caught by AWSInventoryBase.require_aws_sdk
+
+
+def _paginate(client, operation, key, **params):
+    return [item for page in client.get_paginator(operation).paginate(**params) for item in page.get(key, [])]
+
+
+def _isoformat(item, *keys):
+    """Replace datetimes with ISO 8601 strings, so fresh and cached results look the same."""
+    for key in keys:
+        if hasattr(item.get(key), 'isoformat'):
+            item[key] = item[key].isoformat()
+    return item
+
+
+def find_instance(sso_admin, instance_arn=None):
+    """Return the Identity Center instance with this ARN, or the first one when no ARN is given."""
+    for instance in _paginate(sso_admin, 'list_instances', 'Instances'):
+        if instance_arn is None or instance['InstanceArn'] == instance_arn:
+            return instance
+    return None
+
+
+def list_groups_with_members(identitystore, identity_store_id, max_workers=10):
+    groups = _paginate(identitystore, 'list_groups', 'Groups', IdentityStoreId=identity_store_id)
+
+    def member_ids(group):
+        memberships = _paginate(identitystore, 'list_group_memberships', 'GroupMemberships',
+                                IdentityStoreId=identity_store_id, GroupId=group['GroupId'])
+        return [membership['MemberId']['UserId'] for membership in memberships if 'UserId' in membership['MemberId']]
+
+    for group, members, error in run_concurrently(member_ids, groups, max_workers=max_workers):
+        if error is not None:
+            raise error
+        group['MemberIds'] = members
+    return groups
+
+
+class InventoryModule(AWSInventoryBase):
+    NAME = 'begoingto.aws_identity_center.identity_center'
+
+    INVENTORY_FILE_SUFFIXES = ('identity_center.yml', 'identity_center.yaml')
+
+    def _query(self, instance_arn, include, max_workers):
+        retry = AWSRetry.jittered_backoff()
+        sso_admin = self.client('sso-admin', retry_decorator=retry)
+        instance = find_instance(sso_admin, instance_arn)
+        if instance is None:
+            self.fail_aws(f"No IAM Identity Center instance found{' with ARN ' + instance_arn if instance_arn else ''}")
+
+        identity_store_id = instance['IdentityStoreId']
+        identitystore = self.client('identitystore', retry_decorator=retry)
+        results = {'instance_arn': instance['InstanceArn'], 'identity_store_id': identity_store_id}
+
+        if 'users' in include:
+            results['users'] = _paginate(identitystore, 'list_users', 'Users', IdentityStoreId=identity_store_id)
+        if 'groups' in include:
+            results['groups'] = list_groups_with_members(identitystore, identity_store_id, max_workers)
+        if 'permission_sets' in include:
+            results['permission_sets'] = [
+                _isoformat(permission_set, 'CreatedDate')
+                for permission_set in describe_permission_sets(sso_admin, instance['InstanceArn'], max_workers)
+            ]
+        if 'accounts' in include:
+            organizations = self.client('organizations', retry_decorator=retry)
+            results['accounts'] = [
+                _isoformat(account, 'JoinedTimestamp')
+                for account in _paginate(organizations, 'list_accounts', 'Accounts')
+            ]
+        return results
+
+    def _add_host(self, host, group, hostvars):
+        self.inventory.add_host(host, group=group)
+        for name, value in hostvars.items():
+            self.inventory.set_variable(host, name, value)
+
+        strict = self.get_option('strict')
+        self._set_composite_vars(self.get_option('compose'), hostvars, host, strict=strict)
+        self._add_host_to_composed_groups(self.get_option('groups'), hostvars, host, strict=strict)
+        self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, host, strict=strict)
+
+    def _populate(self, results):
+        self.inventory.add_group('identity_center')
+        self.inventory.set_variable('identity_center', 'idc_instance_arn', results['instance_arn'])
+        self.inventory.set_variable('identity_center', 'idc_identity_store_id', results['identity_store_id'])
+
+        user_names = {}
+        if 'users' in results:
+            self.inventory.add_group('idc_users')
+            self.inventory.add_child('identity_center', 'idc_users')
+            for user in results['users']:
+                user_names[user['UserId']] = user['UserName']
+                self._add_host(user['UserName'], 'idc_users', camel_dict_to_snake_dict(user))
+
+        for group in results.get('groups', []):
+            group_name = self.inventory.add_group(self._sanitize_group_name(f"idc_group_{group['DisplayName']}"))
+            self.inventory.set_variable(group_name, 'idc_group_id', group['GroupId'])
+            self.inventory.set_variable(group_name, 'idc_group_display_name', group['DisplayName'])
+            self.inventory.set_variable(group_name, 'idc_group_description', group.get('Description'))
+            for member_id in group['MemberIds']:
+                if member_id in user_names:
+                    self.inventory.add_host(user_names[member_id], group=group_name)
+
+        if 'permission_sets' in results:
+            self.inventory.set_variable('identity_center', 'idc_permission_sets', {
+                permission_set['Name']: camel_dict_to_snake_dict(permission_set)
+                for permission_set in results['permission_sets']
+            })
+
+        if 'accounts' in results:
+            self.inventory.add_group('idc_accounts')
+            self.inventory.add_child('identity_center', 'idc_accounts')
+            for account in results['accounts']:
+                self._add_host(account['Id'], 'idc_accounts', camel_dict_to_snake_dict(account))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super().parse(inventory, loader, path, cache=cache)
+
+        result_was_cached, results = self.get_cached_result(path, cache)
+        if not result_was_cached:
+            try:
+                results = self._query(
+                    self.get_option('instance_arn'), self.get_option('include'), self.get_option('max_workers')
+                )
+            except (BotoCoreError, ClientError) as e:
+                self.fail_aws("Failed to query IAM Identity Center", exception=e)
+
+        self._populate(results)
+        self.update_cached_result(path, cache, results)
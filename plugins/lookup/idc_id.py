@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+name: idc_id
+short_description: Resolve Identity Center user, group and permission set names to IDs and ARNs
+version_added_collection: begoingto.aws_identity_center
+description:
+  - Resolve user names to user IDs, group display names to group IDs or permission set names to permission set ARNs
+    on the controller, without running a module on the target.
+  - User and group names are resolved concurrently with C(GetUserId) and C(GetGroupId).
+  - The name to ARN map of the permission sets is crawled once, with the permission sets described concurrently, and
+    shared with M(begoingto.aws_identity_center.idc_permission_set), which keeps it up to date.
+  - Results are kept in memory for the current process and in a cache file shared by every task and host of the run,
+    so a name is resolved at most once while the cache is valid.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  _terms:
+    description:
+      - The names to resolve.
+    required: true
+  kind:
+    description:
+      - What the terms are the names of.
+    type: str
+    choices: ['user', 'group', 'permission_set']
+    default: user
+  identity_store_id:
+    description:
+      - AWS identity store ID.
+      - Required for users and groups unless O(instance_arn) is set, in which case it is looked up from the instance.
+    type: str
+  instance_arn:
+    description:
+      - The ARN of the IAM Identity Center instance.
+      - Required for permission sets.
+    type: str
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls.
+    type: int
+    default: 10
+  on_missing:
+    description:
+      - Action to take when a name does not exist.
+      - V(error) fails the lookup, V(warn) returns V(None) with a warning and V(skip) returns V(None).
+    type: str
+    choices: ['error', 'warn', 'skip']
+    default: error
+extends_documentation_fragment:
+  - amazon.aws.boto3
+  - amazon.aws.common.plugins
+  - amazon.aws.region.plugins
+  - begoingto.aws_identity_center.cache
+"""
+
+EXAMPLES = r"""
+- name: Assign a permission set to a group without resolving the IDs in separate tasks
+  begoingto.aws_identity_center.permission_assignment:
+    instance_arn: "{{ instance_arn }}"
+    target_id: "{{ item.account_id }}"
+    principal_type: GROUP
+    principal_id: "{{ lookup('begoingto.aws_identity_center.idc_id', item.group, kind='group', instance_arn=instance_arn) }}"
+    permission_set_arn: >-
+      {{ lookup('begoingto.aws_identity_center.idc_id', item.permission_set, kind='permission_set',
+                instance_arn=instance_arn) }}
+  loop: "{{ assignments }}"
+
+- name: Resolve several users at once
+  ansible.builtin.debug:
+    msg: "{{ query('begoingto.aws_identity_center.idc_id', 'jane.doe', 'john.doe', identity_store_id='d-1234567890') }}"
+"""
+
+RETURN = r"""
+_raw:
+  description:
+    - The user IDs, group IDs or permission set ARNs, in the order of the terms.
+    - V(None) for the names that do not exist when O(on_missing) is not V(error).
+  type: list
+  elements: str
+"""
+
+from ansible_collections.amazon.aws.plugins.plugin_utils.lookup import AWSLookupBase
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import FileCache
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import IdentityResolver
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import \
+    get_identity_store_id, find_permission_set_arns
+
+try:
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:
+    pass  # caught by AWSLookupBase.require_aws_sdk
+
+
+class LookupModule(AWSLookupBase):
+    def _identity_store_id(self):
+        identity_store_id = self.get_option('identity_store_id')
+        if identity_store_id:
+            return identity_store_id
+
+        instance_arn = self.get_option('instance_arn')
+        if not instance_arn:
+            self.fail_aws("identity_store_id or instance_arn is required to resolve users and groups")
+        identity_store_id = get_identity_store_id(
+            self.client('sso-admin'), instance_arn, self.region, FileCache.from_plugin(self, 'identity_store_ids')
+        )
+        if identity_store_id is None:
+            self.fail_aws(f"No IAM Identity Center instance found with ARN {instance_arn}")
+        return identity_store_id
+
+    def _resolve_principals(self, kind, names, cache):
+        """Resolve user or group names, first from the cache file, then concurrently with GetUserId/GetGroupId."""
+        resolver = IdentityResolver(self.client('identitystore'), self._identity_store_id())
+        return resolver.resolve_names(kind, names, cache, self.get_option('max_workers'))
+
+    def _resolve_permission_sets(self, names, cache):
+        """Resolve permission set names from the name -> ARN index of the instance, crawling it at most once."""
+        instance_arn = self.get_option('instance_arn')
+        if not instance_arn:
+            self.fail_aws("instance_arn is required to resolve permission sets")
+        return find_permission_set_arns(
+            self.client('sso-admin'), instance_arn, names, self.region, cache, self.get_option('max_workers')
+        )
+
+    def run(self, terms, variables=None, **kwargs):
+        super().run(terms, variables, **kwargs)
+
+        kind = self.get_option('kind')
+        names = list(dict.fromkeys(terms))
+        try:
+            if kind == 'permission_set':
+                resolved = self._resolve_permission_sets(names, FileCache.from_plugin(self, 'permission_set_arns'))
+            else:
+                resolved = self._resolve_principals(kind, names, FileCache.from_plugin(self, 'idc_id'))
+        except (BotoCoreError, ClientError) as e:
+            self.fail_aws(f"Failed to resolve {kind} names", exception=e)
+
+        missing = [name for name in names if resolved[name] is None]
+        if missing:
+            on_missing = self.get_option('on_missing')
+            message = f"No {kind.replace('_', ' ')} found with name: {', '.join(missing)}"
+            if on_missing == 'error':
+                self.fail_aws(message)
+            elif on_missing == 'warn':
+                self.warn(message)
+
+        return [resolved[name] for name in terms]
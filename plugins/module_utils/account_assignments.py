@@ -0,0 +1,239 @@
+import math
+
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.request_status import \
+    track_requests, latency_percentiles
+
+
+def assignment_options():
+    """Argument spec of one account assignment, as accepted by the bulk assignment modules."""
+    return dict(
+        target_id=dict(type='str', required=True),
+        permission_set_arn=dict(type='str', required=True),
+        principal_type=dict(type='str', required=True, choices=['USER', 'GROUP']),
+        principal_id=dict(type='str', required=True),
+        state=dict(type='str', default='present', choices=['present', 'absent']),
+    )
+
+
+def assignment_key(assignment):
+    """Identity of an assignment given as module params: (target_id, permission_set_arn, principal_type, principal_id)."""
+    return (assignment['target_id'], assignment['permission_set_arn'],
+            assignment['principal_type'], assignment['principal_id'])
+
+
+@AWSRetry.jittered_backoff()
+def list_assigned_principals(client, instance_arn, account_id, permission_set_arn):
+    """
+    Paginate list_account_assignments for one (account, permission set) and return the
+    set of (principal_type, principal_id) assigned there.
+    """
+    principals = set()
+    paginator = client.get_paginator('list_account_assignments')
+    for page in paginator.paginate(InstanceArn=instance_arn, AccountId=account_id, PermissionSetArn=permission_set_arn):
+        for assignment in page.get('AccountAssignments', []):
+            principals.add((assignment['PrincipalType'], assignment['PrincipalId']))
+    return principals
+
+
+def snapshot_assignments(client, instance_arn, targets, max_workers=10):
+    """
+    Fetch the assigned principals of every (account, permission set) in targets concurrently,
+    listing each pair once.
+
+    Returns a dict of (account_id, permission_set_arn) -> set of (principal_type, principal_id).
+    """
+    index = {}
+    outcomes = run_concurrently(
+        lambda target: list_assigned_principals(client, instance_arn, *target),
+        list(dict.fromkeys(targets)),
+        max_workers=max_workers
+    )
+    for target, principals, error in outcomes:
+        if error is not None:
+            raise error
+        index[target] = principals
+    return index
+
+
+# Assignments returned per page of ListAccountAssignmentsForPrincipal
+PRINCIPAL_PAGE_SIZE = 100
+
+
+@AWSRetry.jittered_backoff()
+def list_principal_targets(client, instance_arn, principal_type, principal_id):
+    """
+    Paginate list_account_assignments_for_principal for one principal and return the set of
+    (account_id, permission_set_arn) it is directly assigned to.
+
+    The listing of a user also holds the assignments it gets through its groups, as rows of
+    the group; those are not assignments of the user and are skipped.
+    """
+    targets = set()
+    paginator = client.get_paginator('list_account_assignments_for_principal')
+    pages = paginator.paginate(
+        InstanceArn=instance_arn, PrincipalType=principal_type, PrincipalId=principal_id,
+        PaginationConfig={'PageSize': PRINCIPAL_PAGE_SIZE}
+    )
+    for page in pages:
+        for assignment in page.get('AccountAssignments', []):
+            if (assignment['PrincipalType'], assignment['PrincipalId']) == (principal_type, principal_id):
+                targets.add((assignment['AccountId'], assignment['PermissionSetArn']))
+    return targets
+
+
+def snapshot_assignments_by_principal(client, instance_arn, keys, max_workers=10):
+    """
+    Same index as snapshot_assignments() for the assignment keys, built by listing the
+    assignments of every principal of the keys once, concurrently.
+
+    Only the principals of the keys appear in the index, so it cannot be used to purge.
+    """
+    index = {key[:2]: set() for key in keys}
+    outcomes = run_concurrently(
+        lambda principal: list_principal_targets(client, instance_arn, *principal),
+        list(dict.fromkeys(key[2:] for key in keys)),
+        max_workers=max_workers
+    )
+    for principal, targets, error in outcomes:
+        if error is not None:
+            raise error
+        for target in targets:
+            if target in index:
+                index[target].add(principal)
+    return index
+
+
+def snapshot_costs(keys):
+    """
+    Estimate the API calls needed to index the assignment keys in each direction.
+
+    Listing per target costs at least one call per (account, permission set). Listing per
+    principal costs at least one page per principal, and one more per PRINCIPAL_PAGE_SIZE
+    requested targets of that principal.
+    """
+    targets_per_principal = {}
+    for key in keys:
+        targets_per_principal.setdefault(key[2:], set()).add(key[:2])
+    return {
+        'target': len({key[:2] for key in keys}),
+        'principal': sum(max(1, math.ceil(len(targets) / PRINCIPAL_PAGE_SIZE))
+                         for targets in targets_per_principal.values()),
+    }
+
+
+def index_assignments(client, instance_arn, keys, purge=False, max_workers=10):
+    """
+    Index the current assignments of the keys in the cheaper direction.
+
+    Purging needs every principal of the listed targets, so it always lists per target; ties
+    list per target too. Returns the index and the direction used, 'target' or 'principal'.
+    """
+    keys = list(keys)
+    costs = snapshot_costs(keys)
+    if not purge and costs['principal'] < costs['target']:
+        return snapshot_assignments_by_principal(client, instance_arn, keys, max_workers), 'principal'
+    return snapshot_assignments(client, instance_arn, [key[:2] for key in keys], max_workers), 'target'
+
+
+def plan_assignments(desired_assignments, index, purge=False):
+    """
+    Compute the changes turning the assignments of the index into the desired ones.
+
+    Returns a list of (action, key) with action 'create', 'delete' or 'unchanged' and key as
+    returned by assignment_key(). With purge, principals assigned to a listed (account,
+    permission set) that are not desired there are deleted.
+    """
+    plan = []
+    listed = set()
+    for assignment in desired_assignments:
+        key = assignment_key(assignment)
+        listed.add(key)
+        assigned = key[2:] in index[key[:2]]
+        if assignment['state'] == 'present':
+            plan.append(('unchanged' if assigned else 'create', key))
+        else:
+            plan.append(('delete' if assigned else 'unchanged', key))
+
+    if purge:
+        for target, principals in index.items():
+            plan.extend(
+                ('delete', target + principal) for principal in sorted(principals) if target + principal not in listed
+            )
+    return plan
+
+
+def change_assignment(client, instance_arn, action, key):
+    """
+    Create or delete one assignment and return the status dict of the request
+    (AccountAssignmentCreationStatus or AccountAssignmentDeletionStatus).
+    """
+    target_id, permission_set_arn, principal_type, principal_id = key
+    params = dict(
+        InstanceArn=instance_arn,
+        TargetId=target_id,
+        TargetType='AWS_ACCOUNT',
+        PermissionSetArn=permission_set_arn,
+        PrincipalType=principal_type,
+        PrincipalId=principal_id
+    )
+    if action == 'create':
+        return client.create_account_assignment(aws_retry=True, **params)['AccountAssignmentCreationStatus']
+    return client.delete_account_assignment(aws_retry=True, **params)['AccountAssignmentDeletionStatus']
+
+
+def assignment_failure(action, key, msg):
+    target_id, permission_set_arn, principal_type, principal_id = key
+    return dict(target_id=target_id, permission_set_arn=permission_set_arn, principal_type=principal_type,
+                principal_id=principal_id, action=action, msg=msg)
+
+
+def apply_assignments(client, instance_arn, plan, max_workers=10, rate_limiter=None):
+    """
+    Apply the create and delete changes of the plan concurrently, at most at the pace of
+    the rate limiter when one is given.
+
+    Returns a list of (action, key, status, error) for every change, with status the
+    status dict of the accepted request and error the reason of a failed change.
+    """
+    def apply(change):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        return change_assignment(client, instance_arn, *change)
+
+    changes = [change for change in plan if change[0] != 'unchanged']
+    outcomes = run_concurrently(apply, changes, max_workers=max_workers)
+
+    applied = []
+    for (action, key), status, error in outcomes:
+        if error is None and status.get('Status') == 'FAILED':
+            error = status.get('FailureReason')
+        applied.append((action, key, status, error))
+    return applied
+
+
+def wait_for_assignments(client, instance_arn, applied, timeout, max_workers=10):
+    """
+    Wait for the requests of the applied changes that are in progress, and return the
+    changes with their final status and error, and the latency percentiles.
+    """
+    tracked = track_requests(
+        client,
+        instance_arn,
+        [(action, status['RequestId']) for action, key, status, error in applied
+         if error is None and status.get('Status') == 'IN_PROGRESS'],
+        timeout=timeout,
+        max_workers=max_workers
+    )
+
+    final = []
+    for action, key, status, error in applied:
+        request = tracked.get(status['RequestId']) if error is None else None
+        if request is not None:
+            status = dict(status, Status=request['status'])
+            if request['status'] == 'FAILED':
+                error = request['failure_reason']
+        final.append((action, key, status, error))
+    return final, latency_percentiles(tracked)
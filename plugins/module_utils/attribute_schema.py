@@ -0,0 +1,126 @@
+import json
+from collections import namedtuple
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.dict_converter import \
+    snake_to_pascal, remove_keys_empty_value, is_empty
+
+# param: module option name, keys: API keys from the payload root,
+# path: update AttributePath, children: fields of a dict option,
+# elements: fields of the dict elements of a list option
+Field = namedtuple('Field', ['param', 'keys', 'path', 'children', 'elements'])
+
+
+def lower_first(name):
+    return name[:1].lower() + name[1:]
+
+
+def attribute_value(obj, keys):
+    """
+    Return the value found by following keys through nested dicts, or None.
+    """
+    value = obj
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class AttributeSchema:
+    """
+    Mapping between a module argument spec and the API payload, compiled once.
+
+    The option names, API keys and update AttributePaths are all derived from the
+    argument spec when the schema is created, so building the create payload and
+    the update operations is a single pass over the module params.
+    """
+
+    def __init__(self, argument_spec, api_names=None, unordered=()):
+        """
+        api_names renames top level options whose API key is not their PascalCase
+        form, and unordered lists the multi valued API keys compared as sets.
+        """
+        self.fields = self._compile(argument_spec, api_names or {}, ())
+        self.unordered = frozenset(unordered)
+
+    @classmethod
+    def _compile(cls, argument_spec, api_names, parent_keys):
+        fields = []
+        for param, spec in argument_spec.items():
+            keys = parent_keys + (api_names.get(param) or snake_to_pascal(param),)
+            children = elements = None
+            if spec.get('options'):
+                if spec.get('type') == 'list':
+                    elements = cls._compile(spec['options'], {}, ())
+                else:
+                    children = cls._compile(spec['options'], {}, keys)
+            path = '.'.join(lower_first(key) for key in keys)
+            fields.append(Field(param, keys, path, children, elements))
+        return tuple(fields)
+
+    def build(self, params):
+        """
+        Return (attributes, leaves) for the module params.
+
+        attributes is the API formatted payload without empty values, and leaves the
+        (keys, path, value) of every attribute that can be sent in an update call.
+        """
+        attributes = {}
+        leaves = []
+        self._build(self.fields, params, attributes, leaves)
+        return attributes, leaves
+
+    def _build(self, fields, params, target, leaves):
+        for field in fields:
+            value = params.get(field.param)
+            if field.children is not None:
+                if value:
+                    nested = {}
+                    self._build(field.children, value, nested, leaves)
+                    if nested:
+                        target[field.keys[-1]] = nested
+                continue
+
+            if field.elements is not None and value:
+                items = []
+                for item in value:
+                    converted = {}
+                    self._build(field.elements, item, converted, None)
+                    if converted:
+                        items.append(converted)
+                value = items
+
+            if is_empty(value):
+                continue
+            target[field.keys[-1]] = value
+            if leaves is not None:
+                leaves.append((field.keys, field.path, value))
+
+    def normalize(self, key, value):
+        """
+        Normalize an attribute value for comparison.
+
+        Empty values compare equal to missing ones, and the elements of unordered
+        attributes are compared as a sorted collection ignoring empty sub keys.
+        """
+        if is_empty(value):
+            return None
+        if key in self.unordered:
+            return sorted(json.dumps(remove_keys_empty_value(item), sort_keys=True) for item in value)
+        return value
+
+    def operations(self, leaves, current=None, current_value=attribute_value):
+        """
+        Return the update Operations for the leaves returned by build().
+
+        When the current resource is given, only the attributes that differ from it are
+        returned, so an empty list means the resource is already up to date.
+        current_value(current, keys) reads the current value of an attribute.
+        """
+        operations = []
+        for keys, path, value in leaves:
+            if current is not None and \
+                    self.normalize(keys[0], value) == self.normalize(keys[0], current_value(current, keys)):
+                continue
+            operations.append({'AttributePath': path, 'AttributeValue': value})
+        return operations
@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_concurrently(func, items, max_workers=10):
+    """
+    Call func for every item using a bounded thread pool.
+
+    Returns a list of (item, result, exception) tuples in the order of items. A failing
+    item does not stop the others; its exception is returned instead of a result.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers, len(items)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        results = []
+        for item, future in zip(items, futures):
+            try:
+                results.append((item, future.result(), None))
+            except Exception as e:
+                results.append((item, None, e))
+    return results
+
+
+def apply_plan(plan, apply_change, failed_result, max_workers=10):
+    """
+    Apply planned changes concurrently and return their results in plan order.
+
+    apply_change(change) returns the result of one change and failed_result(change, error)
+    builds the result of a change that raised.
+    """
+    return [
+        failed_result(change, error) if error is not None else result
+        for change, result, error in run_concurrently(apply_change, plan, max_workers=max_workers)
+    ]
+
+
+class RateLimiter:
+    """
+    Space out calls made from many threads to at most rate calls per second.
+
+    wait() reserves the next free slot and sleeps until it, so the pace holds
+    however many workers share the limiter. A rate of None disables the limit.
+    """
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+def find_duplicates(values):
+    """Return the sorted values that appear more than once."""
+    seen = set()
+    duplicates = set()
+    for value in values:
+        if value in seen:
+            duplicates.add(value)
+        seen.add(value)
+    return sorted(duplicates)
+
+
+class ApiCallCounter:
+    """
+    Count the API calls issued by one or more boto3 clients, per operation name.
+    """
+
+    def __init__(self, *clients):
+        self._lock = threading.Lock()
+        self.operations = {}
+        for client in clients:
+            self.attach(client)
+
+    def attach(self, client):
+        client.meta.events.register('before-call', self._on_call)
+
+    def _on_call(self, model, **kwargs):
+        with self._lock:
+            self.operations[model.name] = self.operations.get(model.name, 0) + 1
+
+    @property
+    def total(self):
+        return sum(self.operations.values())
+
+    def as_dict(self):
+        return {'total': self.total, 'operations': dict(sorted(self.operations.items()))}
+
+
+# Planned action -> outcome reported once it is applied
+PAST_TENSE = {'create': 'created', 'update': 'updated', 'delete': 'deleted', 'unchanged': 'unchanged'}
+
+
+def count_actions(results, actions):
+    """
+    Count per action how many of the per item results (dicts with an 'action' key) ended that way.
+    """
+    counts = dict.fromkeys(actions, 0)
+    for result in results:
+        counts[result['action']] = counts.get(result['action'], 0) + 1
+    return counts
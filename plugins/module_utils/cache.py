@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'begoingto.aws_identity_center')
+
+
+def cache_argument_spec():
+    """Options shared by the modules that keep a persistent cache, see the cache doc fragment."""
+    return dict(
+        cache=dict(type='bool', default=True),
+        cache_ttl=dict(type='int', default=3600),
+        cache_dir=dict(type='path', required=False),
+    )
+
+
+class FileCache:
+    """
+    JSON file cache with a per entry TTL, shared by every task running on a host.
+
+    Each Ansible task is a new process, so this is what lets lookups be reused
+    across tasks. Readers always see a complete file because writers replace it
+    atomically, and writers serialize their read-modify-write cycle on a lock
+    file so concurrent forks do not drop each other's entries. The cache is best
+    effort: an unreadable or unwritable cache behaves like an empty one.
+    """
+
+    def __init__(self, name, ttl=3600, cache_dir=None, enabled=True):
+        self.directory = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        self.path = os.path.join(self.directory, f"{name}.json")
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_module(cls, module, name):
+        """Build the cache from the options of cache_argument_spec()."""
+        return cls(name, ttl=module.params['cache_ttl'], cache_dir=module.params.get('cache_dir'),
+                   enabled=module.params['cache'])
+
+    @classmethod
+    def from_plugin(cls, plugin, name):
+        """Build the cache from the options of a plugin using the cache doc fragment."""
+        return cls(name, ttl=plugin.get_option('cache_ttl'), cache_dir=plugin.get_option('cache_dir'),
+                   enabled=plugin.get_option('cache'))
+
+    def _load(self):
+        try:
+            with open(self.path) as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key):
+        """Return the cached value of key, or None when it is missing or expired."""
+        if not self.enabled:
+            return None
+        entry = self._load().get(key)
+        hit = isinstance(entry, dict) and entry.get('expires', 0) > time.time()
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry['value'] if hit else None
+
+    def get_many(self, keys):
+        """Return a dict with the cached values of the keys that are present, reading the file once."""
+        if not self.enabled:
+            return {}
+        entries = self._load()
+        now = time.time()
+        found = {}
+        for key in keys:
+            entry = entries.get(key)
+            if isinstance(entry, dict) and entry.get('expires', 0) > now:
+                found[key] = entry['value']
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, values):
+        """Store many key/value pairs with a single write."""
+        expires = time.time() + self.ttl
+        self._update(lambda entries: entries.update(
+            (key, {'value': value, 'expires': expires}) for key, value in values.items()
+        ))
+
+    def set(self, key, value):
+        expires = time.time() + self.ttl
+        self._update(lambda entries: entries.__setitem__(key, {'value': value, 'expires': expires}))
+
+    def delete(self, key):
+        self._update(lambda entries: entries.pop(key, None))
+
+    def delete_many(self, keys):
+        """Remove many keys with a single write."""
+        self._update(lambda entries: [entries.pop(key, None) for key in keys])
+
+    def _update(self, change):
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            with open(self.path + '.lock', 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                now = time.time()
+                entries = {
+                    key: entry for key, entry in self._load().items()
+                    if isinstance(entry, dict) and entry.get('expires', 0) > now
+                }
+                change(entries)
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+                with os.fdopen(fd, 'w') as tmp_file:
+                    json.dump(entries, tmp_file)
+                os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
@@ -1,6 +1,12 @@
+# Memoized snake_case -> PascalCase keys, the same few dozen keys repeat in every record
+_pascal_keys = {}
+
 def snake_to_pascal(snake_str):
     """Convert a snake_case string to PascalCase."""
-    return ''.join(word.capitalize() for word in snake_str.split('_'))
+    pascal = _pascal_keys.get(snake_str)
+    if pascal is None:
+        pascal = _pascal_keys[snake_str] = ''.join(word.capitalize() for word in snake_str.split('_'))
+    return pascal
 
 def convert_dict_keys_to_pascal(obj):
     """Recursively convert dictionary keys from snake_case to PascalCase."""
@@ -42,4 +48,4 @@ def remove_keys_empty_value(obj):
     elif isinstance(obj, list):
         return [remove_keys_empty_value(item) for item in obj if not is_empty(item)]
     else:
-        return obj
\ No newline at end of file
+        return obj
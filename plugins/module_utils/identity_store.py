@@ -0,0 +1,279 @@
+from ansible_collections.amazon.aws.plugins.module_utils.botocore import is_boto3_error_code
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.attribute_schema import \
+    AttributeSchema, attribute_value, lower_first
+
+USER_TYPES = ["DEVELOPER", "SUPPORT", "OPERATIONS", "SYSTEM_ADMINISTRATOR", "CEO", "CFO", "CTO",
+              "TEAM_LEAD", "SALES", "MARKETING", "PRODUCT_MANAGER",
+              "ENGINEERING_MANAGER", "DATA_ANALYST"]
+
+
+def user_options(required=True):
+    """
+    Argument spec for the attributes of a single identity store user.
+
+    When required is False, name, display_name and emails become optional so the
+    spec can be used for list elements that may also describe absent users.
+    """
+    return {
+        "user_name": {"type": "str", "required": True},
+        "name": {
+            "type": "dict",
+            "required": required,
+            "options": {
+                "formatted": {"type": "str", "required": True},
+                "family_name": {"type": "str", "required": True},
+                "given_name": {"type": "str", "required": True},
+            }
+        },
+        "display_name": {"type": "str", "required": required},
+        "emails": {
+            "type": "list",
+            "required": required,
+            "elements": "dict",
+            "options": {
+                "value": {"type": "str", "required": True},
+                "type": {"type": "str", "required": True},
+                "primary": {"type": "bool", "required": True},
+            }
+        },
+        "nick_name": {"type": "str", "required": False},
+        "enterprise": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "employee_number": {"type": "str", "required": False},
+                "cost_center": {"type": "str", "required": False},
+                "organization": {"type": "str", "required": False},
+                "division": {"type": "str", "required": False},
+                "department": {"type": "str", "required": False},
+                "manager": {"type": "str", "required": False}
+            }
+        },
+        "user_type": {
+            "type": "str",
+            "default": "DEVELOPER",
+            "choices": USER_TYPES,
+            "required": False
+        },
+        "addresses": {
+            "type": "list",
+            "required": False,
+            "elements": "dict",
+            "options": {
+                "street_address": {"type": "str", "required": False},
+                "locality": {"type": "str", "required": False},
+                "region": {"type": "str", "required": False},
+                "postal_code": {"type": "str", "required": False},
+                "country": {"type": "str", "required": False},
+                "formatted": {"type": "str", "required": False},
+                "type": {"type": "str", "required": False},
+                "primary": {"type": "bool", "required": False},
+            }
+        },
+        "phone_numbers": {
+            "type": "list",
+            "required": False,
+            "elements": "dict",
+            "options": {
+                "value": {"type": "str", "required": False},
+                "type": {"type": "str", "required": False},
+                "primary": {"type": "bool", "required": False},
+            }
+        },
+        "title": {"type": "str", "required": False},
+        "locale": {"type": "str", "required": False},
+        "timezone": {"type": "str", "required": False},
+        "preferred_language": {"type": "str", "required": False},
+    }
+
+
+ENTERPRISE_EXTENSION = 'aws:identitystore:enterprise'
+
+USER_SCHEMA = AttributeSchema(user_options(), unordered=('Emails', 'Addresses', 'PhoneNumbers'))
+
+
+def build_user_attributes(params):
+    """
+    Return (attributes, leaves) for the user attributes of module params.
+
+    Only the options described by user_options() are read, so module level options
+    such as state or region never leak into the payload. See AttributeSchema.build().
+    """
+    return USER_SCHEMA.build(params)
+
+
+def enterprise_to_extensions(enterprise):
+    """
+    Convert the Enterprise attributes to the create_user Extensions document.
+    """
+    return {ENTERPRISE_EXTENSION: {lower_first(key): value for key, value in enterprise.items()}}
+
+
+def build_create_user_params(identity_store_id, user):
+    """
+    Build the create_user keyword arguments from API formatted user attributes.
+    """
+    params_create = {'IdentityStoreId': identity_store_id}
+    params_create.update(user)
+    enterprise = params_create.pop('Enterprise', None)
+    if enterprise:
+        params_create['Extensions'] = enterprise_to_extensions(enterprise)
+    return params_create
+
+
+def _current_attribute_value(current, keys):
+    if keys[0] == 'Enterprise':
+        enterprise = current.get('Extensions', {}).get(ENTERPRISE_EXTENSION) or {}
+        return enterprise.get(lower_first(keys[1]))
+    return attribute_value(current, keys)
+
+
+def build_update_user_operations(leaves, current=None):
+    """
+    Build the update_user Operations list from the leaves of build_user_attributes().
+
+    When the current user is given, only the attributes that differ from it are
+    returned, so an empty list means the user is already up to date.
+    """
+    return USER_SCHEMA.operations(leaves, current, _current_attribute_value)
+
+
+def merge_user(current, user):
+    """
+    Return the current user with the desired API formatted attributes applied.
+    """
+    merged = dict(current)
+    for key, value in user.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def user_extensions(users):
+    """
+    Return the Extensions to request from list_users so the users described by
+    module params can be compared with the current ones.
+    """
+    if any(user.get('enterprise') for user in users):
+        return [ENTERPRISE_EXTENSION]
+    return []
+
+
+def snapshot_users(client, identity_store_id, extensions=None):
+    """
+    Paginate list_users once and index every user of the identity store by UserName.
+    """
+    params = {'IdentityStoreId': identity_store_id}
+    if extensions:
+        params['Extensions'] = extensions
+
+    users = {}
+    paginator = client.get_paginator('list_users')
+    for page in paginator.paginate(**params):
+        for user in page.get('Users', []):
+            users[user['UserName']] = user
+    return users
+
+
+def snapshot_groups(client, identity_store_id):
+    """
+    Paginate list_groups once and index every group of the identity store by GroupId.
+    """
+    groups = {}
+    paginator = client.get_paginator('list_groups')
+    for page in paginator.paginate(IdentityStoreId=identity_store_id):
+        for group in page.get('Groups', []):
+            groups[group['GroupId']] = group
+    return groups
+
+
+@AWSRetry.jittered_backoff()
+def list_member_group_ids(client, identity_store_id, member_id):
+    """
+    Return the IDs of the groups the user member_id belongs to.
+    """
+    paginator = client.get_paginator('list_group_memberships_for_member')
+    pages = paginator.paginate(IdentityStoreId=identity_store_id, MemberId={'UserId': member_id})
+    return [membership['GroupId'] for page in pages for membership in page.get('GroupMemberships', [])]
+
+
+def unique_attribute(attribute_path, value):
+    """Alternate identifier for a unique attribute such as userName, emails.value or displayName."""
+    return {'UniqueAttribute': {'AttributePath': attribute_path, 'AttributeValue': value}}
+
+
+def external_id(issuer, value):
+    """Alternate identifier for an ID assigned by an external identity provider."""
+    return {'ExternalId': {'Issuer': issuer, 'Id': value}}
+
+
+# Operation and response key of the GetUserId / GetGroupId APIs per kind of principal
+_GET_ID = {'user': ('get_user_id', 'UserId'), 'group': ('get_group_id', 'GroupId')}
+
+
+@AWSRetry.jittered_backoff()
+def get_principal_id(client, identity_store_id, kind, alternate_identifier):
+    """
+    Resolve an alternate identifier of a user or group (kind) to its ID, or None when no such principal exists.
+    """
+    operation, id_key = _GET_ID[kind]
+    try:
+        response = getattr(client, operation)(
+            IdentityStoreId=identity_store_id,
+            AlternateIdentifier=alternate_identifier
+        )
+    except is_boto3_error_code('ResourceNotFoundException'):
+        return None
+    return response[id_key]
+
+
+def get_user_id(client, identity_store_id, user_name):
+    """
+    Resolve a user name to its UserId with GetUserId, or None when no such user exists.
+    """
+    return get_principal_id(client, identity_store_id, 'user', unique_attribute('userName', user_name))
+
+
+def get_group_id(client, identity_store_id, display_name):
+    """
+    Resolve a group display name to its GroupId with GetGroupId, or None when no such group exists.
+    """
+    return get_principal_id(client, identity_store_id, 'group', unique_attribute('displayName', display_name))
+
+
+@AWSRetry.jittered_backoff()
+def snapshot_group_memberships(client, identity_store_id, group_id):
+    """
+    Paginate list_group_memberships once and index the group's memberships by member UserId.
+    """
+    memberships = {}
+    paginator = client.get_paginator('list_group_memberships')
+    for page in paginator.paginate(IdentityStoreId=identity_store_id, GroupId=group_id):
+        for membership in page.get('GroupMemberships', []):
+            user_id = membership.get('MemberId', {}).get('UserId')
+            if user_id:
+                memberships[user_id] = membership['MembershipId']
+    return memberships
+
+
+# IsMemberInGroups accepts at most this many group IDs per call
+IS_MEMBER_IN_GROUPS_MAX_GROUPS = 100
+
+
+@AWSRetry.jittered_backoff()
+def is_member_in_groups(client, identity_store_id, user_id, group_ids):
+    """
+    Check with one IsMemberInGroups call whether a user is a member of each of group_ids.
+
+    Returns a dict of GroupId -> bool.
+    """
+    response = client.is_member_in_groups(
+        IdentityStoreId=identity_store_id,
+        MemberId={'UserId': user_id},
+        GroupIds=list(group_ids)
+    )
+    return {result['GroupId']: result['MembershipExists'] for result in response.get('Results', [])}
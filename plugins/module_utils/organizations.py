@@ -0,0 +1,59 @@
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+
+# Account states in which assignments cannot be provisioned
+INACTIVE_STATES = ('SUSPENDED', 'PENDING_CLOSURE', 'CLOSED')
+
+
+@AWSRetry.jittered_backoff()
+def list_children(client, parent_id):
+    """
+    Return (accounts, child OU IDs) of a root or organizational unit.
+
+    Accounts are reduced to their Id, Name and state so they can be cached as JSON.
+    """
+    accounts = [
+        {'Id': account['Id'], 'Name': account.get('Name'), 'State': account.get('State', account.get('Status'))}
+        for page in client.get_paginator('list_accounts_for_parent').paginate(ParentId=parent_id)
+        for account in page.get('Accounts', [])
+    ]
+    ou_ids = [
+        ou['Id']
+        for page in client.get_paginator('list_organizational_units_for_parent').paginate(ParentId=parent_id)
+        for ou in page.get('OrganizationalUnits', [])
+    ]
+    return accounts, ou_ids
+
+
+def list_ou_accounts(client, parent_id, recursive=True, max_workers=10, cache=None):
+    """
+    List the accounts of a root or organizational unit, and of its descendant OUs when recursive.
+
+    The OU tree is walked level by level with the OUs of a level listed concurrently. When a
+    FileCache is given the result is read from and stored in it.
+    """
+    key = f"{parent_id}|{'recursive' if recursive else 'children'}"
+    if cache is not None:
+        accounts = cache.get(key)
+        if accounts is not None:
+            return accounts
+
+    accounts = []
+    level = [parent_id]
+    while level:
+        next_level = []
+        for ou_id, children, error in run_concurrently(lambda ou_id: list_children(client, ou_id), level, max_workers):
+            if error is not None:
+                raise error
+            accounts.extend(children[0])
+            next_level.extend(children[1])
+        level = next_level if recursive else []
+
+    if cache is not None:
+        cache.set(key, accounts)
+    return accounts
+
+
+def is_active(account):
+    return account.get('State') not in INACTIVE_STATES
@@ -0,0 +1,49 @@
+import queue
+import threading
+
+_DONE = object()
+
+
+def prefetch_pages(pages, depth=1):
+    """
+    Iterate over pages while a background thread already fetches the next ones.
+
+    pages is any iterable of API pages, typically a boto3 PageIterator. Up to depth
+    pages are fetched ahead, so the latency of the next request overlaps with the
+    processing of the current page. Errors raised while fetching are re-raised by
+    the iteration, and the fetching thread stops when the iteration is abandoned.
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except Exception as e:
+            put((_DONE, e))
+            return
+        put((_DONE, None))
+
+    producer = threading.Thread(target=produce, name='prefetch-pages', daemon=True)
+    producer.start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if page is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        stop.set()
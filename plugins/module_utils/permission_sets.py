@@ -0,0 +1,376 @@
+import json
+
+from ansible_collections.amazon.aws.plugins.module_utils.botocore import is_boto3_error_code
+from ansible_collections.amazon.aws.plugins.module_utils.policy import compare_policies
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from ansible_collections.amazon.aws.plugins.module_utils.tagging import \
+    ansible_dict_to_boto3_tag_list, boto3_tag_list_to_ansible_dict, compare_aws_tags
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.request_status import \
+    track_requests, latency_percentiles, count_statuses
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import \
+    describe_permission_set, find_permission_set_arns, forget_permission_set_index, remember_permission_set_arn
+
+# Session duration of the permission sets created without one
+DEFAULT_SESSION_DURATION = 'PT1H'
+
+# Changes that only take effect in the accounts once the permission set is provisioned again
+PROVISIONED_OPERATIONS = (
+    'update_permission_set',
+    'attach_managed_policy_to_permission_set', 'detach_managed_policy_from_permission_set',
+    'attach_customer_managed_policy_reference_to_permission_set',
+    'detach_customer_managed_policy_reference_from_permission_set',
+    'put_permissions_boundary_to_permission_set', 'delete_permissions_boundary_from_permission_set',
+    'put_inline_policy_to_permission_set', 'delete_inline_policy_from_permission_set',
+)
+
+
+def permission_set_options():
+    """
+    Argument spec of the desired configuration of a permission set, without its name.
+
+    Options left to None are not managed, so an existing permission set keeps its current value.
+    """
+    policy_reference = dict(
+        name=dict(type='str', required=True),
+        path=dict(type='str', default='/'),
+    )
+    return dict(
+        description=dict(type='str'),
+        session_duration=dict(type='str'),
+        relay_state=dict(type='str'),
+        managed_policies=dict(type='list', elements='str'),
+        customer_managed_policies=dict(type='list', elements='dict', options=policy_reference),
+        permissions_boundary=dict(type='dict', options=dict(
+            managed_policy_arn=dict(type='str'),
+            customer_managed_policy_reference=dict(type='dict', options=policy_reference),
+        ), mutually_exclusive=[('managed_policy_arn', 'customer_managed_policy_reference')]),
+        inline_policy=dict(type='json'),
+        tags=dict(type='dict'),
+        purge_tags=dict(type='bool', default=True),
+    )
+
+
+def _paginate(client, operation, key, **params):
+    return [item for page in client.get_paginator(operation).paginate(**params) for item in page.get(key, [])]
+
+
+@AWSRetry.jittered_backoff()
+def list_managed_policies(client, instance_arn, arn):
+    return {policy['Arn'] for policy in _paginate(
+        client, 'list_managed_policies_in_permission_set', 'AttachedManagedPolicies',
+        InstanceArn=instance_arn, PermissionSetArn=arn
+    )}
+
+
+@AWSRetry.jittered_backoff()
+def list_customer_managed_policies(client, instance_arn, arn):
+    return {(reference['Name'], reference.get('Path', '/')) for reference in _paginate(
+        client, 'list_customer_managed_policy_references_in_permission_set', 'CustomerManagedPolicyReferences',
+        InstanceArn=instance_arn, PermissionSetArn=arn
+    )}
+
+
+@AWSRetry.jittered_backoff()
+def get_permissions_boundary(client, instance_arn, arn):
+    try:
+        boundary = client.get_permissions_boundary_for_permission_set(
+            InstanceArn=instance_arn, PermissionSetArn=arn
+        )['PermissionsBoundary']
+    except is_boto3_error_code('ResourceNotFoundException'):
+        return None
+    if boundary.get('ManagedPolicyArn'):
+        return ('managed', boundary['ManagedPolicyArn'])
+    reference = boundary.get('CustomerManagedPolicyReference')
+    return ('customer', reference['Name'], reference.get('Path', '/')) if reference else None
+
+
+@AWSRetry.jittered_backoff()
+def get_inline_policy(client, instance_arn, arn):
+    policy = client.get_inline_policy_for_permission_set(InstanceArn=instance_arn, PermissionSetArn=arn)
+    return json.loads(policy['InlinePolicy']) if policy.get('InlinePolicy') else None
+
+
+@AWSRetry.jittered_backoff()
+def list_tags(client, instance_arn, arn):
+    return boto3_tag_list_to_ansible_dict(_paginate(
+        client, 'list_tags_for_resource', 'Tags', InstanceArn=instance_arn, ResourceArn=arn
+    ))
+
+
+def fetch_permission_set(client, instance_arn, arn, max_workers=10, details=None):
+    """
+    Fetch the whole configuration of a permission set, with one concurrent call per part.
+    details, the PermissionSet of DescribePermissionSet, saves describing it again.
+
+    Returns a dict with the arn, name, description, session_duration and relay_state, the sets of
+    managed_policies ARNs and customer_managed_policies (name, path), the permissions_boundary as
+    ('managed', arn) or ('customer', name, path), the parsed inline_policy and the tags dict.
+    """
+    fetchers = {
+        'details': describe_permission_set,
+        'managed_policies': list_managed_policies,
+        'customer_managed_policies': list_customer_managed_policies,
+        'permissions_boundary': get_permissions_boundary,
+        'inline_policy': get_inline_policy,
+        'tags': list_tags,
+    }
+    current = dict(arn=arn)
+    outcomes = run_concurrently(
+        lambda part: fetchers[part](client, instance_arn, arn) if part != 'details' or details is None else details,
+        list(fetchers), max_workers=max_workers
+    )
+    for part, value, error in outcomes:
+        if error is not None:
+            raise error
+        if part == 'details':
+            current.update(
+                name=value['Name'],
+                description=value.get('Description'),
+                session_duration=value.get('SessionDuration'),
+                relay_state=value.get('RelayState'),
+            )
+        else:
+            current[part] = value
+    return current
+
+
+def new_permission_set(arn, name, description=None, session_duration=None, relay_state=None, tags=None):
+    """Configuration of a permission set that was just created with these settings."""
+    return dict(
+        arn=arn, name=name, description=description, session_duration=session_duration, relay_state=relay_state,
+        managed_policies=set(), customer_managed_policies=set(), permissions_boundary=None, inline_policy=None,
+        tags=dict(tags or {}),
+    )
+
+
+# Not retried on ConflictException: it means that the permission set already exists
+@AWSRetry.jittered_backoff()
+def _create_permission_set(client, **params):
+    return client.create_permission_set(**params)
+
+
+def create_permission_set(client, instance_arn, desired):
+    """
+    Create a permission set with the settings CreatePermissionSet accepts and return the
+    configuration it was created with, to plan the remaining changes against.
+    """
+    session_duration = desired.get('session_duration') or DEFAULT_SESSION_DURATION
+    params = dict(InstanceArn=instance_arn, Name=desired['name'], SessionDuration=session_duration)
+    if desired.get('description'):
+        params['Description'] = desired['description']
+    if desired.get('relay_state'):
+        params['RelayState'] = desired['relay_state']
+    if desired.get('tags'):
+        params['Tags'] = ansible_dict_to_boto3_tag_list(desired['tags'])
+
+    response = _create_permission_set(client, **params)
+    return new_permission_set(
+        response['PermissionSet']['PermissionSetArn'], desired['name'], desired.get('description'),
+        session_duration, desired.get('relay_state'), desired.get('tags')
+    )
+
+
+def create_or_adopt_permission_set(client, instance_arn, desired, region=None, cache=None, max_workers=10):
+    """
+    Create a permission set that the name to ARN index does not know, and record it in the index.
+
+    When CreatePermissionSet reports a conflict, the permission set was created by someone else
+    since the index was built: the index is dropped and the existing permission set is found
+    again and fetched instead. Returns its configuration and whether it was created.
+    """
+    try:
+        current = create_permission_set(client, instance_arn, desired)
+    except is_boto3_error_code('ConflictException'):
+        forget_permission_set_index(instance_arn, region, cache)
+        arn = find_permission_set_arns(client, instance_arn, [desired['name']], region, cache, max_workers,
+                                       verify=True)[desired['name']]
+        if arn is None:
+            raise
+        return fetch_permission_set(client, instance_arn, arn, max_workers), False
+
+    remember_permission_set_arn(instance_arn, desired['name'], current['arn'], region, cache)
+    return current, True
+
+
+def _boundary(desired):
+    if desired.get('managed_policy_arn'):
+        return ('managed', desired['managed_policy_arn'])
+    reference = desired.get('customer_managed_policy_reference')
+    if reference:
+        return ('customer', reference['name'], reference.get('path') or '/')
+    return None
+
+
+def _policy_reference(reference):
+    return {'Name': reference[0], 'Path': reference[1]}
+
+
+def plan_permission_set_changes(current, desired):
+    """
+    Compute the calls turning the current configuration of a permission set into the desired one.
+
+    desired holds the module params of permission_set_options(); options set to None are left
+    alone. An empty permissions_boundary or inline_policy removes it. Policies are compared
+    canonically, so formatting or ordering differences are not changes.
+
+    Returns a list of (operation, params) with operation an SSO admin client method; params
+    include the ARN of the permission set but not the instance ARN.
+    """
+    arn = current['arn']
+    changes = []
+
+    settings = {}
+    for option, param in (('description', 'Description'), ('session_duration', 'SessionDuration'),
+                          ('relay_state', 'RelayState')):
+        if desired.get(option) is not None and desired[option] != current[option]:
+            settings[param] = desired[option]
+    if settings:
+        changes.append(('update_permission_set', dict(PermissionSetArn=arn, **settings)))
+
+    if desired.get('managed_policies') is not None:
+        wanted = set(desired['managed_policies'])
+        changes.extend(
+            ('attach_managed_policy_to_permission_set', dict(PermissionSetArn=arn, ManagedPolicyArn=policy))
+            for policy in sorted(wanted - current['managed_policies'])
+        )
+        changes.extend(
+            ('detach_managed_policy_from_permission_set', dict(PermissionSetArn=arn, ManagedPolicyArn=policy))
+            for policy in sorted(current['managed_policies'] - wanted)
+        )
+
+    if desired.get('customer_managed_policies') is not None:
+        wanted = {
+            (reference['name'], reference.get('path') or '/') for reference in desired['customer_managed_policies']
+        }
+        changes.extend(
+            ('attach_customer_managed_policy_reference_to_permission_set',
+             dict(PermissionSetArn=arn, CustomerManagedPolicyReference=_policy_reference(reference)))
+            for reference in sorted(wanted - current['customer_managed_policies'])
+        )
+        changes.extend(
+            ('detach_customer_managed_policy_reference_from_permission_set',
+             dict(PermissionSetArn=arn, CustomerManagedPolicyReference=_policy_reference(reference)))
+            for reference in sorted(current['customer_managed_policies'] - wanted)
+        )
+
+    if desired.get('permissions_boundary') is not None:
+        wanted = _boundary(desired['permissions_boundary'])
+        if wanted is None and current['permissions_boundary'] is not None:
+            changes.append(('delete_permissions_boundary_from_permission_set', dict(PermissionSetArn=arn)))
+        elif wanted is not None and wanted != current['permissions_boundary']:
+            if wanted[0] == 'managed':
+                boundary = {'ManagedPolicyArn': wanted[1]}
+            else:
+                boundary = {'CustomerManagedPolicyReference': _policy_reference(wanted[1:])}
+            changes.append(('put_permissions_boundary_to_permission_set',
+                            dict(PermissionSetArn=arn, PermissionsBoundary=boundary)))
+
+    if desired.get('inline_policy') is not None:
+        wanted = json.loads(desired['inline_policy']) if desired['inline_policy'] else None
+        if not wanted:
+            if current['inline_policy'] is not None:
+                changes.append(('delete_inline_policy_from_permission_set', dict(PermissionSetArn=arn)))
+        elif current['inline_policy'] is None or compare_policies(current['inline_policy'], wanted):
+            changes.append(('put_inline_policy_to_permission_set',
+                            dict(PermissionSetArn=arn, InlinePolicy=json.dumps(wanted))))
+
+    if desired.get('tags') is not None:
+        to_set, to_delete = compare_aws_tags(current['tags'], desired['tags'], desired.get('purge_tags', True))
+        if to_set:
+            changes.append(('tag_resource', dict(ResourceArn=arn, Tags=ansible_dict_to_boto3_tag_list(to_set))))
+        if to_delete:
+            changes.append(('untag_resource', dict(ResourceArn=arn, TagKeys=sorted(to_delete))))
+    return changes
+
+
+def apply_permission_set_changes(client, instance_arn, changes):
+    """
+    Make the planned calls one after the other: concurrent changes of a permission set
+    conflict with each other. The client must have a retry decorator.
+    """
+    for operation, params in changes:
+        getattr(client, operation)(aws_retry=True, InstanceArn=instance_arn, **params)
+
+
+def provisioning_required(changes):
+    return any(operation in PROVISIONED_OPERATIONS for operation, params in changes)
+
+
+# ProvisioningStatus filter of the accounts whose copy of a permission set is out of date
+OUTDATED = 'LATEST_PERMISSION_SET_NOT_PROVISIONED'
+
+
+@AWSRetry.jittered_backoff()
+def list_provisioned_accounts(client, instance_arn, arn, provisioning_status=None):
+    """IDs of the accounts a permission set is provisioned to, optionally only those with the provisioning_status."""
+    params = dict(InstanceArn=instance_arn, PermissionSetArn=arn)
+    if provisioning_status:
+        params['ProvisioningStatus'] = provisioning_status
+    return _paginate(client, 'list_accounts_for_provisioned_permission_set', 'AccountIds', **params)
+
+
+def provision_permission_sets(client, instance_arn, arns, only_outdated=True, wait=True, timeout=600,
+                              max_workers=10, check_mode=False):
+    """
+    Provision permission sets again to the accounts they are provisioned to, one account at a time.
+
+    The accounts of every permission set are listed concurrently - only those running an outdated
+    copy when only_outdated - and each one is provisioned with its own request, so accounts that
+    are up to date are not touched. All requests are made concurrently and, with wait, tracked
+    together until they complete or timeout expires.
+
+    Returns a dict with the (permission set ARN, account ID) targets, the tracked requests as
+    returned by track_requests(), the counts of their statuses, the latency percentiles and the
+    failed targets with their reason.
+    """
+    arns = list(dict.fromkeys(arns))
+    targets = []
+    for arn, account_ids, error in run_concurrently(
+        lambda arn: list_provisioned_accounts(client, instance_arn, arn, OUTDATED if only_outdated else None),
+        arns, max_workers=max_workers
+    ):
+        if error is not None:
+            raise error
+        targets.extend((arn, account_id) for account_id in account_ids)
+
+    result = dict(targets=targets, requests={}, failed=[])
+    if check_mode or not targets:
+        result['counts'] = count_statuses(result['requests'])
+        return result
+
+    def provision(target):
+        return client.provision_permission_set(
+            aws_retry=True, InstanceArn=instance_arn, PermissionSetArn=target[0], TargetId=target[1],
+            TargetType='AWS_ACCOUNT'
+        )['PermissionSetProvisioningStatus']
+
+    requests = {}
+    for target, status, error in run_concurrently(provision, targets, max_workers=max_workers):
+        if error is None and status.get('Status') == 'FAILED':
+            error = status.get('FailureReason')
+        if error is not None:
+            result['failed'].append(dict(permission_set_arn=target[0], account_id=target[1], msg=str(error)))
+        else:
+            requests[status['RequestId']] = target
+            result['requests'][status['RequestId']] = dict(
+                kind='provision', status=status['Status'], failure_reason=None, latency=None
+            )
+
+    if wait:
+        tracked = track_requests(
+            client, instance_arn,
+            [('provision', request_id) for request_id, request in result['requests'].items()
+             if request['status'] == 'IN_PROGRESS'],
+            timeout=timeout, max_workers=max_workers
+        )
+        result['requests'].update(tracked)
+        result['latency'] = latency_percentiles(tracked)
+        result['failed'].extend(
+            dict(permission_set_arn=requests[request_id][0], account_id=requests[request_id][1],
+                 msg=request['failure_reason'])
+            for request_id, request in tracked.items() if request['status'] == 'FAILED'
+        )
+    result['counts'] = count_statuses(result['requests'])
+    return result
@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timezone
+
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+
+# Kind of asynchronous SSO admin request -> (list operation, its result key,
+# describe operation, its request ID parameter, its result key)
+STATUS_APIS = {
+    'create': ('list_account_assignment_creation_status', 'AccountAssignmentsCreationStatus',
+               'describe_account_assignment_creation_status', 'AccountAssignmentCreationRequestId',
+               'AccountAssignmentCreationStatus'),
+    'delete': ('list_account_assignment_deletion_status', 'AccountAssignmentsDeletionStatus',
+               'describe_account_assignment_deletion_status', 'AccountAssignmentDeletionRequestId',
+               'AccountAssignmentDeletionStatus'),
+    'provision': ('list_permission_set_provisioning_status', 'PermissionSetsProvisioningStatus',
+                  'describe_permission_set_provisioning_status', 'ProvisionPermissionSetRequestId',
+                  'PermissionSetProvisioningStatus'),
+}
+
+# With more pending requests of a kind than this, one paginated listing of the requests still
+# in progress is cheaper than describing every pending request
+LIST_THRESHOLD = 10
+
+
+@AWSRetry.jittered_backoff()
+def describe_request_status(client, instance_arn, kind, request_id):
+    list_operation, list_key, operation, id_param, key = STATUS_APIS[kind]
+    return getattr(client, operation)(InstanceArn=instance_arn, **{id_param: request_id})[key]
+
+
+@AWSRetry.jittered_backoff()
+def list_in_progress_request_ids(client, instance_arn, kind):
+    list_operation, list_key = STATUS_APIS[kind][:2]
+    paginator = client.get_paginator(list_operation)
+    return {
+        status['RequestId']
+        for page in paginator.paginate(InstanceArn=instance_arn, Filter={'Status': 'IN_PROGRESS'})
+        for status in page.get(list_key, [])
+    }
+
+
+def _latency(status, started, now):
+    created = status.get('CreatedDate')
+    if isinstance(created, datetime):
+        return max(0.0, (datetime.now(timezone.utc) - created).total_seconds())
+    return now - started
+
+
+def track_requests(client, instance_arn, requests, timeout=300, max_workers=10, delay=1, max_delay=15,
+                   sleep=time.sleep, clock=time.monotonic):
+    """
+    Wait for many asynchronous requests to complete.
+
+    requests is an iterable of (kind, request_id) with kind a key of STATUS_APIS. Every round
+    polls all pending requests concurrently - or lists the requests still in progress when many
+    are pending - then sleeps once. The sleep doubles, up to max_delay, after rounds in which
+    no request completed.
+
+    Returns a dict of request_id -> {kind, status, failure_reason, latency}. Requests still in
+    progress after timeout seconds keep the IN_PROGRESS status.
+    """
+    started = clock()
+    pending = dict((request_id, kind) for kind, request_id in requests)
+    results = {}
+
+    def describe(request):
+        return describe_request_status(client, instance_arn, pending[request], request)
+
+    while pending:
+        candidates = []
+        for kind in set(pending.values()):
+            request_ids = [request_id for request_id, request_kind in pending.items() if request_kind == kind]
+            if len(request_ids) > LIST_THRESHOLD:
+                in_progress = list_in_progress_request_ids(client, instance_arn, kind)
+                request_ids = [request_id for request_id in request_ids if request_id not in in_progress]
+            candidates.extend(request_ids)
+
+        completed = 0
+        for request_id, status, error in run_concurrently(describe, candidates, max_workers=max_workers):
+            if error is not None:
+                raise error
+            if status['Status'] != 'IN_PROGRESS':
+                results[request_id] = dict(
+                    kind=pending.pop(request_id),
+                    status=status['Status'],
+                    failure_reason=status.get('FailureReason'),
+                    latency=round(_latency(status, started, clock()), 1),
+                )
+                completed += 1
+
+        if not pending or clock() - started + delay > timeout:
+            break
+        sleep(delay)
+        if not completed:
+            delay = min(delay * 2, max_delay)
+
+    for request_id, kind in pending.items():
+        results[request_id] = dict(kind=kind, status='IN_PROGRESS', failure_reason=None, latency=None)
+    return results
+
+
+def latency_percentiles(results):
+    """Nearest rank p50, p90, p99 and max of the latencies of the completed requests."""
+    latencies = sorted(result['latency'] for result in results.values() if result['latency'] is not None)
+    if not latencies:
+        return {}
+
+    def percentile(rank):
+        return latencies[max(0, -(-len(latencies) * rank // 100) - 1)]
+
+    return {'p50': percentile(50), 'p90': percentile(90), 'p99': percentile(99), 'max': latencies[-1]}
+
+
+def count_statuses(results):
+    counts = {'SUCCEEDED': 0, 'FAILED': 0, 'IN_PROGRESS': 0}
+    for result in results.values():
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return counts
@@ -0,0 +1,109 @@
+import threading
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import \
+    get_principal_id, unique_attribute, external_id
+
+# Resolved IDs shared by every resolver of the process, including misses (None):
+# (identity store ID, kind, alternate identifier key) -> ID
+_RESOLVED = {}
+_RESOLVED_LOCK = threading.Lock()
+
+
+def _identifier_key(alternate_identifier):
+    if 'ExternalId' in alternate_identifier:
+        external = alternate_identifier['ExternalId']
+        return ('externalId', external['Issuer'], external['Id'])
+    attribute = alternate_identifier['UniqueAttribute']
+    return (attribute['AttributePath'], attribute['AttributeValue'])
+
+
+def principal_cache_key(identity_store_id, kind, name):
+    """Key of a user or group name in the FileCache of the idc_id lookup."""
+    return f"{identity_store_id}|{kind}|{name}"
+
+
+def clear_resolved():
+    """Forget every resolved ID of the process."""
+    with _RESOLVED_LOCK:
+        _RESOLVED.clear()
+
+
+class IdentityResolver:
+    """
+    Resolve users and groups to their IDs with GetUserId / GetGroupId.
+
+    Results are memoized for the lifetime of the process and shared between resolvers of
+    the same identity store, so a name is looked up at most once. Misses are memoized as
+    well; callers that create or delete a principal must call remember() or forget().
+    """
+
+    def __init__(self, client, identity_store_id):
+        self.client = client
+        self.identity_store_id = identity_store_id
+
+    def _key(self, kind, alternate_identifier):
+        return (self.identity_store_id, kind, _identifier_key(alternate_identifier))
+
+    def resolve(self, kind, alternate_identifier):
+        key = self._key(kind, alternate_identifier)
+        with _RESOLVED_LOCK:
+            if key in _RESOLVED:
+                return _RESOLVED[key]
+
+        principal_id = get_principal_id(self.client, self.identity_store_id, kind, alternate_identifier)
+        with _RESOLVED_LOCK:
+            _RESOLVED[key] = principal_id
+        return principal_id
+
+    def user_id(self, user_name=None, email=None, issuer=None, external_user_id=None):
+        """
+        Return the UserId of the user with this user name, email address or external ID, or None.
+        """
+        if user_name is not None:
+            return self.resolve('user', unique_attribute('userName', user_name))
+        if email is not None:
+            return self.resolve('user', unique_attribute('emails.value', email))
+        return self.resolve('user', external_id(issuer, external_user_id))
+
+    def group_id(self, display_name=None, issuer=None, external_group_id=None):
+        """
+        Return the GroupId of the group with this display name or external ID, or None.
+        """
+        if display_name is not None:
+            return self.resolve('group', unique_attribute('displayName', display_name))
+        return self.resolve('group', external_id(issuer, external_group_id))
+
+    def resolve_names(self, kind, names, cache=None, max_workers=10):
+        """
+        Resolve user names or group display names (kind) to their IDs, None for those that do not exist.
+
+        Names are first read from the FileCache of the idc_id lookup when given, the others are resolved
+        concurrently and the IDs found are stored in it. Misses are not stored: the principal may be
+        created by a later task.
+        """
+        keys = {name: principal_cache_key(self.identity_store_id, kind, name) for name in names}
+        cached = cache.get_many(list(keys.values())) if cache is not None else {}
+        ids = {name: cached[key] for name, key in keys.items() if key in cached}
+
+        resolve = self.user_id if kind == 'user' else self.group_id
+        missing = [name for name in names if name not in ids]
+        for name, principal_id, error in run_concurrently(resolve, missing, max_workers=max_workers):
+            if error is not None:
+                raise error
+            ids[name] = principal_id
+
+        found = {keys[name]: ids[name] for name in missing if ids[name] is not None}
+        if cache is not None and found:
+            cache.set_many(found)
+        return ids
+
+    def remember(self, kind, alternate_identifier, principal_id):
+        """Record the ID of a principal that was just created."""
+        with _RESOLVED_LOCK:
+            _RESOLVED[self._key(kind, alternate_identifier)] = principal_id
+
+    def forget(self, kind, alternate_identifier):
+        """Drop the memoized ID of a principal, e.g. after deleting it."""
+        with _RESOLVED_LOCK:
+            _RESOLVED.pop(self._key(kind, alternate_identifier), None)
@@ -0,0 +1,185 @@
+import threading
+
+from ansible_collections.amazon.aws.plugins.module_utils.botocore import is_boto3_error_code
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+
+# Name -> ARN maps of the instances crawled by this process: (region, instance ARN) -> dict
+_CRAWLED = {}
+_CRAWLED_LOCK = threading.Lock()
+
+
+def _find_identity_store_id(client, instance_arn):
+    paginator = client.get_paginator('list_instances')
+    for page in paginator.paginate():
+        for instance in page.get('Instances', []):
+            if instance.get('InstanceArn') == instance_arn:
+                return instance.get('IdentityStoreId')
+    return None
+
+
+def get_identity_store_id(client, instance_arn, region=None, cache=None):
+    """
+    Find the Identity Store ID associated with an SSO instance ARN.
+
+    Returns None when no instance has this ARN; API errors are raised to the caller.
+    When a FileCache is given the mapping is read from and stored in it. Instance
+    ARNs are globally unique, so the region completes the key without needing an
+    extra STS call to learn the account.
+    """
+    key = f"{region or ''}|{instance_arn}"
+    if cache is not None:
+        identity_store_id = cache.get(key)
+        if identity_store_id:
+            return identity_store_id
+
+    identity_store_id = _find_identity_store_id(client, instance_arn)
+    if identity_store_id and cache is not None:
+        cache.set(key, identity_store_id)
+    return identity_store_id
+
+
+@AWSRetry.jittered_backoff()
+def describe_permission_set(client, instance_arn, permission_set_arn):
+    return client.describe_permission_set(InstanceArn=instance_arn, PermissionSetArn=permission_set_arn)['PermissionSet']
+
+
+def describe_permission_sets(client, instance_arn, max_workers=10):
+    """
+    List the permission sets of an instance and describe them concurrently.
+
+    Returns the PermissionSet dicts of DescribePermissionSet in listing order.
+    """
+    arns = [
+        arn
+        for page in client.get_paginator('list_permission_sets').paginate(InstanceArn=instance_arn)
+        for arn in page.get('PermissionSets', [])
+    ]
+
+    permission_sets = []
+    outcomes = run_concurrently(
+        lambda arn: describe_permission_set(client, instance_arn, arn), arns, max_workers=max_workers
+    )
+    for arn, permission_set, error in outcomes:
+        if error is not None:
+            raise error
+        permission_sets.append(permission_set)
+    return permission_sets
+
+
+def permission_set_arns_by_name(client, instance_arn, max_workers=10):
+    """Return a dict of permission set name -> ARN for every permission set of the instance."""
+    return {
+        permission_set['Name']: permission_set['PermissionSetArn']
+        for permission_set in describe_permission_sets(client, instance_arn, max_workers)
+    }
+
+
+def clear_crawled():
+    """Forget the permission set maps crawled by the process."""
+    with _CRAWLED_LOCK:
+        _CRAWLED.clear()
+
+
+def _index_key(region, instance_arn, name):
+    return f"{region or ''}|{instance_arn}|{name}"
+
+
+def _index_complete_key(region, instance_arn):
+    # Permission set names cannot contain '#', so this never collides with _index_key()
+    return f"{region or ''}|{instance_arn}#complete"
+
+
+def _still_named(client, instance_arn, name, arn):
+    try:
+        return describe_permission_set(client, instance_arn, arn)['Name'] == name
+    except is_boto3_error_code('ResourceNotFoundException'):
+        return False
+
+
+def find_permission_set_arns(client, instance_arn, names, region=None, cache=None, max_workers=10, verify=False):
+    """
+    Resolve permission set names to ARNs, None for the names that do not exist.
+
+    Names are served from the map crawled by this process, then from the FileCache, where a name
+    missing from a complete index that has not expired does not exist. Any other name costs one
+    crawl of the instance, with the permission sets described concurrently, and the whole crawled
+    map is cached. With verify, for callers about to write, ARNs read from the cache file are
+    described first so a permission set deleted or renamed by someone else is not returned, and
+    a name missing from the cache file is crawled even when the index is complete, as it may have
+    been created by someone else since.
+    """
+    with _CRAWLED_LOCK:
+        crawled = _CRAWLED.get((region, instance_arn))
+    if crawled is not None:
+        return {name: crawled.get(name) for name in names}
+
+    keys = {name: _index_key(region, instance_arn, name) for name in names}
+    complete_key = _index_complete_key(region, instance_arn)
+    cached = cache.get_many(list(keys.values()) + [complete_key]) if cache is not None else {}
+    arns = {name: cached[key] for name, key in keys.items() if key in cached}
+    stale = False
+    if verify and arns:
+        for name, still_named, error in run_concurrently(
+            lambda name: _still_named(client, instance_arn, name, arns[name]), list(arns), max_workers
+        ):
+            if error is not None:
+                raise error
+            if not still_named:
+                del arns[name]
+                stale = True
+
+    if stale or (len(arns) < len(keys) and (verify or not cached.get(complete_key))):
+        crawled = index_permission_sets(client, instance_arn, region, cache, max_workers)
+        arns = {name: crawled.get(name) for name in names}
+    return {name: arns.get(name) for name in names}
+
+
+def index_permission_sets(client, instance_arn, region=None, cache=None, max_workers=10):
+    """
+    Crawl the name -> ARN map of every permission set of the instance, describing them
+    concurrently, and store it with store_permission_set_index().
+    """
+    crawled = permission_set_arns_by_name(client, instance_arn, max_workers)
+    store_permission_set_index(instance_arn, crawled, region, cache)
+    return crawled
+
+
+def store_permission_set_index(instance_arn, arns, region=None, cache=None):
+    """
+    Record the complete name -> ARN map of an instance, in memory and in the FileCache.
+
+    The FileCache also gets an entry marking the index complete, with the same TTL, so a name
+    missing from it is known not to exist until the index expires.
+    """
+    with _CRAWLED_LOCK:
+        _CRAWLED[(region, instance_arn)] = dict(arns)
+    if cache is not None:
+        entries = {_index_key(region, instance_arn, name): arn for name, arn in arns.items()}
+        entries[_index_complete_key(region, instance_arn)] = True
+        cache.set_many(entries)
+
+
+def forget_permission_set_index(instance_arn, region=None, cache=None):
+    """Drop the map crawled by this process and the completeness of the cached index, once found stale."""
+    with _CRAWLED_LOCK:
+        _CRAWLED.pop((region, instance_arn), None)
+    if cache is not None:
+        cache.delete(_index_complete_key(region, instance_arn))
+
+
+def remember_permission_set_arn(instance_arn, name, arn, region=None, cache=None):
+    """Record the creation of a permission set, or its deletion when arn is None."""
+    with _CRAWLED_LOCK:
+        crawled = _CRAWLED.get((region, instance_arn))
+        if crawled is not None:
+            if arn is None:
+                crawled.pop(name, None)
+            else:
+                crawled[name] = arn
+    if cache is not None:
+        if arn is None:
+            cache.delete(_index_key(region, instance_arn, name))
+        else:
+            cache.set(_index_key(region, instance_arn, name), arn)
@@ -0,0 +1,263 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: groups
+version_added_collection: begoingto.aws_identity_center
+short_description: Reconcile many AWS Identity Center groups in one task
+description:
+  - Manage a list of AWS Identity Center groups in a single task.
+  - The identity store is read once with a paginated C(list_groups) call and indexed by display name.
+    Groups are then created, have their description updated or are deleted concurrently.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  identity_store_id:
+    description:
+      - AWS identity store ID.
+    required: true
+    type: str
+  groups:
+    description:
+      - The desired groups.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - The display name of the group.
+        required: true
+        type: str
+      description:
+        description:
+          - A description of the group.
+          - The description of an existing group is left untouched when not set.
+        required: false
+        type: str
+      state:
+        description:
+          - Whether the group should exist.
+        type: str
+        default: present
+        choices: [ 'present', 'absent' ]
+  purge:
+    description:
+      - Delete groups of the identity store that are not listed in O(groups).
+    type: bool
+    default: false
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls used to apply the changes.
+    type: int
+    default: 10
+notes:
+  - Deleting groups also removes their names from the cache file of the C(idc_id) lookup.
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+  - begoingto.aws_identity_center.cache
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Sync the groups from HR, removing the others
+  begoingto.aws_identity_center.groups:
+    identity_store_id: d-1234567890
+    purge: true
+    groups:
+      - name: developers
+        description: Application developers
+      - name: operations
+        description: Platform operations
+"""
+
+RETURN = r"""
+groups:
+  description: The outcome for every group that was created, updated, deleted, left unchanged or failed.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - name: developers
+      group_id: 9067d2b5-5af1-4f9d-b1f0-0c5e1e1b7d1a
+      action: updated
+counts:
+  description: Number of groups per outcome.
+  returned: always
+  type: dict
+  sample: {"created": 2, "updated": 1, "deleted": 0, "unchanged": 1197, "failed": 0}
+api_calls:
+  description: Number of identity store API calls made by the task.
+  returned: always
+  type: dict
+  sample: {"total": 16, "operations": {"CreateGroup": 2, "ListGroups": 13, "UpdateGroup": 1}}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.attribute_schema import AttributeSchema
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import \
+    apply_plan, find_duplicates, ApiCallCounter, count_actions, PAST_TENSE
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import snapshot_groups
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import principal_cache_key
+
+ACTIONS = ('created', 'updated', 'deleted', 'unchanged', 'failed')
+
+GROUP_SCHEMA = AttributeSchema(
+    {"name": {"type": "str"}, "description": {"type": "str"}},
+    api_names={"name": "DisplayName"}
+)
+
+
+def plan_groups(desired_groups, existing_groups, purge):
+    """
+    Compute the planned change for every desired group, and for unmanaged groups when purging.
+    """
+    plan = []
+    for desired in desired_groups:
+        name = desired['name']
+        current = existing_groups.get(name)
+        if desired['state'] == 'absent':
+            plan.append({'action': 'delete' if current else 'unchanged', 'name': name, 'current': current})
+            continue
+
+        attributes, leaves = GROUP_SCHEMA.build(desired)
+        if current is None:
+            plan.append({'action': 'create', 'name': name, 'attributes': attributes, 'current': None})
+            continue
+
+        # The display name is the key of the index, only the description can differ
+        operations = GROUP_SCHEMA.operations([leaf for leaf in leaves if leaf[0] != ('DisplayName',)], current)
+        plan.append({
+            'action': 'update' if operations else 'unchanged',
+            'name': name,
+            'current': current,
+            'operations': operations,
+        })
+
+    if purge:
+        managed = {desired['name'] for desired in desired_groups}
+        for name, current in existing_groups.items():
+            if name not in managed:
+                plan.append({'action': 'delete', 'name': name, 'current': current})
+
+    return plan
+
+
+def change_result(change, action):
+    return {
+        'name': change['name'],
+        'group_id': change['current']['GroupId'] if change['current'] else None,
+        'action': action,
+    }
+
+
+def apply_change(client, identity_store_id, change):
+    """
+    Apply one planned change and return its per group result.
+    """
+    action = change['action']
+
+    if action == 'create':
+        response = client.create_group(aws_retry=True, IdentityStoreId=identity_store_id, **change['attributes'])
+        return dict(change_result(change, 'created'), group_id=response['GroupId'])
+
+    if action == 'update':
+        client.update_group(
+            aws_retry=True,
+            IdentityStoreId=identity_store_id,
+            GroupId=change['current']['GroupId'],
+            Operations=change['operations']
+        )
+        return change_result(change, 'updated')
+
+    if action == 'delete':
+        client.delete_group(aws_retry=True, IdentityStoreId=identity_store_id, GroupId=change['current']['GroupId'])
+        return change_result(change, 'deleted')
+
+    return change_result(change, 'unchanged')
+
+
+def reconcile_groups(client, module):
+    identity_store_id = module.params['identity_store_id']
+    desired_groups = module.params['groups']
+
+    duplicates = find_duplicates(desired['name'] for desired in desired_groups)
+    if duplicates:
+        module.fail_json(msg=f"Duplicate group names in groups: {', '.join(duplicates)}")
+
+    counter = ApiCallCounter(client)
+    existing_groups = {
+        group['DisplayName']: group for group in snapshot_groups(client, identity_store_id).values()
+    }
+    plan = plan_groups(desired_groups, existing_groups, module.params['purge'])
+
+    if module.check_mode:
+        results = [change_result(change, PAST_TENSE[change['action']]) for change in plan]
+    else:
+        results = apply_plan(
+            plan,
+            lambda change: apply_change(client, identity_store_id, change),
+            lambda change, error: dict(change_result(change, 'failed'),
+                                       msg=f"Failed to {change['action']} group: {error}"),
+            max_workers=module.params['max_workers']
+        )
+
+    # The idc_id lookup must not resolve the deleted groups to their former IDs
+    deleted = [principal_cache_key(identity_store_id, 'group', result['name'])
+               for result in results if result['action'] == 'deleted']
+    if deleted and not module.check_mode:
+        FileCache.from_module(module, 'idc_id').delete_many(deleted)
+
+    counts = count_actions(results, ACTIONS)
+    changed = any(counts[action] for action in ('created', 'updated', 'deleted'))
+    result = dict(changed=changed, groups=results, counts=counts, api_calls=counter.as_dict())
+
+    if counts['failed']:
+        module.fail_json(msg=f"{counts['failed']} of {len(results)} groups failed", **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict(
+        identity_store_id=dict(type='str', required=True),
+        groups=dict(
+            type='list',
+            required=True,
+            elements='dict',
+            options=dict(
+                name=dict(type='str', required=True),
+                description=dict(type='str', required=False),
+                state=dict(type='str', default='present', choices=['present', 'absent']),
+            )
+        ),
+        purge=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=10),
+        **cache_argument_spec()
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        connection = module.client('identitystore', retry_decorator=AWSRetry.jittered_backoff())
+        reconcile_groups(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to reconcile groups")
+
+
+if __name__ == '__main__':
+    main()
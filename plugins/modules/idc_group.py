@@ -36,10 +36,13 @@ options:
     required: true
     choices: [ 'present', 'absent' ]
     type: str
+notes:
+  - Deleting a group also removes its name from the cache file of the C(idc_id) lookup.
 extends_documentation_fragment:
   - amazon.aws.common.modules
   - amazon.aws.region.modules
   - amazon.aws.boto3
+  - begoingto.aws_identity_center.cache
 """
 
 EXAMPLES = r"""
@@ -60,6 +63,12 @@ EXAMPLES = r"""
 from ansible_collections.community.aws.plugins.module_utils.modules import AnsibleCommunityAWSModule as AnsibleAWSModule
 from botocore.exceptions import ClientError
 
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import unique_attribute
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import \
+    IdentityResolver, principal_cache_key
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+
 def create_group(connection, module):
     display_name = module.params['name']
     description = module.params['description']
@@ -68,10 +77,10 @@ def create_group(connection, module):
     group_exists = get_idc_group(connection, module)
 
     if group_exists:
-        if group_exists[0]['Description'] == description:
+        if group_exists[0].get('Description') == description:
             module.exit_json(changed=False, idc_group=display_name)
         else:
-            update_group(connection, module)
+            update_group(connection, module, group_exists[0])
     else:
         if description == None:
             response = connection.create_group(
@@ -95,32 +104,33 @@ def destroy_group(connection, module):
     display_name = module.params['name']
     identity_store_id = module.params['identity_store_id']
 
-    existing_groups = get_idc_group(connection, module)
+    resolver = IdentityResolver(connection, identity_store_id)
+    group_id = resolver.group_id(display_name=display_name)
 
-    if existing_groups:
-        connection.delete_group(
-            IdentityStoreId=identity_store_id,
-            GroupId=existing_groups[0]['GroupId']
-        )
+    if group_id:
+        if not module.check_mode:
+            connection.delete_group(
+                IdentityStoreId=identity_store_id,
+                GroupId=group_id
+            )
+            resolver.forget('group', unique_attribute('displayName', display_name))
+            FileCache.from_module(module, 'idc_id').delete(
+                principal_cache_key(identity_store_id, 'group', display_name)
+            )
 
         module.exit_json(changed=True, idc_group=display_name)
     else:
         module.exit_json(changed=False, idc_group=display_name)
 
-    if module.check_mode:
-        module.exit_json(changed=True, idc_group=display_name)
 
-
-def update_group(connection, module):
+def update_group(connection, module, group):
     display_name = module.params['name']
     identity_store_id = module.params['identity_store_id']
     description = module.params['description']
 
-    group = get_idc_group(connection, module)
-
     response = connection.update_group(
                    IdentityStoreId=identity_store_id,
-                   GroupId=group[0]['GroupId'],
+                   GroupId=group['GroupId'],
                    Operations=[
                        {
                            'AttributePath': 'Description',
@@ -157,6 +167,7 @@ def main():
         description=dict(type='str', required=False, default=None),
         region=dict(type='str', required=True),
         state=dict(choices=['present', 'absent'], required=True),
+        **cache_argument_spec()
     )
 
     module = AnsibleAWSModule(
@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: idc_group_membership
+version_added_collection: begoingto.aws_identity_center
+short_description: Manage the members of an AWS Identity Center group
+description:
+  - Add users to or remove users from an AWS Identity Center group.
+  - The current members are read once with a paginated C(list_group_memberships) call, the memberships to add and
+    to remove are computed as set differences and the changes are applied concurrently.
+  - Calls that are throttled are retried with jittered exponential backoff.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  identity_store_id:
+    description:
+      - AWS identity store ID.
+    required: true
+    type: str
+  group:
+    description:
+      - The display name of the group.
+      - Exactly one of O(group) and O(group_id) is required.
+    required: false
+    type: str
+  group_id:
+    description:
+      - The ID of the group.
+    required: false
+    type: str
+  members:
+    description:
+      - User names of the members.
+      - With O(state=absent), a user that does not exist is not a member, so it is ignored.
+    required: false
+    type: list
+    elements: str
+    default: []
+  member_ids:
+    description:
+      - User IDs of the members.
+    required: false
+    type: list
+    elements: str
+    default: []
+  state:
+    description:
+      - With V(present), the listed users are made members of the group.
+      - With V(absent), the listed users are removed from the group.
+    type: str
+    default: present
+    choices: [ 'present', 'absent' ]
+  exclusive:
+    description:
+      - With O(state=present), also remove the members that are not listed, so the group ends up with exactly
+        the listed members.
+      - When V(false), members are only added.
+    type: bool
+    default: false
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls used to resolve user names and apply the changes.
+    type: int
+    default: 10
+notes:
+  - User and group names are resolved through the cache file of the C(idc_id) lookup, and the IDs found are added
+    to it.
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+  - begoingto.aws_identity_center.cache
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Make the group contain exactly these users
+  begoingto.aws_identity_center.idc_group_membership:
+    identity_store_id: d-1234567890
+    group: developers
+    members:
+      - jane.doe
+      - john.doe
+    exclusive: true
+
+- name: Remove a user from a group
+  begoingto.aws_identity_center.idc_group_membership:
+    identity_store_id: d-1234567890
+    group: developers
+    members:
+      - john.doe
+    state: absent
+"""
+
+RETURN = r"""
+group_id:
+  description: The ID of the group.
+  returned: always
+  type: str
+  sample: 9067d2b5-5af1-4f9d-b1f0-0c5e1e1b7d1a
+added:
+  description: The user IDs that were added to the group.
+  returned: always
+  type: list
+  elements: str
+  sample: ["906723b5-1234-5678-9012-123456789012"]
+removed:
+  description: The user IDs that were removed from the group.
+  returned: always
+  type: list
+  elements: str
+  sample: []
+failed:
+  description: The user IDs whose membership change failed, with the error message.
+  returned: when a change failed
+  type: list
+  elements: dict
+  sample: [{"user_id": "906723b5-1234-5678-9012-123456789012", "msg": "An error occurred (ThrottlingException)"}]
+"""
+
+from ansible_collections.community.aws.plugins.module_utils.modules import AnsibleCommunityAWSModule as AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import \
+    snapshot_group_memberships
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import IdentityResolver
+
+
+def resolve_member_ids(resolver, module, cache):
+    user_names = list(dict.fromkeys(module.params['members']))
+    resolved = resolver.resolve_names('user', user_names, cache, module.params['max_workers'])
+
+    member_ids = list(module.params['member_ids'])
+    missing = []
+    for user_name in user_names:
+        if resolved[user_name] is None:
+            missing.append(user_name)
+        else:
+            member_ids.append(resolved[user_name])
+
+    # A user that does not exist is already absent from the group
+    if missing and module.params['state'] == 'present':
+        module.fail_json(msg=f"Users not found in the identity store: {', '.join(missing)}")
+
+    return list(dict.fromkeys(member_ids))
+
+
+def plan_memberships(member_ids, current, state, exclusive):
+    """
+    Return the (user IDs to add, user IDs to remove) for the desired members.
+    """
+    if state == 'absent':
+        return [], [user_id for user_id in member_ids if user_id in current]
+
+    desired = set(member_ids)
+    to_add = [user_id for user_id in member_ids if user_id not in current]
+    to_remove = [user_id for user_id in current if user_id not in desired] if exclusive else []
+    return to_add, to_remove
+
+
+def apply_change(client, identity_store_id, group_id, current, change):
+    """
+    Add or remove one member; current maps the user IDs of the members to their membership IDs.
+    """
+    action, user_id = change
+    if action == 'add':
+        return client.create_group_membership(
+            aws_retry=True, IdentityStoreId=identity_store_id, GroupId=group_id, MemberId={'UserId': user_id}
+        )
+    return client.delete_group_membership(
+        aws_retry=True, IdentityStoreId=identity_store_id, MembershipId=current[user_id]
+    )
+
+
+def manage_memberships(connection, module):
+    identity_store_id = module.params['identity_store_id']
+    resolver = IdentityResolver(connection, identity_store_id)
+    cache = FileCache.from_module(module, 'idc_id')
+
+    group_id = module.params['group_id']
+    if not group_id:
+        group = module.params['group']
+        group_id = resolver.resolve_names('group', [group], cache)[group]
+        if group_id is None:
+            module.fail_json(msg=f"Group {group} not found")
+
+    member_ids = resolve_member_ids(resolver, module, cache)
+    current = snapshot_group_memberships(connection, identity_store_id, group_id)
+    to_add, to_remove = plan_memberships(member_ids, current, module.params['state'], module.params['exclusive'])
+
+    result = dict(group_id=group_id)
+    failed = []
+    if module.check_mode:
+        result.update(added=to_add, removed=to_remove)
+    else:
+        result.update(added=[], removed=[])
+        changes = [('add', user_id) for user_id in to_add] + [('remove', user_id) for user_id in to_remove]
+        outcomes = run_concurrently(
+            lambda change: apply_change(connection, identity_store_id, group_id, current, change),
+            changes,
+            max_workers=module.params['max_workers']
+        )
+        for (action, user_id), response, error in outcomes:
+            if error is not None:
+                failed.append({'user_id': user_id, 'msg': f"Failed to {action} member: {error}"})
+            else:
+                result['added' if action == 'add' else 'removed'].append(user_id)
+
+    result['changed'] = bool(result['added'] or result['removed'])
+    if failed:
+        module.fail_json(msg=f"{len(failed)} membership changes failed", failed=failed, **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict(
+        identity_store_id=dict(type='str', required=True),
+        group=dict(type='str', required=False),
+        group_id=dict(type='str', required=False),
+        members=dict(type='list', elements='str', required=False, default=[]),
+        member_ids=dict(type='list', elements='str', required=False, default=[]),
+        state=dict(type='str', default='present', choices=['present', 'absent']),
+        exclusive=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=10),
+        **cache_argument_spec()
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        required_one_of=[('group', 'group_id')],
+        mutually_exclusive=[('group', 'group_id')],
+        supports_check_mode=True
+    )
+
+    connection = module.client("identitystore", retry_decorator=AWSRetry.jittered_backoff())
+
+    try:
+        manage_memberships(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: idc_group_membership_info
+version_added_collection: begoingto.aws_identity_center
+short_description: Check which users are members of which AWS Identity Center groups
+description:
+  - Check every requested user against every requested group and return the result as a boolean matrix.
+  - The checks are batched into C(IsMemberInGroups) calls of up to 100 groups each, so checking one user
+    against 250 groups takes 3 calls. The batches are run concurrently.
+  - User names and group display names are resolved with C(GetUserId) and C(GetGroupId).
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  identity_store_id:
+    description:
+      - AWS identity store ID.
+    required: true
+    type: str
+  users:
+    description:
+      - User names of the users to check.
+    required: false
+    type: list
+    elements: str
+    default: []
+  user_ids:
+    description:
+      - User IDs of the users to check.
+    required: false
+    type: list
+    elements: str
+    default: []
+  groups:
+    description:
+      - Display names of the groups to check.
+    required: false
+    type: list
+    elements: str
+    default: []
+  group_ids:
+    description:
+      - IDs of the groups to check.
+    required: false
+    type: list
+    elements: str
+    default: []
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls.
+    type: int
+    default: 10
+notes:
+  - User and group names are resolved through the cache file of the C(idc_id) lookup, and the IDs found are added
+    to it.
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+  - begoingto.aws_identity_center.cache
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Check whether the on-call engineers are in the admin groups
+  begoingto.aws_identity_center.idc_group_membership_info:
+    identity_store_id: d-1234567890
+    users:
+      - jane.doe
+      - john.doe
+    groups:
+      - platform-admins
+      - security-admins
+  register: admins
+
+- name: Only let members of platform-admins through
+  ansible.builtin.assert:
+    that: admins.memberships['jane.doe']['platform-admins']
+"""
+
+RETURN = r"""
+users:
+  description: The checked users, in the order of the rows of RV(matrix). User names come first, then user IDs.
+  returned: always
+  type: list
+  elements: str
+  sample: ["jane.doe", "john.doe"]
+groups:
+  description: The checked groups, in the order of the columns of RV(matrix). Display names come first, then group IDs.
+  returned: always
+  type: list
+  elements: str
+  sample: ["platform-admins", "security-admins"]
+matrix:
+  description: One row per user with one boolean per group, V(true) when the user is a member of the group.
+  returned: always
+  type: list
+  elements: list
+  sample: [[true, false], [false, false]]
+memberships:
+  description: The same results keyed by user, then by group.
+  returned: always
+  type: dict
+  sample: {"jane.doe": {"platform-admins": true, "security-admins": false}}
+missing_users:
+  description: User names that do not exist in the identity store. They are reported as members of no group.
+  returned: always
+  type: list
+  elements: str
+  sample: []
+missing_groups:
+  description: Group display names that do not exist in the identity store. They are reported as having no members.
+  returned: always
+  type: list
+  elements: str
+  sample: []
+api_calls:
+  description: Number of identity store API calls made by the task.
+  returned: always
+  type: dict
+  sample: {"total": 6, "operations": {"GetGroupId": 2, "GetUserId": 2, "IsMemberInGroups": 2}}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import \
+    run_concurrently, ApiCallCounter
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import \
+    is_member_in_groups, IS_MEMBER_IN_GROUPS_MAX_GROUPS
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import IdentityResolver
+
+
+def resolve_ids(resolver, kind, names, cache, max_workers):
+    """
+    Resolve names concurrently and return (name -> ID for the names found, names not found).
+    """
+    resolved = resolver.resolve_names(kind, names, cache, max_workers)
+    ids = {name: resolved[name] for name in names if resolved[name] is not None}
+    missing = [name for name in names if resolved[name] is None]
+    return ids, missing
+
+
+def plan_batches(user_ids, group_ids, batch_size=IS_MEMBER_IN_GROUPS_MAX_GROUPS):
+    """
+    Split the user x group checks into (user ID, group IDs) batches, one IsMemberInGroups call each.
+    """
+    group_ids = list(dict.fromkeys(group_ids))
+    return [
+        (user_id, tuple(group_ids[start:start + batch_size]))
+        for user_id in dict.fromkeys(user_ids)
+        for start in range(0, len(group_ids), batch_size)
+    ]
+
+
+def check_memberships(client, module):
+    identity_store_id = module.params['identity_store_id']
+    max_workers = module.params['max_workers']
+
+    counter = ApiCallCounter(client)
+    resolver = IdentityResolver(client, identity_store_id)
+    cache = FileCache.from_module(module, 'idc_id')
+    user_names = list(dict.fromkeys(module.params['users']))
+    group_names = list(dict.fromkeys(module.params['groups']))
+    user_ids, missing_users = resolve_ids(resolver, 'user', user_names, cache, max_workers)
+    group_ids, missing_groups = resolve_ids(resolver, 'group', group_names, cache, max_workers)
+    user_ids.update((user_id, user_id) for user_id in module.params['user_ids'])
+    group_ids.update((group_id, group_id) for group_id in module.params['group_ids'])
+
+    found = set()
+    batches = plan_batches(user_ids.values(), group_ids.values())
+    outcomes = run_concurrently(
+        lambda batch: is_member_in_groups(client, identity_store_id, batch[0], batch[1]),
+        batches,
+        max_workers=max_workers
+    )
+    for (user_id, batch_group_ids), results, error in outcomes:
+        if error is not None:
+            raise error
+        found.update((user_id, group_id) for group_id, exists in results.items() if exists)
+
+    users = user_names + [user_id for user_id in module.params['user_ids'] if user_id not in user_names]
+    users = list(dict.fromkeys(users))
+    groups = group_names + [group_id for group_id in module.params['group_ids'] if group_id not in group_names]
+    groups = list(dict.fromkeys(groups))
+
+    memberships = {
+        user: {group: (user_ids.get(user), group_ids.get(group)) in found for group in groups}
+        for user in users
+    }
+
+    module.exit_json(
+        changed=False,
+        users=users,
+        groups=groups,
+        matrix=[[memberships[user][group] for group in groups] for user in users],
+        memberships=memberships,
+        missing_users=missing_users,
+        missing_groups=missing_groups,
+        api_calls=counter.as_dict()
+    )
+
+
+def main():
+    argument_spec = dict(
+        identity_store_id=dict(type='str', required=True),
+        users=dict(type='list', elements='str', required=False, default=[]),
+        user_ids=dict(type='list', elements='str', required=False, default=[]),
+        groups=dict(type='list', elements='str', required=False, default=[]),
+        group_ids=dict(type='list', elements='str', required=False, default=[]),
+        max_workers=dict(type='int', default=10),
+        **cache_argument_spec()
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        connection = module.client('identitystore', retry_decorator=AWSRetry.jittered_backoff())
+        check_memberships(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to check group memberships")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,9 @@ short_description: Manage an AWS Identity Center Permission Set.
 description:
     - This module allows for the creation, update, and deletion of Permission Sets in AWS Identity Center.
     - It is idempotent and will only make changes if the desired state differs from the current state.
+    - The current configuration of an existing permission set is fetched with concurrent calls and compared with
+      the desired one, policies being compared canonically. Only the calls needed to fix the differences are made.
+    - Options that are not set are not managed, so an existing permission set keeps its current value.
 version_added: "1.0.0"
 author:
     - Your Name (@begoingto)
@@ -42,9 +45,10 @@ options:
         description:
             - The length of time that a user can be signed in to an AWS account.
             - Formatted as an ISO 8601 duration string (e.g., 'PT1H' for 1 hour, 'PT8H' for 8 hours).
+            - Defaults to V(PT1H) when the permission set is created. Not managed on an existing permission set when
+              not set.
         required: false
         type: str
-        default: 'PT1H'
     relay_state:
         description:
             - The URL that users are redirected to after signing in.
@@ -53,21 +57,113 @@ options:
     managed_policies:
         description:
             - A list of ARNs for AWS managed policies to attach to the permission set.
+            - The AWS managed policies that are not in the list are detached. Use V([]) to detach them all.
         required: false
         type: list
         elements: str
+    customer_managed_policies:
+        description:
+            - The customer managed policies to attach to the permission set, by name and path.
+            - The references that are not in the list are detached. Use V([]) to detach them all.
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - The name of the IAM policy.
+                    - The policy must exist in every account the permission set is provisioned to.
+                required: true
+                type: str
+            path:
+                description:
+                    - The path of the IAM policy.
+                type: str
+                default: /
+    permissions_boundary:
+        description:
+            - The permissions boundary of the permission set, either an AWS managed policy or a customer managed policy.
+            - Use V({}) to remove the permissions boundary.
+        required: false
+        type: dict
+        suboptions:
+            managed_policy_arn:
+                description:
+                    - The ARN of an AWS managed policy.
+                type: str
+            customer_managed_policy_reference:
+                description:
+                    - A customer managed policy, by name and path.
+                type: dict
+                suboptions:
+                    name:
+                        description:
+                            - The name of the IAM policy.
+                        required: true
+                        type: str
+                    path:
+                        description:
+                            - The path of the IAM policy.
+                        type: str
+                        default: /
     inline_policy:
         description:
-            - A JSON-formatted IAM policy to be embedded in the permission set.
+            - A JSON-formatted IAM policy to be embedded in the permission set, as a string or a dictionary.
+            - Use an empty string to remove the inline policy.
         required: false
-        type: str
+        type: json
     tags:
         description:
             - A dictionary of key-value pairs to tag the permission set.
         required: false
         type: dict
+    purge_tags:
+        description:
+            - Remove the tags that are not in O(tags). Has no effect when O(tags) is not set.
+        required: false
+        type: bool
+        default: true
+    provision:
+        description:
+            - Which accounts the permission set is provisioned to again with O(state=present), so that its changes
+              reach them.
+            - V(outdated) provisions only the accounts running an outdated copy of the permission set.
+            - V(all) provisions every account the permission set is provisioned to.
+            - V(none) does not provision, so that only the definition of the permission set is managed.
+            - V(deferred) does not provision either, but records the permission set when it needs to be provisioned
+              again, so that M(begoingto.aws_identity_center.idc_permission_set_provision) provisions it once at the
+              end of the play however many tasks changed it.
+            - Each account is provisioned with its own request and all requests are made concurrently.
+        required: false
+        type: str
+        choices: ['none', 'outdated', 'all', 'deferred']
+        default: none
+    wait:
+        description:
+            - Wait until the provisioning requests complete, and fail when one of them fails.
+            - Has no effect with O(provision=none) or O(provision=deferred).
+        required: false
+        type: bool
+        default: true
+    wait_timeout:
+        description:
+            - Number of seconds to wait for the provisioning requests.
+        required: false
+        type: int
+        default: 600
+    max_workers:
+        description:
+            - Maximum number of concurrent API calls.
+        required: false
+        type: int
+        default: 10
+notes:
+    - The permission set is found through a name to ARN index of the instance, built by describing every permission
+      set concurrently and kept in the cache file, so most tasks find it without listing the instance. The index is
+      updated when a permission set is created or deleted.
 extends_documentation_fragment:
-    - amazon.aws.common
+    - amazon.aws.common.modules
+    - begoingto.aws_identity_center.cache
 '''
 
 EXAMPLES = r'''
@@ -82,6 +178,32 @@ EXAMPLES = r'''
     managed_policies:
       - "arn:aws:iam::aws:policy/PowerUserAccess"
 
+# Manage every part of a permission set
+- name: Ensure the S3Reader permission set is configured
+  begoingto.aws_identity_center.permission_set:
+    state: present
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    name: "S3Reader"
+    managed_policies: []
+    customer_managed_policies:
+      - name: "s3-reader"
+        path: "/team/"
+    permissions_boundary:
+      managed_policy_arn: "arn:aws:iam::aws:policy/ReadOnlyAccess"
+    inline_policy: "{{ lookup('file', 'deny-delete.json') }}"
+    tags:
+      team: storage
+
+# Change a permission set and provision it again to the accounts running an outdated copy
+- name: Ensure PowerUser has a longer session and reaches every account
+  begoingto.aws_identity_center.permission_set:
+    state: present
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    name: "PowerUser"
+    session_duration: "PT12H"
+    provision: outdated
+    wait_timeout: 900
+
 # Delete a permission set
 - name: Ensure OldPermissionSet is removed
   begoingto.aws_identity_center.permission_set:
@@ -100,59 +222,158 @@ changed:
     description: Whether or not a change was made.
     returned: always
     type: bool
+changes:
+    description: The SSO admin API calls made, or that would be made in check mode, to reach the desired state.
+    returned: when state is 'present'
+    type: list
+    elements: str
+    sample: ['put_inline_policy_to_permission_set', 'untag_resource']
+provisioning_required:
+    description:
+        - Whether the permission set was changed in a way that only reaches the accounts it is provisioned to
+          once it is provisioned again.
+    returned: when state is 'present'
+    type: bool
+provisioning_deferred:
+    description: Whether the provisioning of the permission set was deferred.
+    returned: when state is 'present' and provision is 'deferred'
+    type: bool
+provisioning:
+    description: The accounts the permission set was provisioned to, or would be in check mode.
+    returned: when state is 'present' and provision is 'outdated' or 'all'
+    type: dict
+    contains:
+        accounts:
+            description: IDs of the provisioned accounts.
+            type: list
+            elements: str
+        counts:
+            description: Number of provisioning requests per status.
+            type: dict
+            sample: {"SUCCEEDED": 12, "FAILED": 0, "IN_PROGRESS": 0}
+        failed:
+            description: The accounts whose provisioning failed, with the reason.
+            type: list
+            elements: dict
+        latency:
+            description: Percentiles, in seconds, of the time the provisioning requests took to complete.
+            type: dict
+            sample: {"p50": 8.2, "p90": 14.0, "p99": 21.7, "max": 23.1}
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.amazon.aws.plugins.module_utils.core import AnsibleAWSModule
 from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
 import json
 
-# In a real implementation, you would put helper functions in module_utils
-# For this example, we'll keep it simple.
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.permission_sets import \
+    permission_set_options, fetch_permission_set, create_or_adopt_permission_set, plan_permission_set_changes, \
+    apply_permission_set_changes, provisioning_required, provision_permission_sets
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import \
+    find_permission_set_arns, remember_permission_set_arn
+
 
-def find_permission_set_by_name(client, instance_arn, name):
+def find_permission_set_by_name(client, instance_arn, name, region=None, cache=None, max_workers=10):
     """Helper to find a permission set ARN by its name."""
-    paginator = client.get_paginator('list_permission_sets')
-    for page in paginator.paginate(InstanceArn=instance_arn):
-        for ps_arn in page.get('PermissionSets', []):
-            details = client.describe_permission_set(
-                InstanceArn=instance_arn,
-                PermissionSetArn=ps_arn
-            )
-            if details['PermissionSet']['Name'] == name:
-                return ps_arn
-    return None
+    return find_permission_set_arns(client, instance_arn, [name], region, cache, max_workers, verify=True)[name]
+
+
+def ensure_permission_set(client, module, ps_arn, cache):
+    """
+    Create the permission set or bring it to the desired configuration.
+
+    Only the calls needed to fix the differences are made; in check mode they are only reported.
+    """
+    params = module.params
+    instance_arn = params['instance_arn']
+    result = dict(changed=False, permission_set_arn=ps_arn, changes=[])
+    existed = bool(ps_arn)
+
+    if not existed:
+        # --- CREATE ---
+        result['changed'] = True
+        result['changes'].append('create_permission_set')
+        if module.check_mode:
+            return result
+
+        current, created = create_or_adopt_permission_set(
+            client, instance_arn, params, module.region, cache, params['max_workers']
+        )
+        result['permission_set_arn'] = current['arn']
+        if not created:
+            # Created by someone else since the index was built, so it is updated instead
+            existed = True
+            result.update(changed=False, changes=[])
+    else:
+        # --- UPDATE ---
+        current = fetch_permission_set(client, instance_arn, ps_arn, params['max_workers'])
+
+    changes = plan_permission_set_changes(current, params)
+    result['changes'].extend(operation for operation, change_params in changes)
+    result['provisioning_required'] = existed and provisioning_required(changes)
+    if changes:
+        result['changed'] = True
+        if not module.check_mode:
+            apply_permission_set_changes(client, instance_arn, changes)
+    return result
+
+
+def provision_permission_set(client, module, ps_arn, provisioning_required=False):
+    """Provision the permission set again to the accounts selected by the provision option."""
+    params = module.params
+    provisioned = provision_permission_sets(
+        client,
+        params['instance_arn'],
+        [ps_arn],
+        # In check mode the planned changes have not made any account outdated yet
+        only_outdated=params['provision'] == 'outdated' and not (module.check_mode and provisioning_required),
+        wait=params['wait'],
+        timeout=params['wait_timeout'],
+        max_workers=params['max_workers'],
+        check_mode=module.check_mode
+    )
+    provisioning = dict(
+        accounts=[account_id for arn, account_id in provisioned['targets']],
+        counts=provisioned['counts'],
+        failed=provisioned['failed'],
+    )
+    if provisioned.get('latency'):
+        provisioning['latency'] = provisioned['latency']
+    return provisioning
+
 
 def run_module():
     module_args = dict(
         state=dict(type='str', required=True, choices=['present', 'absent']),
         name=dict(type='str', required=True),
         instance_arn=dict(type='str', required=True),
-        description=dict(type='str', required=False),
-        session_duration=dict(type='str', required=False, default='PT1H'),
-        relay_state=dict(type='str', required=False),
-        managed_policies=dict(type='list', elements='str', required=False, default=[]),
-        inline_policy=dict(type='str', required=False),
-        tags=dict(type='dict', required=False)
+        provision=dict(type='str', default='none', choices=['none', 'outdated', 'all', 'deferred']),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=600),
+        max_workers=dict(type='int', default=10),
+        **permission_set_options(),
+        **cache_argument_spec()
     )
-    
-    required_if = [
-        ("state", "present", ("inline_policy_json",), True),
-    ]
 
     # Using AnsibleAWSModule helps with authentication and client creation
     module = AnsibleAWSModule(
         argument_spec=module_args,
-        required_if=required_if, 
         supports_check_mode=True
     )
 
-    client = module.client('sso-admin')
-    
+    # Changes of one permission set conflict while an earlier one is being applied
+    client = module.client(
+        'sso-admin', retry_decorator=AWSRetry.jittered_backoff(catch_extra_error_codes=['ConflictException'])
+    )
+
     state = module.params['state']
     name = module.params['name']
     instance_arn = module.params['instance_arn']
-    
+    cache = FileCache.from_module(module, 'permission_set_arns')
+
     result = dict(
         changed=False,
         permission_set_arn=''
@@ -160,56 +381,41 @@ def run_module():
 
     try:
         # Find existing permission set
-        ps_arn = find_permission_set_by_name(client, instance_arn, name)
+        ps_arn = find_permission_set_by_name(client, instance_arn, name, module.region, cache,
+                                             module.params['max_workers'])
 
         if state == 'present':
-            if not ps_arn:
-                # --- CREATE ---
-                if module.check_mode:
-                    result['changed'] = True
-                    module.exit_json(**result)
-
-                create_params = {
-                    'InstanceArn': instance_arn,
-                    'Name': name,
-                    'Description': module.params.get('description', ''),
-                    'SessionDuration': module.params['session_duration'],
-                }
-                if module.params.get('relay_state'):
-                    create_params['RelayState'] = module.params['relay_state']
-
-                response = client.create_permission_set(**create_params)
-                ps_arn = response['PermissionSet']['PermissionSetArn']
-                result['changed'] = True
-                # NOTE: In a real module, you'd add logic here to attach policies and tags
-                # This is a simplified example.
-            
-            else:
-                # --- UPDATE (Check for diffs) ---
-                # A full implementation would compare all params (description, duration, etc.)
-                # and call update_permission_set if needed. This is complex.
-                # For this example, we assume if it exists, it's correctly configured.
-                # A real module would set result['changed'] = True if an update is performed.
-                pass
-            
-            result['permission_set_arn'] = ps_arn
+            result = ensure_permission_set(client, module, ps_arn, cache)
+            # A permission set created by this task is not provisioned anywhere yet
+            if module.params['provision'] == 'deferred':
+                result['provisioning_deferred'] = result['provisioning_required']
+            elif module.params['provision'] != 'none' and 'create_permission_set' not in result['changes']:
+                result['provisioning'] = provision_permission_set(
+                    client, module, result['permission_set_arn'], result['provisioning_required']
+                )
+                result['changed'] = result['changed'] or bool(result['provisioning']['accounts'])
 
         elif state == 'absent':
             if ps_arn:
                 # --- DELETE ---
-                if module.check_mode:
-                    result['changed'] = True
-                    module.exit_json(**result)
-
-                client.delete_permission_set(
-                    InstanceArn=instance_arn,
-                    PermissionSetArn=ps_arn
-                )
                 result['changed'] = True
+                if not module.check_mode:
+                    client.delete_permission_set(
+                        aws_retry=True,
+                        InstanceArn=instance_arn,
+                        PermissionSetArn=ps_arn
+                    )
+                    remember_permission_set_arn(instance_arn, name, None, module.region, cache)
 
     except Exception as e:
         module.fail_json(msg=str(e))
 
+    provisioning = result.get('provisioning', {})
+    if provisioning.get('failed'):
+        module.fail_json(msg=f"Provisioning failed in {len(provisioning['failed'])} accounts", **result)
+    elif module.params['wait'] and provisioning.get('counts', {}).get('IN_PROGRESS'):
+        module.fail_json(msg=f"{provisioning['counts']['IN_PROGRESS']} provisioning requests still in progress after "
+                             f"{module.params['wait_timeout']} seconds", **result)
     module.exit_json(**result)
 
 
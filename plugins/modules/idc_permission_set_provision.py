@@ -0,0 +1,172 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: idc_permission_set_provision
+version_added_collection: begoingto.aws_identity_center
+short_description: Provision many AWS Identity Center permission sets at once
+description:
+  - Provision permission sets again to the accounts they are provisioned to, so that their changes reach them.
+  - Each account is provisioned with its own request. The requests of every permission set are made concurrently and
+    tracked together until they complete.
+  - Without O(permission_set_arns), the permission sets are those whose provisioning was deferred with
+    C(provision=deferred) by M(begoingto.aws_identity_center.idc_permission_set) on the same host and instance since
+    the last flush. Each of them is provisioned once however many tasks changed it, so the task can run as a
+    handler or once at the end of the play.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  instance_arn:
+    description:
+      - The ARN of the AWS Identity Center instance.
+    required: true
+    type: str
+  permission_set_arns:
+    description:
+      - The ARNs of the permission sets to provision.
+      - Defaults to the permission sets whose provisioning was deferred, which are then forgotten once provisioned.
+    type: list
+    elements: str
+  provision:
+    description:
+      - V(outdated) provisions only the accounts running an outdated copy of a permission set.
+      - V(all) provisions every account a permission set is provisioned to.
+    type: str
+    choices: ['outdated', 'all']
+    default: outdated
+  wait:
+    description:
+      - Wait until the provisioning requests complete, and fail when one of them fails.
+    type: bool
+    default: true
+  wait_timeout:
+    description:
+      - Number of seconds to wait for the provisioning requests.
+    type: int
+    default: 600
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls.
+    type: int
+    default: 10
+notes:
+  - The deferred permission sets are kept in the C(idc_deferred_provisioning) fact of the host, on the controller.
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Change permission sets without provisioning them after each change
+  begoingto.aws_identity_center.idc_permission_set:
+    state: present
+    instance_arn: "{{ instance_arn }}"
+    name: "{{ item.name }}"
+    inline_policy: "{{ item.policy }}"
+    provision: deferred
+  loop: "{{ permission_sets }}"
+  notify: Provision permission sets
+
+# In the handlers of the play
+- name: Provision permission sets
+  begoingto.aws_identity_center.idc_permission_set_provision:
+    instance_arn: "{{ instance_arn }}"
+"""
+
+RETURN = r"""
+accounts:
+  description: The accounts that were provisioned, or would be in check mode.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - permission_set_arn: arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-1234567890abcdef
+      account_id: "123456789012"
+counts:
+  description: Number of provisioning requests per status.
+  returned: always
+  type: dict
+  sample: {"SUCCEEDED": 12, "FAILED": 0, "IN_PROGRESS": 0}
+failed:
+  description: The accounts whose provisioning failed, with the reason.
+  returned: always
+  type: list
+  elements: dict
+latency:
+  description: Percentiles, in seconds, of the time the provisioning requests took to complete.
+  returned: when O(wait=true) and accounts were provisioned
+  type: dict
+  sample: {"p50": 8.2, "p90": 14.0, "p99": 21.7, "max": 23.1}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.permission_sets import \
+    provision_permission_sets
+
+
+def provision(client, module):
+    params = module.params
+    provisioned = provision_permission_sets(
+        client,
+        params['instance_arn'],
+        params['permission_set_arns'] or [],
+        # In check mode deferred changes may not have been made, so no account is outdated yet
+        only_outdated=params['provision'] == 'outdated' and not module.check_mode,
+        wait=params['wait'],
+        timeout=params['wait_timeout'],
+        max_workers=params['max_workers'],
+        check_mode=module.check_mode
+    )
+    result = dict(
+        changed=bool(provisioned['targets']),
+        accounts=[dict(permission_set_arn=arn, account_id=account_id) for arn, account_id in provisioned['targets']],
+        counts=provisioned['counts'],
+        failed=provisioned['failed'],
+    )
+    if provisioned.get('latency'):
+        result['latency'] = provisioned['latency']
+
+    if result['failed']:
+        module.fail_json(msg=f"Provisioning failed in {len(result['failed'])} accounts", **result)
+    elif params['wait'] and result['counts']['IN_PROGRESS']:
+        module.fail_json(msg=f"{result['counts']['IN_PROGRESS']} provisioning requests still in progress after "
+                             f"{params['wait_timeout']} seconds", **result)
+    else:
+        module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict(
+        instance_arn=dict(type='str', required=True),
+        permission_set_arns=dict(type='list', elements='str'),
+        provision=dict(type='str', default='outdated', choices=['outdated', 'all']),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=600),
+        max_workers=dict(type='int', default=10),
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        connection = module.client(
+            'sso-admin', retry_decorator=AWSRetry.jittered_backoff(catch_extra_error_codes=['ConflictException'])
+        )
+        provision(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to provision permission sets")
+
+
+if __name__ == '__main__':
+    main()
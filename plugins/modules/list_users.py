@@ -28,8 +28,75 @@ options:
             - The username of a specific user to retrieve. If not provided, all users will be returned.
         required: false
         type: str
+    user_names:
+        description:
+            - Retrieve several users by username in one task.
+            - The users are looked up concurrently with one filtered C(list_users) call each, and the usernames
+              that do not exist are returned in RV(missing_user_names).
+            - Mutually exclusive with O(user_name).
+        required: false
+        type: list
+        elements: str
+    include_groups:
+        description:
+            - Add the groups each user belongs to, as C(groups) with the C(group_id) and C(display_name) of every group.
+            - The memberships of the users are fetched concurrently with C(list_group_memberships_for_member),
+              and group IDs are resolved to display names with a single paginated C(list_groups) pass.
+            - C(groups) is always returned when this is set, even if O(fields) does not list it.
+        required: false
+        type: bool
+        default: false
+    max_workers:
+        description:
+            - Maximum number of concurrent lookups when O(user_names) or O(include_groups) is set.
+        required: false
+        type: int
+        default: 10
+    page_size:
+        description:
+            - Number of users requested per C(list_users) page (C(MaxResults)), between 1 and 100.
+            - When listing all users, the next page is fetched in the background while the current one is
+              converted, so larger pages mostly reduce the number of round trips.
+            - Uses the service default when not set.
+        required: false
+        type: int
+    fields:
+        description:
+            - Only return these attributes of each user, using their snake_case names such as C(user_id),
+              C(user_name) or C(emails).
+            - Returns every attribute when not set.
+        required: false
+        type: list
+        elements: str
+    output_format:
+        description:
+            - With V(list), the users are returned as a list in C(users).
+            - With V(compact), the users are returned as a dictionary keyed by user name in C(user_map).
+              When O(fields) holds a single attribute, each value is that attribute instead of a dictionary,
+              which gives a plain name to ID map with O(fields=[user_id]).
+            - Defaults to V(compact) when O(user_names) is set and to V(list) otherwise.
+        required: false
+        type: str
+        choices: ['list', 'compact']
+    export_path:
+        description:
+            - Stream the users to this JSON Lines file on the executing host instead of returning them.
+            - Each page is written as soon as it is received and users are converted one at a time, so memory use
+              does not grow with the size of the directory.
+            - The file is written to a temporary file first and moved into place once complete.
+            - O(fields) applies to the exported records, O(output_format) is ignored.
+        required: false
+        type: path
+    export_compression:
+        description:
+            - Compression of the file written to O(export_path).
+        required: false
+        type: str
+        default: none
+        choices: ['none', 'gzip']
 extends_documentation_fragment:
-    - amazon.aws.common
+    - amazon.aws.common.modules
+    - begoingto.aws_identity_center.cache
 '''
 
 EXAMPLES = r'''
@@ -43,6 +110,44 @@ EXAMPLES = r'''
   ansible.builtin.debug:
     var: all_users_result.users
 
+# Build a user name to user ID map, moving only the IDs
+- name: Get the ID of every user
+  begoingto.aws_identity_center.list_users:
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    fields: [user_id]
+    output_format: compact
+  register: user_ids
+
+- name: Print the ID of jane.doe
+  ansible.builtin.debug:
+    msg: "{{ user_ids.user_map['jane.doe'] }}"
+
+# Snapshot a large directory without returning it to the controller
+- name: Export all users to a gzipped JSON Lines file
+  begoingto.aws_identity_center.list_users:
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    export_path: /var/backups/identity-center/users.jsonl.gz
+    export_compression: gzip
+  register: users_export
+
+# Resolve many usernames in a single task
+- name: Get the IDs of the project members
+  begoingto.aws_identity_center.list_users:
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    user_names: "{{ project_members }}"
+    fields: [user_id]
+    max_workers: 20
+  register: members
+
+# Answer "which groups is each user in" in one task
+- name: Get every user with its groups
+  begoingto.aws_identity_center.list_users:
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    fields: [user_name]
+    include_groups: true
+    output_format: compact
+  register: user_groups
+
 # Find a specific user by username
 - name: Get a specific user's details
   begoingto.aws_identity_center.list_users:
@@ -59,7 +164,7 @@ EXAMPLES = r'''
 RETURN = r'''
 users:
     description: A list of dictionaries, where each dictionary represents a user.
-    returned: always
+    returned: when O(output_format=list) and O(export_path) is not set
     type: list
     sample:
       - user_id: "a1b2c3d4-e5f6-7890-1234-567890abcdef"
@@ -73,77 +178,298 @@ users:
           formatted: "Jane Doe"
           given_name: "Jane"
           family_name: "Doe"
+        groups:
+          - group_id: "9067d2b5-5af1-4f9d-b1f0-0c5e1e1b7d1a"
+            display_name: "developers"
+user_map:
+    description:
+        - The users keyed by user name.
+        - Each value is a dictionary of the O(fields), or the value of the only field when O(fields) has one element.
+    returned: when O(output_format=compact) and O(export_path) is not set
+    type: dict
+    sample:
+        jane.doe: "a1b2c3d4-e5f6-7890-1234-567890abcdef"
+export:
+    description: Details of the file written when O(export_path) is set.
+    returned: when O(export_path) is set
+    type: dict
+    contains:
+        path:
+            description: Path of the exported file.
+            type: str
+        records:
+            description: Number of users written.
+            type: int
+        checksum:
+            description: SHA-256 checksum of the file, not set in check mode.
+            type: str
+        compression:
+            description: Compression of the file.
+            type: str
+    sample:
+        path: /var/backups/identity-center/users.jsonl.gz
+        records: 10243
+        checksum: "5f2b9c0e3d1a7f6b4c8e2d9a0b1c3e5f7a9b2d4c6e8f0a1b3c5d7e9f1a2b4c6d"
+        compression: gzip
+missing_user_names:
+    description: The usernames of O(user_names) that do not exist in the identity store.
+    returned: when O(user_names) is set
+    type: list
+    elements: str
+    sample: ["former.employee"]
+cache_stats:
+    description: Hits and misses of the persistent cache used to resolve the identity store ID.
+    returned: always
+    type: dict
+    sample: {"hits": 1, "misses": 0}
 '''
 
+import gzip
+import json
+import os
+import tempfile
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.amazon.aws.plugins.module_utils.core import AnsibleAWSModule
 from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
 from botocore.exceptions import ClientError
 
-def get_identity_store_id(sso_admin_client, instance_arn):
-    """Find the Identity Store ID associated with an SSO instance ARN."""
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import run_concurrently
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.dict_converter import snake_to_pascal
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import \
+    snapshot_groups, list_member_group_ids
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.pagination import prefetch_pages
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import get_identity_store_id
+
+
+def user_formatter(fields):
+    """Return a function converting one API user to snake_case, keeping only fields when given."""
+    if not fields:
+        return camel_dict_to_snake_dict
+
+    keys = [snake_to_pascal(field) for field in fields]
+
+    def format_user(user):
+        return camel_dict_to_snake_dict({key: user[key] for key in keys if key in user})
+
+    return format_user
+
+
+def collect_users(users, fields, output_format):
+    """Format the API users and return the (result key, value) pair for the output format."""
+    format_user = user_formatter(fields)
+    if output_format == 'compact':
+        single_field = fields[0] if fields and len(fields) == 1 else None
+        user_map = {}
+        for user in users:
+            formatted = format_user(user)
+            user_map[user['UserName']] = formatted.get(single_field) if single_field else formatted
+        return 'user_map', user_map
+
+    return 'users', [format_user(user) for user in users]
+
+
+def iter_users(client, identity_store_id, user_name=None, page_size=None):
+    """
+    Yield the API users page by page, or only the user named user_name.
+
+    The next page is prefetched by a background thread while the users of the
+    current page are consumed.
+    """
+    if user_name:
+        response = client.list_users(
+            IdentityStoreId=identity_store_id,
+            Filters=[
+                {
+                    'AttributePath': 'UserName',
+                    'AttributeValue': user_name
+                },
+            ]
+        )
+        yield from response.get('Users', [])
+        return
+
+    paginate_params = {'IdentityStoreId': identity_store_id}
+    if page_size:
+        paginate_params['PaginationConfig'] = {'PageSize': page_size}
+
+    paginator = client.get_paginator('list_users')
+    for page in prefetch_pages(paginator.paginate(**paginate_params)):
+        yield from page.get('Users', [])
+
+
+def _json_default(value):
+    # Timestamps such as CreatedAt are datetimes, exported like exit_json does
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def lookup_users(client, identity_store_id, user_names, max_workers=10):
+    """
+    Look up many users by name concurrently, one filtered list_users call each.
+
+    Returns (users, missing_user_names), both in the order of user_names.
+    """
+    user_names = list(dict.fromkeys(user_names))
+    outcomes = run_concurrently(
+        lambda user_name: client.list_users(
+            aws_retry=True,
+            IdentityStoreId=identity_store_id,
+            Filters=[{'AttributePath': 'UserName', 'AttributeValue': user_name}]
+        ).get('Users', []),
+        user_names,
+        max_workers=max_workers
+    )
+
+    users = []
+    missing_user_names = []
+    for user_name, found, error in outcomes:
+        if error is not None:
+            raise error
+        if found:
+            users.append(found[0])
+        else:
+            missing_user_names.append(user_name)
+    return users, missing_user_names
+
+
+def with_group_memberships(client, identity_store_id, users, max_workers=10, chunk_size=500):
+    """
+    Yield the users with a Groups list of {'GroupId', 'DisplayName'} entries.
+
+    Users are consumed in chunks whose memberships are fetched concurrently, so
+    streaming consumers keep bounded memory. Group names come from one list_groups pass.
+    """
+    groups = snapshot_groups(client, identity_store_id)
+
+    def attach(chunk):
+        outcomes = run_concurrently(
+            lambda user: list_member_group_ids(client, identity_store_id, user['UserId']),
+            chunk,
+            max_workers=max_workers
+        )
+        for user, group_ids, error in outcomes:
+            if error is not None:
+                raise error
+            yield dict(user, Groups=[
+                {'GroupId': group_id, 'DisplayName': groups.get(group_id, {}).get('DisplayName')}
+                for group_id in group_ids
+            ])
+
+    chunk = []
+    for user in users:
+        chunk.append(user)
+        if len(chunk) >= chunk_size:
+            yield from attach(chunk)
+            chunk = []
+    if chunk:
+        yield from attach(chunk)
+
+
+def export_users(users, path, fields, compression):
+    """
+    Write the users to a JSON Lines file one record at a time and return the record count.
+
+    The records go to a temporary file next to path which replaces path once complete.
+    """
+    format_user = user_formatter(fields)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    records = 0
     try:
-        paginator = sso_admin_client.get_paginator('list_instances')
-        for page in paginator.paginate():
-            for instance in page.get('Instances', []):
-                if instance.get('InstanceArn') == instance_arn:
-                    return instance.get('IdentityStoreId')
-    except ClientError as e:
-        # Handle cases where the instance might not be found or other API errors
-        return None
-    return None
+        with os.fdopen(fd, 'wb') as raw_file:
+            stream = gzip.GzipFile(fileobj=raw_file, mode='wb') if compression == 'gzip' else raw_file
+            with stream:
+                for user in users:
+                    stream.write(json.dumps(format_user(user), separators=(',', ':'), default=_json_default).encode('utf-8') + b'\n')
+                    records += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return records
+
 
 def run_module():
     module_args = dict(
         instance_arn=dict(type='str', required=True),
-        user_name=dict(type='str', required=False)
+        user_name=dict(type='str', required=False),
+        user_names=dict(type='list', elements='str', required=False),
+        include_groups=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=10),
+        page_size=dict(type='int', required=False),
+        fields=dict(type='list', elements='str', required=False),
+        output_format=dict(type='str', required=False, choices=['list', 'compact']),
+        export_path=dict(type='path', required=False),
+        export_compression=dict(type='str', default='none', choices=['none', 'gzip']),
+        **cache_argument_spec()
     )
 
     module = AnsibleAWSModule(
         argument_spec=module_args,
+        mutually_exclusive=[('user_name', 'user_names')],
         supports_check_mode=True # Info modules are safe for check mode
     )
 
+    page_size = module.params.get('page_size')
+    if page_size is not None and not 1 <= page_size <= 100:
+        module.fail_json(msg=f"page_size must be between 1 and 100, got {page_size}")
+
     sso_admin_client = module.client('sso-admin')
-    identity_store_client = module.client('identitystore')
+    identity_store_client = module.client('identitystore', retry_decorator=AWSRetry.jittered_backoff())
 
     instance_arn = module.params['instance_arn']
     user_name_filter = module.params.get('user_name')
+    user_names = module.params.get('user_names')
+    output_format = module.params.get('output_format') or ('compact' if user_names is not None else 'list')
+
+    cache = FileCache.from_module(module, 'identity_store_ids')
 
     result = dict(
-        changed=False,
-        users=[]
+        changed=False
     )
 
     try:
-        identity_store_id = get_identity_store_id(sso_admin_client, instance_arn)
+        identity_store_id = get_identity_store_id(sso_admin_client, instance_arn, module.region, cache)
+        result['cache_stats'] = cache.stats()
         if not identity_store_id:
             module.fail_json(msg=f"Could not find Identity Store ID for instance ARN: {instance_arn}")
 
-        users_list = []
-        
-        # If a specific username is provided, use a filter
-        if user_name_filter:
-            response = identity_store_client.list_users(
-                IdentityStoreId=identity_store_id,
-                Filters=[
-                    {
-                        'AttributePath': 'UserName',
-                        'AttributeValue': user_name_filter
-                    },
-                ]
+        if user_names is not None:
+            users, result['missing_user_names'] = lookup_users(
+                identity_store_client, identity_store_id, user_names, module.params['max_workers']
             )
-            users_list.extend(response.get('Users', []))
         else:
-            # Otherwise, paginate through all users
-            paginator = identity_store_client.get_paginator('list_users')
-            pages = paginator.paginate(IdentityStoreId=identity_store_id)
-            for page in pages:
-                users_list.extend(page.get('Users', []))
-
-        # Convert the AWS camelCase keys to Ansible snake_case
-        for user in users_list:
-            result['users'].append(camel_dict_to_snake_dict(user))
+            users = iter_users(identity_store_client, identity_store_id, user_name_filter, page_size)
+
+        fields = module.params.get('fields')
+        if module.params['include_groups']:
+            users = with_group_memberships(identity_store_client, identity_store_id, users,
+                                           module.params['max_workers'])
+            if fields and 'groups' not in fields:
+                fields = fields + ['groups']
+        export_path = module.params.get('export_path')
+
+        if export_path:
+            # Stream each page to the file as it arrives instead of returning the users
+            compression = module.params['export_compression']
+            export = dict(path=export_path, compression=compression)
+            if module.check_mode:
+                export['records'] = sum(1 for user in users)
+            else:
+                export['records'] = export_users(users, export_path, fields, compression)
+                export['checksum'] = module.sha256(export_path)
+            result['changed'] = True
+            result['export'] = export
+        else:
+            # Project and convert the AWS camelCase keys to Ansible snake_case
+            key, value = collect_users(users, fields, output_format)
+            result[key] = value
 
     except ClientError as e:
         module.fail_json(msg=f"AWS API Error: {e}")
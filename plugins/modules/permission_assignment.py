@@ -46,18 +46,53 @@ options:
         type: str
     target_id:
         description:
-            - The ID of the target. Currently, this is the AWS Account ID.
+            - The ID of the target, the AWS Account ID.
+            - With O(target_type=ORGANIZATIONAL_UNIT), the ID of an organizational unit or of the organization root.
         required: true
         type: str
     target_type:
         description:
             - The type of target.
+            - With V(ORGANIZATIONAL_UNIT), the assignment is made on every active account of the organizational unit,
+              which are listed with AWS Organizations. Suspended and closed accounts are skipped.
         required: false
         type: str
         default: 'AWS_ACCOUNT'
-        choices: ['AWS_ACCOUNT']
+        choices: ['AWS_ACCOUNT', 'ORGANIZATIONAL_UNIT']
+    recursive:
+        description:
+            - With O(target_type=ORGANIZATIONAL_UNIT), also include the accounts of the nested organizational units.
+        required: false
+        type: bool
+        default: true
+    max_workers:
+        description:
+            - With O(target_type=ORGANIZATIONAL_UNIT), maximum number of concurrent API calls.
+        required: false
+        type: int
+        default: 10
+    rate_limit:
+        description:
+            - With O(target_type=ORGANIZATIONAL_UNIT), maximum number of assignments created or deleted per second.
+            - Set to V(0) to disable the limit.
+        required: false
+        type: float
+        default: 10
+    wait:
+        description:
+            - Wait until the assignment request has completed, and fail when it failed.
+        required: false
+        type: bool
+        default: false
+    wait_timeout:
+        description:
+            - Number of seconds to wait for.
+        required: false
+        type: int
+        default: 300
 extends_documentation_fragment:
-    - amazon.aws.common
+    - amazon.aws.common.modules
+    - begoingto.aws_identity_center.cache
 '''
 
 EXAMPLES = r'''
@@ -71,6 +106,17 @@ EXAMPLES = r'''
     principal_id: "a1b2c3d4-e5f6-7890-1234-567890abcdef" # Group ID from Identity Center
     target_id: "123456789012" # AWS Account ID
 
+# Give a group a permission set on every account of an organizational unit
+- name: Assign Developers group to all sandbox accounts
+  my_org.aws_identity_center.aws_identity_center_assignment:
+    state: present
+    instance_arn: "arn:aws:sso:::instance/ssoins-xxxxxxxxxxxxxxxx"
+    permission_set_arn: "arn:aws:sso:::permissionSet/ssoins-xxxxxxxxxxxxxxxx/ps-yyyyyyyyyyyyyyyy"
+    principal_type: "GROUP"
+    principal_id: "a1b2c3d4-e5f6-7890-1234-567890abcdef"
+    target_type: "ORGANIZATIONAL_UNIT"
+    target_id: "ou-ab12-cdefgh34"
+
 # Remove an assignment
 - name: Remove an assignment
   my_org.aws_identity_center.aws_identity_center_assignment:
@@ -91,19 +137,108 @@ assignment_status:
     description: The status of the assignment request (e.g., IN_PROGRESS, SUCCEEDED, FAILED).
     returned: on create or delete
     type: str
+request_id:
+    description: The ID of the assignment request, to track it with begoingto.aws_identity_center.permission_assignment_status.
+    returned: on create or delete
+    type: str
+accounts:
+    description: Number of active accounts of the organizational unit.
+    returned: when target_type is ORGANIZATIONAL_UNIT
+    type: int
+skipped_accounts:
+    description: IDs of the suspended or closed accounts of the organizational unit.
+    returned: when target_type is ORGANIZATIONAL_UNIT
+    type: list
+    elements: str
+counts:
+    description: Number of accounts per outcome.
+    returned: when target_type is ORGANIZATIONAL_UNIT
+    type: dict
+    sample: {"created": 12, "deleted": 0, "unchanged": 388, "failed": 0}
+failed:
+    description: The assignments whose change failed, with the reason.
+    returned: when target_type is ORGANIZATIONAL_UNIT
+    type: list
+    elements: dict
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.amazon.aws.plugins.module_utils.core import AnsibleAWSModule
 
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.account_assignments import \
+    index_assignments, plan_assignments, apply_assignments, wait_for_assignments, assignment_failure
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import \
+    RateLimiter, count_actions, PAST_TENSE
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.organizations import \
+    list_ou_accounts, is_active
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.request_status import track_requests
+
 def check_assignment_exists(client, instance_arn, account_id, ps_arn, principal_type, principal_id):
     """Helper to check if a specific assignment already exists."""
-    paginator = client.get_paginator('list_account_assignments')
-    for page in paginator.paginate(InstanceArn=instance_arn, AccountId=account_id, PermissionSetArn=ps_arn):
-        for assignment in page.get('AccountAssignments', []):
-            if assignment['PrincipalType'] == principal_type and assignment['PrincipalId'] == principal_id:
-                return True
-    return False
+    index, direction = index_assignments(client, instance_arn, [(account_id, ps_arn, principal_type, principal_id)])
+    return (principal_type, principal_id) in index[(account_id, ps_arn)]
+
+def assign_organizational_unit(client, organizations, module):
+    """Make or remove the assignment on every active account of an organizational unit."""
+    params = module.params
+    instance_arn = params['instance_arn']
+    accounts = list_ou_accounts(
+        organizations,
+        params['target_id'],
+        recursive=params['recursive'],
+        max_workers=params['max_workers'],
+        cache=FileCache.from_module(module, 'organization_accounts')
+    )
+    active = [account['Id'] for account in accounts if is_active(account)]
+
+    desired = [
+        dict(target_id=account_id, permission_set_arn=params['permission_set_arn'],
+             principal_type=params['principal_type'], principal_id=params['principal_id'], state=params['state'])
+        for account_id in active
+    ]
+    index, direction = index_assignments(
+        client, instance_arn,
+        [(account_id, params['permission_set_arn'], params['principal_type'], params['principal_id'])
+         for account_id in active],
+        max_workers=params['max_workers']
+    )
+    plan = plan_assignments(desired, index)
+    result = dict(
+        accounts=len(active),
+        skipped_accounts=[account['Id'] for account in accounts if not is_active(account)]
+    )
+
+    if module.check_mode:
+        results = [PAST_TENSE[action] for action, key in plan]
+        applied = []
+    else:
+        applied = apply_assignments(
+            client, instance_arn, plan, params['max_workers'], RateLimiter(params['rate_limit'])
+        )
+        if params['wait']:
+            applied, result['latency'] = wait_for_assignments(
+                client, instance_arn, applied, params['wait_timeout'], params['max_workers']
+            )
+        results = ['unchanged'] * (len(plan) - len(applied))
+        results += [PAST_TENSE[action] if error is None else 'failed'
+                    for action, key, status, error in applied]
+
+    result['counts'] = count_actions(
+        ({'action': action} for action in results), ('created', 'deleted', 'unchanged', 'failed')
+    )
+    result['changed'] = bool(result['counts']['created'] or result['counts']['deleted'])
+    result['failed'] = [assignment_failure(action, key, f"Failed to {action} assignment: {error}")
+                        for action, key, status, error in applied if error is not None]
+
+    if result['failed']:
+        module.fail_json(msg=f"{len(result['failed'])} of {len(active)} accounts failed", **result)
+    else:
+        module.exit_json(**result)
+
 
 def run_module():
     module_args = dict(
@@ -113,7 +248,13 @@ def run_module():
         principal_type=dict(type='str', required=True, choices=['USER', 'GROUP']),
         principal_id=dict(type='str', required=True),
         target_id=dict(type='str', required=True),
-        target_type=dict(type='str', default='AWS_ACCOUNT', choices=['AWS_ACCOUNT'])
+        target_type=dict(type='str', default='AWS_ACCOUNT', choices=['AWS_ACCOUNT', 'ORGANIZATIONAL_UNIT']),
+        wait=dict(type='bool', default=False),
+        wait_timeout=dict(type='int', default=300),
+        recursive=dict(type='bool', default=True),
+        max_workers=dict(type='int', default=10),
+        rate_limit=dict(type='float', default=10),
+        **cache_argument_spec()
     )
 
     module = AnsibleAWSModule(
@@ -121,8 +262,16 @@ def run_module():
         supports_check_mode=True
     )
 
-    client = module.client('sso-admin')
-    
+    client = module.client('sso-admin', retry_decorator=AWSRetry.jittered_backoff())
+
+    if module.params['target_type'] == 'ORGANIZATIONAL_UNIT':
+        try:
+            organizations = module.client('organizations', retry_decorator=AWSRetry.jittered_backoff())
+            assign_organizational_unit(client, organizations, module)
+        except Exception as e:
+            module.fail_json(msg=str(e))
+        return
+
     state = module.params['state']
     instance_arn = module.params['instance_arn']
     ps_arn = module.params['permission_set_arn']
@@ -154,7 +303,9 @@ def run_module():
                     PrincipalId=principal_id
                 )
                 result['changed'] = True
-                result['assignment_status'] = response.get('AccountAssignmentCreationStatus', {}).get('Status')
+                status = response.get('AccountAssignmentCreationStatus', {})
+                result['assignment_status'] = status.get('Status')
+                result['request_id'] = status.get('RequestId')
 
         elif state == 'absent':
             if assignment_exists:
@@ -171,7 +322,19 @@ def run_module():
                     PrincipalId=principal_id
                 )
                 result['changed'] = True
-                result['assignment_status'] = response.get('AccountAssignmentDeletionStatus', {}).get('Status')
+                status = response.get('AccountAssignmentDeletionStatus', {})
+                result['assignment_status'] = status.get('Status')
+                result['request_id'] = status.get('RequestId')
+
+        if module.params['wait'] and result['assignment_status'] == 'IN_PROGRESS':
+            kind = 'create' if state == 'present' else 'delete'
+            request = track_requests(client, instance_arn, [(kind, result['request_id'])],
+                                     timeout=module.params['wait_timeout'])[result['request_id']]
+            result['assignment_status'] = request['status']
+            if request['status'] == 'FAILED':
+                module.fail_json(msg=f"Assignment request failed: {request['failure_reason']}", **result)
+            elif request['status'] == 'IN_PROGRESS':
+                module.fail_json(msg="Timeout waiting for the assignment request to complete", **result)
 
     except Exception as e:
         module.fail_json(msg=str(e))
@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: permission_assignment_status
+version_added_collection: begoingto.aws_identity_center
+short_description: Track the status of many asynchronous account assignment requests
+description:
+  - Report, and optionally wait for, the final status of account assignment creation and deletion requests,
+    such as the request IDs returned by M(begoingto.aws_identity_center.permission_assignment).
+  - All pending requests are polled concurrently in rounds separated by a single sleep that grows while no request
+    completes. When many requests are pending, the requests still in progress are listed instead of being described
+    one by one.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  instance_arn:
+    description:
+      - The ARN of the AWS Identity Center instance.
+    required: true
+    type: str
+  creation_request_ids:
+    description:
+      - IDs of account assignment creation requests.
+    type: list
+    elements: str
+    default: []
+  deletion_request_ids:
+    description:
+      - IDs of account assignment deletion requests.
+    type: list
+    elements: str
+    default: []
+  wait:
+    description:
+      - Wait until every request has completed or O(wait_timeout) expires.
+      - When V(false), the current status of every request is returned.
+    type: bool
+    default: true
+  wait_timeout:
+    description:
+      - Number of seconds to wait for.
+    type: int
+    default: 300
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls.
+    type: int
+    default: 10
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Wait for the assignments created by an earlier loop
+  begoingto.aws_identity_center.permission_assignment_status:
+    instance_arn: arn:aws:sso:::instance/ssoins-1234567890abcdef
+    creation_request_ids: "{{ created.results | map(attribute='request_id') | select | list }}"
+    wait_timeout: 600
+"""
+
+RETURN = r"""
+requests:
+  description: The final or current status of every request, keyed by request ID.
+  returned: always
+  type: dict
+  sample:
+    b2f6c5e1-1234-5678-9012-123456789012:
+      kind: create
+      status: SUCCEEDED
+      failure_reason: null
+      latency: 12.4
+counts:
+  description: Number of requests per status.
+  returned: always
+  type: dict
+  sample: {"SUCCEEDED": 1998, "FAILED": 2, "IN_PROGRESS": 0}
+latency:
+  description:
+    - Percentiles, in seconds, of the time between the creation of the completed requests and the poll that saw
+      them complete.
+  returned: when a request completed
+  type: dict
+  sample: {"p50": 8.2, "p90": 14.0, "p99": 21.7, "max": 23.1}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.request_status import \
+    track_requests, latency_percentiles, count_statuses
+
+
+def report_status(client, module):
+    requests = [('create', request_id) for request_id in module.params['creation_request_ids']]
+    requests += [('delete', request_id) for request_id in module.params['deletion_request_ids']]
+
+    results = track_requests(
+        client,
+        module.params['instance_arn'],
+        requests,
+        timeout=module.params['wait_timeout'] if module.params['wait'] else 0,
+        max_workers=module.params['max_workers']
+    )
+    result = dict(changed=False, requests=results, counts=count_statuses(results),
+                  latency=latency_percentiles(results))
+
+    if result['counts']['FAILED']:
+        module.fail_json(msg=f"{result['counts']['FAILED']} of {len(results)} requests failed", **result)
+    elif module.params['wait'] and result['counts']['IN_PROGRESS']:
+        module.fail_json(msg=f"{result['counts']['IN_PROGRESS']} requests still in progress after "
+                             f"{module.params['wait_timeout']} seconds", **result)
+    else:
+        module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict(
+        instance_arn=dict(type='str', required=True),
+        creation_request_ids=dict(type='list', elements='str', default=[]),
+        deletion_request_ids=dict(type='list', elements='str', default=[]),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=300),
+        max_workers=dict(type='int', default=10),
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        connection = module.client('sso-admin')
+        report_status(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to describe account assignment requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: permission_assignments
+version_added_collection: begoingto.aws_identity_center
+short_description: Reconcile many AWS Identity Center account assignments in one task
+description:
+  - Create or delete a list of account assignments in a single task.
+  - The current assignments are listed once, concurrently, and indexed, so only the missing or unwanted assignments
+    are changed. They are listed per (account, permission set) pair or, when the assignments span many more pairs
+    than principals, per principal, whichever takes fewer API calls. O(purge=true) always lists per pair.
+  - The changes are applied concurrently; calls that are throttled are retried with jittered exponential backoff.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  instance_arn:
+    description:
+      - The ARN of the AWS Identity Center instance.
+    required: true
+    type: str
+  assignments:
+    description:
+      - The desired account assignments.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      target_id:
+        description:
+          - The ID of the AWS account.
+        required: true
+        type: str
+      permission_set_arn:
+        description:
+          - The ARN of the permission set.
+        required: true
+        type: str
+      principal_type:
+        description:
+          - The type of the principal.
+        required: true
+        type: str
+        choices: ['USER', 'GROUP']
+      principal_id:
+        description:
+          - The ID of the user or group.
+        required: true
+        type: str
+      state:
+        description:
+          - Whether the assignment should exist.
+        type: str
+        default: present
+        choices: [ 'present', 'absent' ]
+  purge:
+    description:
+      - Delete the assignments of every listed (account, permission set) pair that are not in O(assignments).
+      - Pairs that do not appear in O(assignments) are left untouched.
+    type: bool
+    default: false
+  wait:
+    description:
+      - Wait until the created and deleted assignments are provisioned, and report the assignments whose
+        provisioning failed in RV(failed).
+      - Without waiting, only the requests that failed straight away are reported.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - Number of seconds to wait for with O(wait=true).
+    type: int
+    default: 300
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls.
+    type: int
+    default: 10
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Give the developers group read only access to the sandbox accounts
+  begoingto.aws_identity_center.permission_assignments:
+    instance_arn: arn:aws:sso:::instance/ssoins-1234567890abcdef
+    assignments:
+      - target_id: "111111111111"
+        permission_set_arn: "{{ read_only_arn }}"
+        principal_type: GROUP
+        principal_id: "{{ developers_group_id }}"
+      - target_id: "222222222222"
+        permission_set_arn: "{{ read_only_arn }}"
+        principal_type: GROUP
+        principal_id: "{{ developers_group_id }}"
+
+- name: Make the listed principals the only ones with admin access to production
+  begoingto.aws_identity_center.permission_assignments:
+    instance_arn: arn:aws:sso:::instance/ssoins-1234567890abcdef
+    purge: true
+    assignments:
+      - target_id: "123456789012"
+        permission_set_arn: arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-1234567890abcdef
+        principal_type: GROUP
+        principal_id: 9067d2b5-5af1-4f9d-b1f0-0c5e1e1b7d1a
+"""
+
+RETURN = r"""
+counts:
+  description: Number of assignments per outcome.
+  returned: always
+  type: dict
+  sample: {"created": 120, "deleted": 3, "unchanged": 19877, "failed": 0}
+failed:
+  description: The assignments whose change failed, with the reason.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - target_id: "123456789012"
+      permission_set_arn: arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-1234567890abcdef
+      principal_type: GROUP
+      principal_id: 9067d2b5-5af1-4f9d-b1f0-0c5e1e1b7d1a
+      action: create
+      msg: "An error occurred (ConflictException)"
+latency:
+  description:
+    - Percentiles, in seconds, of the time the waited for requests took to complete.
+  returned: when O(wait=true) and changes were made
+  type: dict
+  sample: {"p50": 8.2, "p90": 14.0, "p99": 21.7, "max": 23.1}
+api_calls:
+  description: Number of SSO admin API calls made by the task.
+  returned: always
+  type: dict
+  sample: {"total": 143, "operations": {"CreateAccountAssignment": 120, "ListAccountAssignments": 20}}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.account_assignments import \
+    assignment_options, assignment_key, index_assignments, plan_assignments, apply_assignments, \
+    wait_for_assignments, assignment_failure
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import \
+    find_duplicates, ApiCallCounter, count_actions, PAST_TENSE
+
+ACTIONS = ('created', 'deleted', 'unchanged', 'failed')
+
+
+def reconcile_assignments(client, module):
+    instance_arn = module.params['instance_arn']
+    desired_assignments = module.params['assignments']
+
+    duplicates = find_duplicates(assignment_key(assignment) for assignment in desired_assignments)
+    if duplicates:
+        module.fail_json(msg=f"Duplicate assignments: {', '.join('/'.join(key) for key in duplicates)}")
+
+    counter = ApiCallCounter(client)
+    index, direction = index_assignments(
+        client,
+        instance_arn,
+        [assignment_key(assignment) for assignment in desired_assignments],
+        purge=module.params['purge'],
+        max_workers=module.params['max_workers']
+    )
+    plan = plan_assignments(desired_assignments, index, module.params['purge'])
+    unchanged = ['unchanged'] * sum(1 for action, key in plan if action == 'unchanged')
+    result = dict()
+
+    if module.check_mode:
+        results = [PAST_TENSE[action] for action, key in plan]
+        failed = []
+        pending = 0
+    else:
+        applied = apply_assignments(client, instance_arn, plan, module.params['max_workers'])
+        if module.params['wait']:
+            applied, result['latency'] = wait_for_assignments(
+                client, instance_arn, applied, module.params['wait_timeout'], module.params['max_workers']
+            )
+        results = unchanged + [PAST_TENSE[action] if error is None else 'failed'
+                               for action, key, status, error in applied]
+        failed = [assignment_failure(action, key, f"Failed to {action} assignment: {error}")
+                  for action, key, status, error in applied if error is not None]
+        pending = sum(1 for action, key, status, error in applied
+                      if error is None and status.get('Status') == 'IN_PROGRESS')
+
+    counts = count_actions(({'action': action} for action in results), ACTIONS)
+    result.update(
+        changed=bool(counts['created'] or counts['deleted']),
+        counts=counts,
+        failed=failed,
+        api_calls=counter.as_dict()
+    )
+
+    if failed:
+        module.fail_json(msg=f"{len(failed)} of {len(plan)} assignments failed", **result)
+    elif module.params['wait'] and pending:
+        module.fail_json(msg=f"{pending} assignment requests still in progress after "
+                             f"{module.params['wait_timeout']} seconds", **result)
+    else:
+        module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict(
+        instance_arn=dict(type='str', required=True),
+        assignments=dict(type='list', required=True, elements='dict', options=assignment_options()),
+        purge=dict(type='bool', default=False),
+        wait=dict(type='bool', default=False),
+        wait_timeout=dict(type='int', default=300),
+        max_workers=dict(type='int', default=10),
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        connection = module.client('sso-admin', retry_decorator=AWSRetry.jittered_backoff())
+        reconcile_assignments(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to reconcile account assignments")
+
+
+if __name__ == '__main__':
+    main()
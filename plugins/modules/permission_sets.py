@@ -0,0 +1,465 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: permission_sets
+version_added_collection: begoingto.aws_identity_center
+short_description: Manage the whole catalog of AWS Identity Center permission sets in one task
+description:
+  - Create, update or delete many permission sets in a single task.
+  - The permission sets of the instance are described once, concurrently, and the rest of the configuration of the
+    existing sets to manage is fetched concurrently. The name to ARN index shared with
+    M(begoingto.aws_identity_center.idc_permission_set) and the C(idc_id) lookup is refreshed on the way.
+  - Only the calls needed to fix the differences of each permission set are made, as with
+    M(begoingto.aws_identity_center.idc_permission_set). Permission sets are changed concurrently, the changes of one
+    permission set one after the other.
+  - Permission sets that need it are then provisioned again, all at once.
+  - In check mode the planned changes are returned in the compact RV(plan).
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  instance_arn:
+    description:
+      - The ARN of the AWS Identity Center instance.
+    required: true
+    type: str
+  permission_sets:
+    description:
+      - The desired permission sets.
+      - Options that are not set are not managed, so an existing permission set keeps its current value.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - The name of the permission set.
+        required: true
+        type: str
+      state:
+        description:
+          - Whether the permission set should exist.
+        type: str
+        default: present
+        choices: ['present', 'absent']
+      description:
+        description:
+          - A description for the permission set.
+        type: str
+      session_duration:
+        description:
+          - The length of time that a user can be signed in to an AWS account, as an ISO 8601 duration.
+          - Defaults to V(PT1H) when the permission set is created. Not managed on an existing permission set when
+            not set.
+        type: str
+      relay_state:
+        description:
+          - The URL that users are redirected to after signing in.
+        type: str
+      managed_policies:
+        description:
+          - The ARNs of the AWS managed policies to attach. The policies that are not in the list are detached.
+        type: list
+        elements: str
+      customer_managed_policies:
+        description:
+          - The customer managed policies to attach, by name and path. The references that are not in the list are
+            detached.
+        type: list
+        elements: dict
+        suboptions:
+          name:
+            description:
+              - The name of the IAM policy.
+            required: true
+            type: str
+          path:
+            description:
+              - The path of the IAM policy.
+            type: str
+            default: /
+      permissions_boundary:
+        description:
+          - The permissions boundary, either an AWS managed policy or a customer managed policy.
+          - Use V({}) to remove the permissions boundary.
+        type: dict
+        suboptions:
+          managed_policy_arn:
+            description:
+              - The ARN of an AWS managed policy.
+            type: str
+          customer_managed_policy_reference:
+            description:
+              - A customer managed policy, by name and path.
+            type: dict
+            suboptions:
+              name:
+                description:
+                  - The name of the IAM policy.
+                required: true
+                type: str
+              path:
+                description:
+                  - The path of the IAM policy.
+                type: str
+                default: /
+      inline_policy:
+        description:
+          - A JSON-formatted IAM policy to embed, as a string or a dictionary.
+          - Use an empty string to remove the inline policy.
+        type: json
+      tags:
+        description:
+          - A dictionary of key-value pairs to tag the permission set.
+        type: dict
+      purge_tags:
+        description:
+          - Remove the tags that are not in O(permission_sets[].tags). Has no effect when it is not set.
+        type: bool
+        default: true
+  purge:
+    description:
+      - Delete the permission sets of the instance that are not in O(permission_sets).
+    type: bool
+    default: false
+  provision:
+    description:
+      - Which accounts the updated permission sets are provisioned to again, so that their changes reach them.
+      - V(outdated) provisions only the accounts running an outdated copy, V(all) every account a permission set is
+        provisioned to and V(none) does not provision.
+    type: str
+    choices: ['none', 'outdated', 'all']
+    default: outdated
+  wait:
+    description:
+      - Wait until the provisioning requests complete, and fail when one of them fails.
+    type: bool
+    default: true
+  wait_timeout:
+    description:
+      - Number of seconds to wait for the provisioning requests.
+    type: int
+    default: 600
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls.
+    type: int
+    default: 10
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+  - begoingto.aws_identity_center.cache
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Declare every permission set of the organization
+  begoingto.aws_identity_center.permission_sets:
+    instance_arn: arn:aws:sso:::instance/ssoins-1234567890abcdef
+    purge: true
+    permission_sets:
+      - name: ReadOnly
+        session_duration: PT8H
+        managed_policies:
+          - arn:aws:iam::aws:policy/ReadOnlyAccess
+      - name: S3Admin
+        customer_managed_policies:
+          - name: s3-admin
+        inline_policy: "{{ lookup('file', 'deny-delete.json') }}"
+        tags:
+          team: storage
+
+- name: Review the changes of the catalog
+  begoingto.aws_identity_center.permission_sets:
+    instance_arn: arn:aws:sso:::instance/ssoins-1234567890abcdef
+    permission_sets: "{{ catalog }}"
+    purge: true
+  check_mode: true
+  register: catalog_plan
+"""
+
+RETURN = r"""
+plan:
+  description: The planned changes, by permission set name.
+  returned: always
+  type: dict
+  contains:
+    create:
+      description: Names of the permission sets to create.
+      type: list
+      elements: str
+    update:
+      description: The calls needed to update each permission set that differs.
+      type: dict
+    delete:
+      description: Names of the permission sets to delete.
+      type: list
+      elements: str
+  sample:
+    create: ["S3Admin"]
+    update: {"ReadOnly": ["update_permission_set", "detach_managed_policy_from_permission_set"]}
+    delete: ["Legacy"]
+permission_sets:
+  description: The outcome of every planned permission set.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - name: ReadOnly
+      permission_set_arn: arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-1234567890abcdef
+      action: updated
+      changes: ["update_permission_set"]
+counts:
+  description: Number of permission sets per outcome.
+  returned: always
+  type: dict
+  sample: {"created": 1, "updated": 2, "deleted": 0, "unchanged": 177, "failed": 0}
+provisioning:
+  description: The accounts the updated permission sets were provisioned to.
+  returned: when permission sets were updated in a way that needs provisioning and provision is not 'none'
+  type: dict
+  sample: {"accounts": 42, "counts": {"SUCCEEDED": 42, "FAILED": 0, "IN_PROGRESS": 0}, "failed": []}
+api_calls:
+  description: Number of SSO admin API calls made by the task.
+  returned: always
+  type: dict
+  sample: {"total": 230, "operations": {"DescribePermissionSet": 180, "ListPermissionSets": 2}}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import \
+    apply_plan, find_duplicates, run_concurrently, ApiCallCounter, count_actions, PAST_TENSE
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.permission_sets import \
+    permission_set_options, fetch_permission_set, create_or_adopt_permission_set, plan_permission_set_changes, \
+    apply_permission_set_changes, provisioning_required, provision_permission_sets
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import \
+    describe_permission_sets, store_permission_set_index, remember_permission_set_arn
+
+ACTIONS = ('created', 'updated', 'deleted', 'unchanged', 'failed')
+
+
+def snapshot_permission_sets(client, instance_arn, described, max_workers=10):
+    """
+    Fetch the configuration of many described permission sets concurrently, the parts of each
+    one in turn so that at most max_workers calls are in flight. Returns a dict of ARN ->
+    configuration.
+    """
+    snapshot = {}
+    outcomes = run_concurrently(
+        lambda arn: fetch_permission_set(client, instance_arn, arn, max_workers=1, details=described[arn]),
+        list(described),
+        max_workers=max_workers
+    )
+    for arn, current, error in outcomes:
+        if error is not None:
+            raise error
+        snapshot[arn] = current
+    return snapshot
+
+
+def plan_permission_sets(desired_sets, arns, snapshot, purge):
+    """
+    Compute the planned change for every desired permission set, and for unmanaged ones when purging.
+    """
+    plan = []
+    for desired in desired_sets:
+        name = desired['name']
+        arn = arns.get(name)
+        if desired['state'] == 'absent':
+            plan.append({'action': 'delete' if arn else 'unchanged', 'name': name, 'arn': arn, 'changes': []})
+        elif arn is None:
+            plan.append({'action': 'create', 'name': name, 'arn': None, 'desired': desired, 'changes': []})
+        else:
+            changes = plan_permission_set_changes(snapshot[arn], desired)
+            plan.append({'action': 'update' if changes else 'unchanged', 'name': name, 'arn': arn, 'changes': changes})
+
+    if purge:
+        managed = {desired['name'] for desired in desired_sets}
+        plan.extend(
+            {'action': 'delete', 'name': name, 'arn': arn, 'changes': []}
+            for name, arn in sorted(arns.items()) if name not in managed
+        )
+    return plan
+
+
+def compact_plan(plan):
+    return dict(
+        create=[change['name'] for change in plan if change['action'] == 'create'],
+        update={change['name']: [operation for operation, params in change['changes']]
+                for change in plan if change['action'] == 'update'},
+        delete=[change['name'] for change in plan if change['action'] == 'delete'],
+    )
+
+
+def change_result(change, action):
+    return {
+        'name': change['name'],
+        'permission_set_arn': change['arn'],
+        'action': action,
+        'changes': [operation for operation, params in change['changes']],
+    }
+
+
+def apply_change(client, module, cache, change):
+    """
+    Apply one planned change and return its per permission set result.
+    """
+    instance_arn = module.params['instance_arn']
+    action = change['action']
+
+    if action == 'create':
+        current, created = create_or_adopt_permission_set(
+            client, instance_arn, change['desired'], module.region, cache, module.params['max_workers']
+        )
+        changes = plan_permission_set_changes(current, change['desired'])
+        apply_permission_set_changes(client, instance_arn, changes)
+        if not created:
+            # Created by someone else since the instance was described, so it is updated instead
+            action = 'updated' if changes else 'unchanged'
+            return change_result(dict(change, arn=current['arn'], changes=changes), action)
+        return change_result(dict(change, arn=current['arn'], changes=changes), 'created')
+
+    if action == 'update':
+        apply_permission_set_changes(client, instance_arn, change['changes'])
+        return change_result(change, 'updated')
+
+    if action == 'delete':
+        client.delete_permission_set(aws_retry=True, InstanceArn=instance_arn, PermissionSetArn=change['arn'])
+        remember_permission_set_arn(instance_arn, change['name'], None, module.region, cache)
+        return change_result(change, 'deleted')
+
+    return change_result(change, 'unchanged')
+
+
+def provision_updated(client, module, plan, results):
+    """Provision again, all at once, the permission sets updated in a way that needs it."""
+    params = module.params
+    arns = [
+        change['arn'] for change, result in zip(plan, results)
+        if change['action'] == 'update' and result['action'] != 'failed' and provisioning_required(change['changes'])
+    ]
+    if not arns or params['provision'] == 'none':
+        return None
+
+    provisioned = provision_permission_sets(
+        client,
+        params['instance_arn'],
+        arns,
+        # In check mode the planned changes have not made any account outdated yet
+        only_outdated=params['provision'] == 'outdated' and not module.check_mode,
+        wait=params['wait'],
+        timeout=params['wait_timeout'],
+        max_workers=params['max_workers'],
+        check_mode=module.check_mode
+    )
+    provisioning = dict(accounts=len(provisioned['targets']), counts=provisioned['counts'],
+                        failed=provisioned['failed'])
+    if provisioned.get('latency'):
+        provisioning['latency'] = provisioned['latency']
+    return provisioning
+
+
+def reconcile_permission_sets(client, module):
+    instance_arn = module.params['instance_arn']
+    desired_sets = module.params['permission_sets']
+
+    duplicates = find_duplicates(desired['name'] for desired in desired_sets)
+    if duplicates:
+        module.fail_json(msg=f"Duplicate permission set names in permission_sets: {', '.join(duplicates)}")
+
+    counter = ApiCallCounter(client)
+    cache = FileCache.from_module(module, 'permission_set_arns')
+    described = {
+        permission_set['Name']: permission_set
+        for permission_set in describe_permission_sets(client, instance_arn, module.params['max_workers'])
+    }
+    arns = {name: permission_set['PermissionSetArn'] for name, permission_set in described.items()}
+    store_permission_set_index(instance_arn, arns, module.region, cache)
+
+    managed = [desired['name'] for desired in desired_sets if desired['state'] == 'present']
+    snapshot = snapshot_permission_sets(
+        client,
+        instance_arn,
+        {arns[name]: described[name] for name in managed if name in described},
+        max_workers=module.params['max_workers']
+    )
+    plan = plan_permission_sets(desired_sets, arns, snapshot, module.params['purge'])
+
+    if module.check_mode:
+        results = [change_result(change, PAST_TENSE[change['action']]) for change in plan]
+    else:
+        results = apply_plan(
+            plan,
+            lambda change: apply_change(client, module, cache, change),
+            lambda change, error: dict(change_result(change, 'failed'),
+                                       msg=f"Failed to {change['action']} permission set: {error}"),
+            max_workers=module.params['max_workers']
+        )
+
+    counts = count_actions(results, ACTIONS)
+    changed = any(counts[action] for action in ('created', 'updated', 'deleted'))
+    result = dict(changed=changed, plan=compact_plan(plan), permission_sets=results, counts=counts)
+    provisioning = provision_updated(client, module, plan, results)
+    if provisioning is not None:
+        result['provisioning'] = provisioning
+    result['api_calls'] = counter.as_dict()
+
+    if counts['failed']:
+        module.fail_json(msg=f"{counts['failed']} of {len(results)} permission sets failed", **result)
+    elif provisioning and provisioning['failed']:
+        module.fail_json(msg=f"Provisioning failed in {len(provisioning['failed'])} accounts", **result)
+    elif provisioning and module.params['wait'] and provisioning['counts']['IN_PROGRESS']:
+        module.fail_json(msg=f"{provisioning['counts']['IN_PROGRESS']} provisioning requests still in progress after "
+                             f"{module.params['wait_timeout']} seconds", **result)
+    else:
+        module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict(
+        instance_arn=dict(type='str', required=True),
+        permission_sets=dict(
+            type='list',
+            required=True,
+            elements='dict',
+            options=dict(
+                name=dict(type='str', required=True),
+                state=dict(type='str', default='present', choices=['present', 'absent']),
+                **permission_set_options()
+            )
+        ),
+        purge=dict(type='bool', default=False),
+        provision=dict(type='str', default='outdated', choices=['none', 'outdated', 'all']),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=600),
+        max_workers=dict(type='int', default=10),
+        **cache_argument_spec()
+    )
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        # Changes of one permission set conflict while an earlier one is being applied
+        connection = module.client(
+            'sso-admin', retry_decorator=AWSRetry.jittered_backoff(catch_extra_error_codes=['ConflictException'])
+        )
+        reconcile_permission_sets(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to reconcile permission sets")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+---
+module: users
+version_added_collection: begoingto.aws_identity_center
+short_description: Reconcile many AWS Identity Center users in one task
+description:
+  - Manage a list of AWS Identity Center users in a single task.
+  - The identity store is read once with a paginated C(list_users) call and indexed by user name.
+    The create, update and delete sets are computed from that snapshot and applied concurrently.
+  - Existing users are only updated when an attribute differs, and only the changed attributes are sent.
+  - Each element of O(users) accepts the same user attributes as the M(begoingto.aws_identity_center.user) module.
+author:
+  - Courtney Campbell (@cocampbe)
+options:
+  identity_store_id:
+    description:
+      - AWS identity store ID.
+    required: true
+    type: str
+  users:
+    description:
+      - The desired users.
+      - C(name), C(display_name) and C(emails) are required for users with O(users[].state=present).
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      user_name:
+        description:
+          - The unique user name.
+        required: true
+        type: str
+      state:
+        description:
+          - Whether the user should exist.
+        type: str
+        default: present
+        choices: [ 'present', 'absent' ]
+  purge:
+    description:
+      - Delete users of the identity store that are not listed in O(users).
+    type: bool
+    default: false
+  max_workers:
+    description:
+      - Maximum number of concurrent API calls used to apply the changes.
+    type: int
+    default: 10
+notes:
+  - Deleting users also removes their names from the cache file of the C(idc_id) lookup.
+extends_documentation_fragment:
+  - amazon.aws.common.modules
+  - amazon.aws.region.modules
+  - amazon.aws.boto3
+  - begoingto.aws_identity_center.cache
+"""
+
+EXAMPLES = r"""
+# Note: These examples do not set authentication details, see the AWS Guide for details.
+
+- name: Onboard users
+  begoingto.aws_identity_center.users:
+    identity_store_id: d-1234567890
+    users:
+      - user_name: jane.doe
+        display_name: Jane Doe
+        name:
+          formatted: Jane Doe
+          given_name: Jane
+          family_name: Doe
+        emails:
+          - value: jane.doe@example.com
+            type: work
+            primary: true
+      - user_name: john.leaver
+        state: absent
+"""
+
+RETURN = r"""
+users:
+  description: The outcome for every user that was created, updated, deleted, left unchanged or failed.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - user_name: jane.doe
+      user_id: 906723b5-1234-5678-9012-123456789012
+      action: created
+    - user_name: john.doe
+      user_id: 906723b5-1234-5678-9012-123456789013
+      action: updated
+      changed_attributes: ["displayName"]
+counts:
+  description: Number of users per outcome.
+  returned: always
+  type: dict
+  sample: {"created": 1, "updated": 0, "deleted": 1, "unchanged": 120, "failed": 0}
+api_calls:
+  description: Number of identity store API calls made by the task.
+  returned: always
+  type: dict
+  sample: {"total": 4, "operations": {"CreateUser": 1, "DeleteUser": 1, "ListUsers": 2}}
+"""
+
+from ansible_collections.amazon.aws.plugins.module_utils.modules import AnsibleAWSModule
+from ansible_collections.amazon.aws.plugins.module_utils.retries import AWSRetry
+from botocore.exceptions import ClientError
+
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.bulk import \
+    apply_plan, find_duplicates, ApiCallCounter, count_actions, PAST_TENSE
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.identity_store import \
+    user_options, build_user_attributes, build_create_user_params, \
+    build_update_user_operations, user_extensions, snapshot_users
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.cache import \
+    FileCache, cache_argument_spec
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import principal_cache_key
+
+ACTIONS = ('created', 'updated', 'deleted', 'unchanged', 'failed')
+
+
+def plan_users(desired_users, existing_users, purge):
+    """
+    Compute the planned change for every desired user, and for unmanaged users when purging.
+    """
+    plan = []
+    for desired in desired_users:
+        user_name = desired['user_name']
+        current = existing_users.get(user_name)
+        if desired['state'] == 'absent':
+            action = 'delete' if current else 'unchanged'
+            plan.append({'action': action, 'user_name': user_name, 'current': current})
+            continue
+
+        attributes, leaves = build_user_attributes(desired)
+        if current is None:
+            plan.append({'action': 'create', 'user_name': user_name, 'attributes': attributes, 'current': None})
+            continue
+
+        operations = build_update_user_operations(leaves, current)
+        plan.append({
+            'action': 'update' if operations else 'unchanged',
+            'user_name': user_name,
+            'current': current,
+            'operations': operations,
+        })
+
+    if purge:
+        managed = {desired['user_name'] for desired in desired_users}
+        for user_name, current in existing_users.items():
+            if user_name not in managed:
+                plan.append({'action': 'delete', 'user_name': user_name, 'current': current})
+
+    return plan
+
+
+def change_result(change, action):
+    result = {
+        'user_name': change['user_name'],
+        'user_id': change['current']['UserId'] if change['current'] else None,
+        'action': action,
+    }
+    if change.get('operations'):
+        result['changed_attributes'] = [operation['AttributePath'] for operation in change['operations']]
+    return result
+
+
+def apply_change(client, identity_store_id, change):
+    """
+    Apply one planned change and return its per user result.
+    """
+    action = change['action']
+
+    if action == 'create':
+        response = client.create_user(
+            aws_retry=True, **build_create_user_params(identity_store_id, change['attributes'])
+        )
+        return dict(change_result(change, 'created'), user_id=response['UserId'])
+
+    if action == 'update':
+        client.update_user(
+            aws_retry=True,
+            IdentityStoreId=identity_store_id,
+            UserId=change['current']['UserId'],
+            Operations=change['operations']
+        )
+        return change_result(change, 'updated')
+
+    if action == 'delete':
+        client.delete_user(aws_retry=True, IdentityStoreId=identity_store_id, UserId=change['current']['UserId'])
+        return change_result(change, 'deleted')
+
+    return change_result(change, 'unchanged')
+
+
+def reconcile_users(client, module):
+    identity_store_id = module.params['identity_store_id']
+    desired_users = module.params['users']
+
+    duplicates = find_duplicates(desired['user_name'] for desired in desired_users)
+    if duplicates:
+        module.fail_json(msg=f"Duplicate user names in users: {', '.join(duplicates)}")
+
+    counter = ApiCallCounter(client)
+    existing_users = snapshot_users(client, identity_store_id, user_extensions(desired_users))
+    plan = plan_users(desired_users, existing_users, module.params['purge'])
+
+    if module.check_mode:
+        results = [change_result(change, PAST_TENSE[change['action']]) for change in plan]
+    else:
+        results = apply_plan(
+            plan,
+            lambda change: apply_change(client, identity_store_id, change),
+            lambda change, error: dict(change_result(change, 'failed'),
+                                       msg=f"Failed to {change['action']} user: {error}"),
+            max_workers=module.params['max_workers']
+        )
+
+    # The idc_id lookup must not resolve the deleted users to their former IDs
+    deleted = [principal_cache_key(identity_store_id, 'user', result['user_name'])
+               for result in results if result['action'] == 'deleted']
+    if deleted and not module.check_mode:
+        FileCache.from_module(module, 'idc_id').delete_many(deleted)
+
+    counts = count_actions(results, ACTIONS)
+    changed = any(counts[action] for action in ('created', 'updated', 'deleted'))
+    result = dict(changed=changed, users=results, counts=counts, api_calls=counter.as_dict())
+
+    if counts['failed']:
+        module.fail_json(msg=f"{counts['failed']} of {len(results)} users failed", **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    user_spec = user_options(required=False)
+    user_spec['state'] = {"type": "str", "default": "present", "choices": ["present", "absent"]}
+
+    argument_spec = {
+        "identity_store_id": {"type": "str", "required": True},
+        "users": {
+            "type": "list",
+            "required": True,
+            "elements": "dict",
+            "options": user_spec,
+            "required_if": [("state", "present", ("name", "display_name", "emails"))],
+        },
+        "purge": {"type": "bool", "default": False},
+        "max_workers": {"type": "int", "default": 10},
+        **cache_argument_spec()
+    }
+
+    module = AnsibleAWSModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+
+    try:
+        connection = module.client('identitystore', retry_decorator=AWSRetry.jittered_backoff())
+        reconcile_users(connection, module)
+    except ClientError as e:
+        module.fail_json_aws(e, msg="Failed to reconcile users")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Host fact recording, on the controller, the permission sets whose provisioning was deferred:
+# instance ARN -> list of permission set ARNs
+DEFERRED_FACT = 'idc_deferred_provisioning'
+
+
+def deferred_provisioning(task_vars):
+    """Return a copy of the deferred provisioning registry of the host."""
+    registry = (task_vars or {}).get('ansible_facts', {}).get(DEFERRED_FACT) or {}
+    return {instance_arn: list(arns) for instance_arn, arns in registry.items()}
+
+
+def defer_provisioning(registry, instance_arn, permission_set_arn):
+    """Mark a permission set dirty, at most once."""
+    arns = registry.setdefault(instance_arn, [])
+    if permission_set_arn not in arns:
+        arns.append(permission_set_arn)
+    return registry
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of the dict_converter key conversion pipelines.
+
+Compares the three recursive passes (convert_dict_keys_to_pascal,
+remove_keys_from_dict, remove_keys_empty_value) with the single pass of the
+compiled user schema that replaced them, build_user_attributes, on synthetic
+user records. Run from the collection root:
+
+    python -m tests.benchmarks.bench_dict_converter [records]
+"""
+import sys
+import time
+
+from plugins.module_utils.dict_converter import convert_dict_keys_to_pascal, remove_keys_from_dict, \
+    remove_keys_empty_value
+from plugins.module_utils.identity_store import build_user_attributes
+
+REMOVE_KEYS = {"State", "Wait", "WaitTimeout"}
+
+
+def synthetic_user(index):
+    return {
+        "user_name": f"user{index}",
+        "display_name": f"User {index}",
+        "name": {"formatted": f"User {index}", "family_name": "Doe", "given_name": f"User{index}"},
+        "emails": [
+            {"value": f"user{index}@example.com", "type": "work", "primary": True},
+            {"value": None, "type": None, "primary": None},
+        ],
+        "addresses": [
+            {"street_address": "1 Main St", "locality": "Anytown", "region": None, "postal_code": "12345",
+             "country": "US", "formatted": None, "type": "work", "primary": True},
+        ],
+        "phone_numbers": [],
+        "enterprise": {"employee_number": str(index), "cost_center": None, "organization": "Eng",
+                       "division": None, "department": "Platform", "manager": None},
+        "user_type": "DEVELOPER",
+        "nick_name": None,
+        "title": "Engineer",
+        "locale": "",
+        "timezone": "UTC",
+        "preferred_language": None,
+        "state": "present",
+        "wait": False,
+        "wait_timeout": 300,
+    }
+
+
+def three_pass(record):
+    return remove_keys_empty_value(remove_keys_from_dict(convert_dict_keys_to_pascal(record), REMOVE_KEYS))
+
+
+def schema(record):
+    return build_user_attributes(record)[0]
+
+
+def bench(name, func, records):
+    start = time.perf_counter()
+    for record in records:
+        func(record)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12} {elapsed:8.3f}s {len(records) / elapsed:12,.0f} records/s")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = [synthetic_user(index) for index in range(count)]
+    baseline = bench("three-pass", three_pass, records)
+    optimized = bench("schema", schema, records)
+    print(f"speedup      {baseline / optimized:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of page prefetching in list_users against a stubbed high-latency endpoint.
+
+The stub paginator sleeps for every page like a remote list_users call would,
+and each user is converted the way list_users converts it. Run from the
+collection root:
+
+    python -m tests.benchmarks.bench_list_users_pipeline [pages] [latency_ms]
+"""
+import sys
+import time
+
+from plugins.module_utils.pagination import prefetch_pages
+from plugins.modules.list_users import user_formatter
+
+PAGE_SIZE = 100
+
+
+def synthetic_user(index):
+    return {
+        "UserId": f"id-{index}",
+        "UserName": f"user{index}",
+        "DisplayName": f"User {index}",
+        "Name": {"Formatted": f"User {index}", "FamilyName": "Doe", "GivenName": f"User{index}"},
+        "Emails": [{"Value": f"user{index}@example.com", "Type": "work", "Primary": True}],
+        "Addresses": [{"StreetAddress": "1 Main St", "Locality": "Anytown", "Country": "US", "Primary": True}],
+        "UserType": "DEVELOPER",
+        "Title": "Engineer",
+        "Timezone": "UTC",
+        "IdentityStoreId": "d-1234567890",
+    }
+
+
+def stub_pages(pages, latency):
+    for page in range(pages):
+        time.sleep(latency)
+        yield {"Users": [synthetic_user(page * PAGE_SIZE + index) for index in range(PAGE_SIZE)]}
+
+
+def consume(pages):
+    format_user = user_formatter(None)
+    return sum(1 for page in pages for user in page["Users"] if format_user(user))
+
+
+def bench(name, pages):
+    start = time.perf_counter()
+    records = consume(pages)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {elapsed:8.3f}s {records:8d} users")
+    return elapsed
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 100) / 1000.0
+
+    serial = bench("serial", stub_pages(pages, latency))
+    pipelined = bench("prefetch", prefetch_pages(stub_pages(pages, latency)))
+    print(f"speedup    {serial / pipelined:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
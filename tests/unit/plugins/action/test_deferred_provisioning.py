@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+from plugins.action.idc_permission_set import ActionModule as PermissionSetAction
+from plugins.action.idc_permission_set_provision import ActionModule as ProvisionAction
+from plugins.plugin_utils.provisioning import DEFERRED_FACT
+
+
+def action(plugin, args):
+    task = MagicMock(args=args, async_val=0, check_mode=False)
+    return plugin(task, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock())
+
+
+def test_changes_are_provisioned_once_per_permission_set():
+    facts = {}
+    for arn in ("arn:ps-1", "arn:ps-2", "arn:ps-1"):
+        plugin = action(PermissionSetAction, {"instance_arn": "arn:instance", "provision": "deferred"})
+        plugin._execute_module = MagicMock(return_value={
+            "changed": True, "permission_set_arn": arn, "provisioning_deferred": True
+        })
+        facts.update(plugin.run(task_vars={"ansible_facts": facts})["ansible_facts"])
+    assert facts == {DEFERRED_FACT: {"arn:instance": ["arn:ps-1", "arn:ps-2"]}}
+
+    flush = action(ProvisionAction, {"instance_arn": "arn:instance"})
+    flush._execute_module = MagicMock(return_value={"changed": True, "failed": False})
+    result = flush.run(task_vars={"ansible_facts": facts})
+
+    assert flush._execute_module.call_args[1]["module_args"]["permission_set_arns"] == ["arn:ps-1", "arn:ps-2"]
+    assert result["ansible_facts"] == {DEFERRED_FACT: {}}
+
+
+def test_failed_flush_keeps_the_registry():
+    facts = {DEFERRED_FACT: {"arn:instance": ["arn:ps-1"]}}
+    flush = action(ProvisionAction, {"instance_arn": "arn:instance"})
+    flush._execute_module = MagicMock(return_value={"failed": True, "msg": "Provisioning failed in 1 accounts"})
+
+    assert "ansible_facts" not in flush.run(task_vars={"ansible_facts": facts})
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+import pytest
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.template import Templar, trust_as_template
+from plugins.inventory.identity_center import InventoryModule, list_groups_with_members, _isoformat
+from plugins.module_utils.sso_admin import describe_permission_sets
+
+
+def paginator(pages_by_operation):
+    def get_paginator(operation):
+        pages = MagicMock()
+        pages.paginate.side_effect = lambda **kwargs: pages_by_operation[operation](**kwargs)
+        return pages
+    return get_paginator
+
+
+@pytest.fixture(name="results")
+def fixture_results():
+    identitystore = MagicMock()
+    identitystore.get_paginator.side_effect = paginator({
+        "list_groups": lambda **kwargs: [{"Groups": [{"GroupId": "g-1", "DisplayName": "platform admins"}]}],
+        "list_group_memberships": lambda **kwargs: [{"GroupMemberships": [
+            {"MembershipId": "m-1", "MemberId": {"UserId": "u-jane"}},
+        ]}],
+    })
+    sso_admin = MagicMock()
+    sso_admin.get_paginator.side_effect = paginator({
+        "list_permission_sets": lambda **kwargs: [{"PermissionSets": ["arn:ps-1"]}],
+    })
+    sso_admin.describe_permission_set.return_value = {"PermissionSet": {
+        "Name": "ReadOnly", "PermissionSetArn": "arn:ps-1",
+        "CreatedDate": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    }}
+
+    return {
+        "instance_arn": "arn:instance",
+        "identity_store_id": "d-1",
+        "users": [{"UserId": "u-jane", "UserName": "jane", "UserType": "DEVELOPER"}],
+        "groups": list_groups_with_members(identitystore, "d-1", max_workers=2),
+        "permission_sets": [
+            _isoformat(permission_set, "CreatedDate")
+            for permission_set in describe_permission_sets(sso_admin, "arn:instance", max_workers=2)
+        ],
+        "accounts": [{"Id": "111122223333", "Name": "prod", "Status": "ACTIVE"}],
+    }
+
+
+def test_query_helpers(results):
+    assert results["groups"][0]["MemberIds"] == ["u-jane"]
+    assert results["permission_sets"][0]["CreatedDate"] == "2025-01-01T00:00:00+00:00"
+
+
+def test_populate(results):
+    plugin = InventoryModule()
+    plugin.inventory = InventoryData()
+    plugin.templar = Templar(loader=DataLoader())
+    options = {"strict": False, "compose": {}, "groups": {}, "keyed_groups": [{"key": trust_as_template("user_type"), "prefix": "type"}]}
+    plugin.get_option = options.get
+
+    plugin._populate(results)
+
+    inventory = plugin.inventory
+    assert inventory.get_host("jane").vars["user_id"] == "u-jane"
+    assert "jane" in [host.name for host in inventory.groups["idc_group_platform_admins"].get_hosts()]
+    assert inventory.groups["idc_group_platform_admins"].vars["idc_group_id"] == "g-1"
+    assert inventory.groups["identity_center"].vars["idc_permission_sets"]["ReadOnly"]["permission_set_arn"] == "arn:ps-1"
+    assert "type_DEVELOPER" in inventory.groups
+    assert inventory.get_host("111122223333").vars["name"] == "prod"
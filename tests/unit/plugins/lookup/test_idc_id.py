@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+import pytest
+from plugins.lookup.idc_id import LookupModule
+from plugins.module_utils.cache import FileCache
+# The memos live in the modules imported by the lookup, under the collection namespace
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import clear_resolved
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import clear_crawled
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_memos():
+    clear_resolved()
+    clear_crawled()
+    yield
+    clear_resolved()
+    clear_crawled()
+
+
+@pytest.fixture(name="clients")
+def fixture_clients():
+    identitystore = MagicMock()
+    identitystore.get_group_id.side_effect = lambda **kwargs: {
+        "GroupId": "g-" + kwargs["AlternateIdentifier"]["UniqueAttribute"]["AttributeValue"]
+    }
+    sso_admin = MagicMock()
+    sso_admin.get_paginator.return_value.paginate.return_value = [{"PermissionSets": ["arn:ps-1", "arn:ps-2"]}]
+    sso_admin.describe_permission_set.side_effect = lambda **kwargs: {"PermissionSet": {
+        "Name": {"arn:ps-1": "ReadOnly", "arn:ps-2": "Admin"}[kwargs["PermissionSetArn"]],
+        "PermissionSetArn": kwargs["PermissionSetArn"],
+    }}
+    return {"identitystore": identitystore, "sso-admin": sso_admin}
+
+
+@pytest.fixture(name="lookup")
+def fixture_lookup(clients):
+    lookup = LookupModule()
+    lookup.client = lambda service, **kwargs: clients[service]
+    options = {"identity_store_id": "d-1", "instance_arn": "arn:instance-1", "max_workers": 4}
+    lookup.get_option = options.get
+    return lookup
+
+
+def test_resolve_groups_cached_across_processes(lookup, clients, tmp_path):
+    cache = FileCache("idc_id", cache_dir=str(tmp_path))
+
+    assert lookup._resolve_principals("group", ["admins", "devs"], cache) == {"admins": "g-admins", "devs": "g-devs"}
+    # A new process only has the cache file
+    clear_resolved()
+    assert lookup._resolve_principals("group", ["devs"], cache) == {"devs": "g-devs"}
+
+    assert clients["identitystore"].get_group_id.call_count == 2
+
+
+def test_resolve_permission_sets_crawls_once(lookup, clients, tmp_path):
+    cache = FileCache("idc_id", cache_dir=str(tmp_path))
+
+    assert lookup._resolve_permission_sets(["Admin", "ReadOnly"], cache) == {"Admin": "arn:ps-2", "ReadOnly": "arn:ps-1"}
+    assert lookup._resolve_permission_sets(["Missing"], cache) == {"Missing": None}
+    assert clients["sso-admin"].describe_permission_set.call_count == 2
+
+    # A new process reads names back from the cache file, and knows from the complete index that a
+    # name missing from it does not exist
+    clear_crawled()
+    assert lookup._resolve_permission_sets(["Admin"], cache) == {"Admin": "arn:ps-2"}
+    assert lookup._resolve_permission_sets(["Missing"], cache) == {"Missing": None}
+    assert clients["sso-admin"].describe_permission_set.call_count == 2
@@ -0,0 +1,56 @@
+from plugins.module_utils.attribute_schema import AttributeSchema
+
+ARGUMENT_SPEC = {
+    "name": {"type": "str"},
+    "description": {"type": "str"},
+    "owner": {
+        "type": "dict",
+        "options": {
+            "given_name": {"type": "str"},
+            "family_name": {"type": "str"},
+        }
+    },
+    "emails": {
+        "type": "list",
+        "elements": "dict",
+        "options": {
+            "value": {"type": "str"},
+            "primary": {"type": "bool"},
+        }
+    },
+}
+
+
+def test_build_attributes_and_leaves():
+    schema = AttributeSchema(ARGUMENT_SPEC, api_names={"name": "DisplayName"}, unordered=("Emails",))
+    attributes, leaves = schema.build({
+        "name": "admins",
+        "description": None,
+        "owner": {"given_name": "Jane", "family_name": None},
+        "emails": [{"value": "a@example.com", "primary": None}, {"value": None, "primary": None}],
+        "state": "present",
+    })
+
+    assert attributes == {
+        "DisplayName": "admins",
+        "Owner": {"GivenName": "Jane"},
+        "Emails": [{"Value": "a@example.com"}],
+    }
+    assert [path for keys, path, value in leaves] == ["displayName", "owner.givenName", "emails"]
+
+
+def test_operations_only_contain_differences():
+    schema = AttributeSchema(ARGUMENT_SPEC, unordered=("Emails",))
+    attributes, leaves = schema.build({
+        "name": "admins",
+        "owner": {"given_name": "Jane"},
+        "emails": [{"value": "a@example.com"}, {"value": "b@example.com"}],
+    })
+    current = {
+        "Name": "admins",
+        "Owner": {"GivenName": "John"},
+        "Emails": [{"Value": "b@example.com"}, {"Value": "a@example.com"}],
+    }
+
+    assert schema.operations(leaves, current) == [{"AttributePath": "owner.givenName", "AttributeValue": "Jane"}]
+    assert len(schema.operations(leaves)) == 3
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from plugins.module_utils.cache import FileCache
+from plugins.module_utils.sso_admin import get_identity_store_id
+
+
+def test_file_cache_hits_and_expiry(tmp_path):
+    cache = FileCache("test", ttl=60, cache_dir=str(tmp_path))
+    assert cache.get("key") is None
+
+    cache.set("key", "value")
+    assert FileCache("test", cache_dir=str(tmp_path)).get("key") == "value"
+
+    expired = FileCache("test", ttl=-1, cache_dir=str(tmp_path))
+    expired.set("old", "value")
+    assert expired.get("old") is None
+
+    assert cache.stats() == {"hits": 0, "misses": 1}
+
+
+def test_file_cache_get_and_set_many(tmp_path):
+    cache = FileCache("test", cache_dir=str(tmp_path))
+    cache.set_many({"a": 1, "b": 2})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_file_cache_disabled(tmp_path):
+    cache = FileCache("test", cache_dir=str(tmp_path), enabled=False)
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
+    assert not (tmp_path / "test.json").exists()
+
+
+def test_file_cache_concurrent_writers_keep_every_entry(tmp_path):
+    def write(index):
+        FileCache("test", cache_dir=str(tmp_path)).set(f"key{index}", index)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(40)))
+
+    cache = FileCache("test", cache_dir=str(tmp_path))
+    assert [cache.get(f"key{index}") for index in range(40)] == list(range(40))
+
+
+def test_get_identity_store_id_uses_cache(tmp_path):
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"Instances": [{"InstanceArn": "arn:aws:sso:::instance/ssoins-1", "IdentityStoreId": "d-1"}]}
+    ]
+    cache = FileCache("identity_store_ids", cache_dir=str(tmp_path))
+
+    assert get_identity_store_id(client, "arn:aws:sso:::instance/ssoins-1", "us-east-1", cache) == "d-1"
+    assert get_identity_store_id(client, "arn:aws:sso:::instance/ssoins-1", "us-east-1", cache) == "d-1"
+    assert get_identity_store_id(client, "arn:aws:sso:::instance/ssoins-2", "us-east-1", cache) is None
+
+    assert client.get_paginator.call_count == 2
+    assert cache.stats() == {"hits": 1, "misses": 2}
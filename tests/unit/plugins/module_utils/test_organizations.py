@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock
+
+from plugins.module_utils.bulk import RateLimiter
+from plugins.module_utils.cache import FileCache
+from plugins.module_utils.organizations import list_ou_accounts, is_active
+
+TREE = {
+    "r-root": (["111111111111"], ["ou-a", "ou-b"]),
+    "ou-a": (["222222222222"], ["ou-c"]),
+    "ou-b": (["333333333333"], []),
+    "ou-c": (["444444444444"], []),
+}
+
+
+def organizations_client():
+    client = MagicMock()
+
+    def paginator(operation):
+        def paginate(ParentId):
+            accounts, ous = TREE[ParentId]
+            if operation == "list_accounts_for_parent":
+                return [{"Accounts": [
+                    {"Id": account_id, "Name": account_id, "State": "SUSPENDED" if account_id == "333333333333"
+                     else "ACTIVE"}
+                    for account_id in accounts
+                ]}]
+            return [{"OrganizationalUnits": [{"Id": ou_id} for ou_id in ous]}]
+        return MagicMock(paginate=paginate)
+
+    client.get_paginator.side_effect = paginator
+    return client
+
+
+def test_list_ou_accounts_walks_the_tree_and_caches(tmp_path):
+    client = organizations_client()
+    cache = FileCache("organization_accounts", cache_dir=str(tmp_path))
+
+    accounts = list_ou_accounts(client, "r-root", cache=cache)
+    assert sorted(account["Id"] for account in accounts) == [
+        "111111111111", "222222222222", "333333333333", "444444444444"
+    ]
+    assert [account["Id"] for account in accounts if not is_active(account)] == ["333333333333"]
+
+    calls = client.get_paginator.call_count
+    assert list_ou_accounts(client, "r-root", cache=cache) == accounts
+    assert client.get_paginator.call_count == calls
+
+    assert [account["Id"] for account in list_ou_accounts(client, "ou-a", recursive=False)] == ["222222222222"]
+
+
+def test_rate_limiter_spaces_calls():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+
+    limiter = RateLimiter(4, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.wait()
+
+    assert sleeps == [0.25, 0.5]
+    RateLimiter(None, sleep=sleep).wait()
+    assert len(sleeps) == 2
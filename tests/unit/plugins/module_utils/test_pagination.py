@@ -0,0 +1,33 @@
+import pytest
+
+from plugins.module_utils.pagination import prefetch_pages
+
+
+def test_prefetch_pages_keeps_order():
+    assert list(prefetch_pages(iter(range(20)), depth=3)) == list(range(20))
+
+
+def test_prefetch_pages_reraises_fetch_errors():
+    def pages():
+        yield 1
+        raise RuntimeError("throttled")
+
+    iterator = prefetch_pages(pages())
+    assert next(iterator) == 1
+    with pytest.raises(RuntimeError, match="throttled"):
+        next(iterator)
+
+
+def test_prefetch_pages_stops_when_abandoned():
+    fetched = []
+
+    def pages():
+        for page in range(1000):
+            fetched.append(page)
+            yield page
+
+    iterator = prefetch_pages(pages())
+    assert next(iterator) == 0
+    iterator.close()
+
+    assert len(fetched) < 1000
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+from plugins.module_utils.permission_sets import provision_permission_sets, OUTDATED
+
+ACCOUNTS = {
+    "arn:ps-1": {"111111111111": True, "222222222222": False},
+    "arn:ps-2": {"333333333333": True},
+}
+
+
+def sso_admin_client():
+    """Accounts map to whether their copy of the permission set is outdated; 333333333333 fails to provision."""
+    client = MagicMock()
+
+    def paginate(InstanceArn, PermissionSetArn, ProvisioningStatus=None):
+        return [{"AccountIds": [
+            account_id for account_id, outdated in ACCOUNTS[PermissionSetArn].items()
+            if ProvisioningStatus is None or (ProvisioningStatus == OUTDATED) == outdated
+        ]}]
+
+    def status(request_id):
+        return "FAILED" if request_id.endswith("333333333333") else "SUCCEEDED"
+
+    client.get_paginator.return_value.paginate.side_effect = paginate
+    client.provision_permission_set.side_effect = lambda **kwargs: {"PermissionSetProvisioningStatus": {
+        "RequestId": f"{kwargs['PermissionSetArn']}/{kwargs['TargetId']}", "Status": "IN_PROGRESS"
+    }}
+    client.describe_permission_set_provisioning_status.side_effect = lambda **kwargs: {
+        "PermissionSetProvisioningStatus": {
+            "RequestId": kwargs["ProvisionPermissionSetRequestId"],
+            "Status": status(kwargs["ProvisionPermissionSetRequestId"]),
+            "FailureReason": "Policy not found" if status(kwargs["ProvisionPermissionSetRequestId"]) == "FAILED"
+            else None,
+        }
+    }
+    return client
+
+
+def test_provision_permission_sets_targets_outdated_accounts():
+    client = sso_admin_client()
+
+    result = provision_permission_sets(client, "arn:instance", ["arn:ps-1", "arn:ps-2"], max_workers=4)
+
+    assert result["targets"] == [("arn:ps-1", "111111111111"), ("arn:ps-2", "333333333333")]
+    assert sorted(call[1]["TargetId"] for call in client.provision_permission_set.call_args_list) == [
+        "111111111111", "333333333333"
+    ]
+    assert result["counts"] == {"SUCCEEDED": 1, "FAILED": 1, "IN_PROGRESS": 0}
+    assert result["failed"] == [
+        {"permission_set_arn": "arn:ps-2", "account_id": "333333333333", "msg": "Policy not found"}
+    ]
+
+
+def test_provision_permission_sets_check_mode_lists_all_accounts():
+    client = sso_admin_client()
+
+    result = provision_permission_sets(client, "arn:instance", ["arn:ps-1"], only_outdated=False, check_mode=True)
+
+    assert result["targets"] == [("arn:ps-1", "111111111111"), ("arn:ps-1", "222222222222")]
+    client.provision_permission_set.assert_not_called()
@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+from plugins.module_utils.request_status import track_requests, latency_percentiles, count_statuses
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+def client_completing(done_after):
+    """Client whose creation requests complete once the clock reaches done_after[request_id]."""
+    clock = FakeClock()
+    client = MagicMock()
+
+    def status(request_id):
+        if clock.now < done_after[request_id]:
+            return "IN_PROGRESS"
+        return "FAILED" if request_id == "r-bad" else "SUCCEEDED"
+
+    client.describe_account_assignment_creation_status.side_effect = lambda **kwargs: {
+        "AccountAssignmentCreationStatus": {
+            "RequestId": kwargs["AccountAssignmentCreationRequestId"],
+            "Status": status(kwargs["AccountAssignmentCreationRequestId"]),
+            "FailureReason": "Boom" if kwargs["AccountAssignmentCreationRequestId"] == "r-bad" else None,
+        }
+    }
+    client.get_paginator.return_value.paginate.side_effect = lambda **kwargs: [{
+        "AccountAssignmentsCreationStatus": [
+            {"RequestId": request_id, "Status": "IN_PROGRESS"}
+            for request_id in done_after if status(request_id) == "IN_PROGRESS"
+        ]
+    }]
+    return client, clock
+
+
+def test_track_requests_describes_few_requests():
+    client, clock = client_completing({"r-1": 0, "r-bad": 3})
+
+    results = track_requests(client, "arn:instance", [("create", "r-1"), ("create", "r-bad")],
+                             sleep=clock.sleep, clock=clock)
+
+    assert results["r-1"]["status"] == "SUCCEEDED"
+    assert results["r-bad"] == {"kind": "create", "status": "FAILED", "failure_reason": "Boom", "latency": 4.0}
+    # r-1 completed in the first round, so the delay only grows after the second one
+    assert clock.sleeps == [1, 1, 2]
+    client.get_paginator.assert_not_called()
+
+
+def test_track_requests_lists_many_requests():
+    done_after = {f"r-{index}": index % 3 for index in range(50)}
+    client, clock = client_completing(done_after)
+
+    results = track_requests(client, "arn:instance", [("create", request_id) for request_id in done_after],
+                             sleep=clock.sleep, clock=clock)
+
+    assert count_statuses(results) == {"SUCCEEDED": 50, "FAILED": 0, "IN_PROGRESS": 0}
+    # Every request is described once, when it is no longer listed as in progress
+    assert client.describe_account_assignment_creation_status.call_count == 50
+    assert latency_percentiles(results) == {"p50": 1.0, "p90": 2.0, "p99": 2.0, "max": 2.0}
+
+
+def test_track_requests_timeout():
+    client, clock = client_completing({"r-1": 100})
+
+    results = track_requests(client, "arn:instance", [("create", "r-1")], timeout=5, sleep=clock.sleep, clock=clock)
+
+    assert results["r-1"]["status"] == "IN_PROGRESS"
+    assert sum(clock.sleeps) <= 5
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+import pytest
+from botocore.exceptions import ClientError
+from plugins.module_utils.identity_store import unique_attribute
+from plugins.module_utils.resolver import IdentityResolver, clear_resolved
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_resolved():
+    clear_resolved()
+    yield
+    clear_resolved()
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    client = MagicMock()
+    client.get_user_id.return_value = {"UserId": "u-jane"}
+    client.get_group_id.side_effect = ClientError(
+        {"Error": {"Code": "ResourceNotFoundException", "Message": "not found"}}, "GetGroupId"
+    )
+    return client
+
+
+def test_resolver_memoizes_across_resolvers(client):
+    assert IdentityResolver(client, "d-1").user_id(user_name="jane") == "u-jane"
+    assert IdentityResolver(client, "d-1").user_id(user_name="jane") == "u-jane"
+    assert IdentityResolver(client, "d-1").user_id(email="jane@example.com") == "u-jane"
+
+    assert client.get_user_id.call_count == 2
+    client.get_user_id.assert_called_with(
+        IdentityStoreId="d-1",
+        AlternateIdentifier={"UniqueAttribute": {"AttributePath": "emails.value", "AttributeValue": "jane@example.com"}}
+    )
+
+
+def test_resolver_negative_cache(client):
+    resolver = IdentityResolver(client, "d-1")
+
+    assert resolver.group_id(display_name="ghosts") is None
+    assert resolver.group_id(display_name="ghosts") is None
+    assert client.get_group_id.call_count == 1
+
+    resolver.remember("group", unique_attribute("displayName", "ghosts"), "g-ghosts")
+    assert resolver.group_id(display_name="ghosts") == "g-ghosts"
+
+    resolver.forget("group", unique_attribute("displayName", "ghosts"))
+    assert resolver.group_id(display_name="ghosts") is None
+    assert client.get_group_id.call_count == 2
+
+
+def test_resolver_external_id(client):
+    resolver = IdentityResolver(client, "d-1")
+
+    assert resolver.user_id(issuer="okta", external_user_id="00u1") == "u-jane"
+    client.get_user_id.assert_called_once_with(
+        IdentityStoreId="d-1", AlternateIdentifier={"ExternalId": {"Issuer": "okta", "Id": "00u1"}}
+    )
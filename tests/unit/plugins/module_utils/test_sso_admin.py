@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+import pytest
+from botocore.exceptions import ClientError
+from plugins.module_utils.cache import FileCache
+from plugins.module_utils.sso_admin import find_permission_set_arns, remember_permission_set_arn, clear_crawled
+
+NAMES = {"arn:ps-1": "ReadOnly", "arn:ps-2": "Admin"}
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_crawled():
+    clear_crawled()
+    yield
+    clear_crawled()
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    def describe(**kwargs):
+        if kwargs["PermissionSetArn"] not in NAMES:
+            raise ClientError({"Error": {"Code": "ResourceNotFoundException"}}, "DescribePermissionSet")
+        arn = kwargs["PermissionSetArn"]
+        return {"PermissionSet": {"Name": NAMES[arn], "PermissionSetArn": arn}}
+
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [{"PermissionSets": list(NAMES)}]
+    client.describe_permission_set.side_effect = describe
+    return client
+
+
+def test_find_permission_set_arns_index(client, tmp_path):
+    cache = FileCache("permission_set_arns", cache_dir=str(tmp_path))
+
+    assert find_permission_set_arns(client, "arn:instance", ["Admin", "New"], cache=cache) == {
+        "Admin": "arn:ps-2", "New": None
+    }
+    assert client.describe_permission_set.call_count == 2
+
+    # Creations and deletions keep the index current without crawling again
+    remember_permission_set_arn("arn:instance", "New", "arn:ps-3", cache=cache)
+    remember_permission_set_arn("arn:instance", "Admin", None, cache=cache)
+    assert find_permission_set_arns(client, "arn:instance", ["Admin", "New"]) == {"Admin": None, "New": "arn:ps-3"}
+
+    # A new process finds cached names without crawling
+    clear_crawled()
+    assert find_permission_set_arns(client, "arn:instance", ["New", "ReadOnly"], cache=cache) == {
+        "New": "arn:ps-3", "ReadOnly": "arn:ps-1"
+    }
+    assert client.describe_permission_set.call_count == 2
+
+
+def test_find_permission_set_arns_verifies_cached_arns(client, tmp_path):
+    cache = FileCache("permission_set_arns", cache_dir=str(tmp_path))
+    # Deleted by someone else since it was cached
+    remember_permission_set_arn("arn:instance", "Gone", "arn:ps-9", cache=cache)
+
+    assert find_permission_set_arns(client, "arn:instance", ["Gone"], cache=cache, verify=True) == {"Gone": None}
+    # One describe to verify the cached ARN, then the crawl
+    assert client.describe_permission_set.call_count == 3
+
+
+def test_find_permission_set_arns_complete_index(client, tmp_path):
+    cache = FileCache("permission_set_arns", cache_dir=str(tmp_path))
+    find_permission_set_arns(client, "arn:instance", ["Admin"], cache=cache)
+    assert client.describe_permission_set.call_count == 2
+
+    # A name missing from the complete index does not exist until the index expires
+    clear_crawled()
+    assert find_permission_set_arns(client, "arn:instance", ["Missing", "Admin"], cache=cache) == {
+        "Missing": None, "Admin": "arn:ps-2"
+    }
+    assert client.describe_permission_set.call_count == 2
+
+    # Without the complete index a missing name is crawled
+    clear_crawled()
+    other = FileCache("permission_set_arns", cache_dir=str(tmp_path / "other"))
+    remember_permission_set_arn("arn:instance", "Admin", "arn:ps-2", cache=other)
+    assert find_permission_set_arns(client, "arn:instance", ["Missing"], cache=other) == {"Missing": None}
+    assert client.describe_permission_set.call_count == 4
+
+
+def test_find_permission_set_arns_verify_ignores_complete_index(client, tmp_path):
+    cache = FileCache("permission_set_arns", cache_dir=str(tmp_path))
+    find_permission_set_arns(client, "arn:instance", ["Admin"], cache=cache)
+    assert client.describe_permission_set.call_count == 2
+
+    # Writers crawl a missing name, which may have been created since the index was built
+    clear_crawled()
+    assert find_permission_set_arns(client, "arn:instance", ["Missing"], cache=cache, verify=True) == {"Missing": None}
+    assert client.describe_permission_set.call_count == 4
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock
+import pytest
+import plugins.modules.groups as groups_module
+from plugins.module_utils.cache import FileCache
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"Groups": [
+            {"GroupId": "g-dev", "DisplayName": "developers", "Description": "Developers"},
+            {"GroupId": "g-ops", "DisplayName": "operations", "Description": "Ops"},
+        ]},
+        {"Groups": [{"GroupId": "g-old", "DisplayName": "legacy"}]},
+    ]
+    client.create_group.return_value = {"GroupId": "g-new"}
+    return client
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path):
+    module = MagicMock()
+    module.check_mode = False
+    module.params = {
+        "identity_store_id": "test-identity-store-id",
+        "groups": [
+            {"name": "developers", "description": "Developers", "state": "present"},
+            {"name": "operations", "description": "Platform operations", "state": "present"},
+            {"name": "security", "description": None, "state": "present"},
+        ],
+        "purge": True,
+        "max_workers": 4,
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    return module
+
+
+def test_reconcile_groups(client, module, tmp_path):
+    cache = FileCache("idc_id", cache_dir=str(tmp_path))
+    cache.set_many({"test-identity-store-id|group|legacy": "g-old", "test-identity-store-id|group|developers": "g-dev"})
+
+    groups_module.reconcile_groups(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["counts"] == {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1, "failed": 0}
+    client.get_paginator.assert_called_once_with("list_groups")
+    client.create_group.assert_called_once_with(
+        aws_retry=True, IdentityStoreId="test-identity-store-id", DisplayName="security"
+    )
+    client.update_group.assert_called_once_with(
+        aws_retry=True,
+        IdentityStoreId="test-identity-store-id",
+        GroupId="g-ops",
+        Operations=[{"AttributePath": "description", "AttributeValue": "Platform operations"}]
+    )
+    client.delete_group.assert_called_once_with(aws_retry=True, IdentityStoreId="test-identity-store-id",
+                                                GroupId="g-old")
+    # The idc_id lookup no longer resolves the deleted group from its cache file
+    assert cache.get("test-identity-store-id|group|legacy") is None
+    assert cache.get("test-identity-store-id|group|developers") == "g-dev"
+
+
+def test_reconcile_groups_check_mode(client, module):
+    module.check_mode = True
+
+    groups_module.reconcile_groups(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["changed"] is True
+    client.create_group.assert_not_called()
+    client.update_group.assert_not_called()
+    client.delete_group.assert_not_called()
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+import pytest
+import plugins.modules.idc_group as idc_group_module
+from plugins.module_utils.cache import FileCache
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import clear_resolved
+
+CACHE_KEY = "test-identity-store-id|group|leavers"
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_resolved():
+    clear_resolved()
+    yield
+    clear_resolved()
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    client = MagicMock()
+    client.get_group_id.return_value = {"GroupId": "g-leavers"}
+    return client
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path):
+    module = MagicMock()
+    module.check_mode = False
+    module.params = {
+        "identity_store_id": "test-identity-store-id",
+        "name": "leavers",
+        "description": None,
+        "state": "absent",
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    FileCache("idc_id", cache_dir=str(tmp_path)).set(CACHE_KEY, "g-leavers")
+    return module
+
+
+def test_destroy_group(client, module, tmp_path):
+    idc_group_module.destroy_group(client, module)
+
+    client.delete_group.assert_called_once_with(IdentityStoreId="test-identity-store-id", GroupId="g-leavers")
+    assert module.exit_json.call_args[1]["changed"] is True
+    # The idc_id lookup no longer resolves the deleted group from its cache file
+    assert FileCache("idc_id", cache_dir=str(tmp_path)).get(CACHE_KEY) is None
+
+
+def test_destroy_group_check_mode(client, module, tmp_path):
+    module.check_mode = True
+
+    idc_group_module.destroy_group(client, module)
+
+    client.delete_group.assert_not_called()
+    assert module.exit_json.call_args[1]["changed"] is True
+    assert FileCache("idc_id", cache_dir=str(tmp_path)).get(CACHE_KEY) == "g-leavers"
@@ -0,0 +1,127 @@
+from unittest.mock import MagicMock
+import pytest
+from botocore.exceptions import ClientError
+import plugins.modules.idc_group_membership as membership_module
+from plugins.module_utils.cache import FileCache
+# The memo lives in the modules imported by the plugins, under the collection namespace
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import clear_resolved
+
+NOT_FOUND = ClientError({"Error": {"Code": "ResourceNotFoundException"}}, "GetUserId")
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    client = MagicMock()
+    client.get_group_id.return_value = {"GroupId": "g-dev"}
+    client.get_user_id.side_effect = lambda **kwargs: {
+        "UserId": "id-" + kwargs["AlternateIdentifier"]["UniqueAttribute"]["AttributeValue"]
+    }
+    client.get_paginator.return_value.paginate.return_value = [
+        {"GroupMemberships": [
+            {"MembershipId": "m-jane", "MemberId": {"UserId": "id-jane"}},
+            {"MembershipId": "m-old", "MemberId": {"UserId": "id-old"}},
+        ]},
+    ]
+    return client
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_resolved():
+    clear_resolved()
+    yield
+    clear_resolved()
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path):
+    module = MagicMock()
+    module.check_mode = False
+    module.params = {
+        "identity_store_id": "test-identity-store-id",
+        "group": "developers",
+        "group_id": None,
+        "members": ["jane", "john"],
+        "member_ids": ["id-bob"],
+        "state": "present",
+        "exclusive": False,
+        "max_workers": 4,
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    return module
+
+
+def test_plan_memberships():
+    current = {"id-jane": "m-jane", "id-old": "m-old"}
+
+    assert membership_module.plan_memberships(["id-jane", "id-john"], current, "present", False) == \
+        (["id-john"], [])
+    assert membership_module.plan_memberships(["id-jane", "id-john"], current, "present", True) == \
+        (["id-john"], ["id-old"])
+    assert membership_module.plan_memberships(["id-jane", "id-john"], current, "absent", False) == \
+        ([], ["id-jane"])
+
+
+def test_manage_memberships_exclusive(client, module):
+    module.params["exclusive"] = True
+
+    membership_module.manage_memberships(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["changed"] is True
+    assert sorted(result["added"]) == ["id-bob", "id-john"]
+    assert result["removed"] == ["id-old"]
+    assert client.create_group_membership.call_count == 2
+    client.delete_group_membership.assert_called_once_with(
+        aws_retry=True, IdentityStoreId="test-identity-store-id", MembershipId="m-old"
+    )
+
+
+def test_manage_memberships_check_mode(client, module):
+    module.check_mode = True
+
+    membership_module.manage_memberships(client, module)
+
+    result = module.exit_json.call_args_list[0][1]
+    assert result["added"] == ["id-bob", "id-john"]
+    client.create_group_membership.assert_not_called()
+
+
+def test_manage_memberships_absent_ignores_unknown_users(client, module):
+    def get_user_id(**kwargs):
+        if kwargs["AlternateIdentifier"]["UniqueAttribute"]["AttributeValue"] != "jane":
+            raise NOT_FOUND
+        return {"UserId": "id-jane"}
+
+    client.get_user_id.side_effect = get_user_id
+    module.params.update(state="absent", member_ids=[], members=["jane", "nobody"])
+
+    membership_module.manage_memberships(client, module)
+
+    module.fail_json.assert_not_called()
+    result = module.exit_json.call_args[1]
+    assert result["removed"] == ["id-jane"]
+    client.delete_group_membership.assert_called_once_with(
+        aws_retry=True, IdentityStoreId="test-identity-store-id", MembershipId="m-jane"
+    )
+
+
+def test_manage_memberships_present_fails_on_unknown_users(client, module):
+    client.get_user_id.side_effect = NOT_FOUND
+
+    membership_module.manage_memberships(client, module)
+
+    assert module.fail_json.call_args[1]["msg"] == "Users not found in the identity store: jane, john"
+
+
+def test_manage_memberships_resolves_through_idc_id_cache(client, module, tmp_path):
+    cache = FileCache("idc_id", cache_dir=str(tmp_path))
+    cache.set("test-identity-store-id|user|jane", "id-jane")
+
+    membership_module.manage_memberships(client, module)
+
+    # jane is read from the cache file of the idc_id lookup, the other names are resolved and added to it
+    client.get_user_id.assert_called_once()
+    assert cache.get("test-identity-store-id|user|john") == "id-john"
+    assert cache.get("test-identity-store-id|group|developers") == "g-dev"
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+import pytest
+from botocore.exceptions import ClientError
+import plugins.modules.idc_group_membership_info as membership_info_module
+# The memo lives in the modules imported by the plugins, under the collection namespace
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.resolver import clear_resolved
+
+
+def not_found(operation):
+    return ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": "not found"}}, operation)
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    members = {("u-jane", "g-admins"), ("u-bob", "g-0042")}
+
+    def get_user_id(**kwargs):
+        name = kwargs["AlternateIdentifier"]["UniqueAttribute"]["AttributeValue"]
+        if name == "ghost":
+            raise not_found("GetUserId")
+        return {"UserId": "u-" + name}
+
+    def is_member_in_groups(**kwargs):
+        user_id = kwargs["MemberId"]["UserId"]
+        return {"Results": [
+            {"GroupId": group_id, "MemberId": {"UserId": user_id}, "MembershipExists": (user_id, group_id) in members}
+            for group_id in kwargs["GroupIds"]
+        ]}
+
+    client = MagicMock()
+    client.get_user_id.side_effect = get_user_id
+    client.get_group_id.side_effect = lambda **kwargs: {
+        "GroupId": "g-" + kwargs["AlternateIdentifier"]["UniqueAttribute"]["AttributeValue"]
+    }
+    client.is_member_in_groups.side_effect = is_member_in_groups
+    return client
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_resolved():
+    clear_resolved()
+    yield
+    clear_resolved()
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path):
+    module = MagicMock()
+    module.params = {
+        "identity_store_id": "test-identity-store-id",
+        "users": ["jane", "ghost"],
+        "user_ids": ["u-bob"],
+        "groups": ["admins"],
+        "group_ids": [f"g-{index:04d}" for index in range(150)],
+        "max_workers": 4,
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    return module
+
+
+def test_plan_batches():
+    batches = membership_info_module.plan_batches(["u-1", "u-2"], [f"g-{index}" for index in range(250)])
+
+    assert len(batches) == 6
+    assert [len(group_ids) for user_id, group_ids in batches[:3]] == [100, 100, 50]
+
+
+def test_check_memberships(client, module):
+    membership_info_module.check_memberships(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["users"] == ["jane", "ghost", "u-bob"]
+    assert result["groups"][:2] == ["admins", "g-0000"]
+    assert result["memberships"]["jane"]["admins"] is True
+    assert result["memberships"]["u-bob"]["g-0042"] is True
+    assert not any(result["memberships"]["ghost"].values())
+    assert sum(map(sum, result["matrix"])) == 2
+    assert result["missing_users"] == ["ghost"]
+    # 2 resolved users x 151 groups -> 2 batches each
+    assert client.is_member_in_groups.call_count == 4
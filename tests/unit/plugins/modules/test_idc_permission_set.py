@@ -0,0 +1,158 @@
+import json
+from unittest.mock import MagicMock
+import pytest
+from botocore.exceptions import ClientError
+import plugins.modules.idc_permission_set as permission_set_module
+from ansible_collections.begoingto.aws_identity_center.plugins.module_utils.sso_admin import clear_crawled
+
+PS_ARN = "arn:aws:sso:::permissionSet/ssoins-1/ps-1"
+POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [{"Effect": "Deny", "Action": ["s3:DeleteObject", "s3:DeleteBucket"], "Resource": "*"}],
+}
+
+
+@pytest.fixture(autouse=True)
+def fixture_clear_crawled():
+    clear_crawled()
+    yield
+    clear_crawled()
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    pages = {
+        "list_managed_policies_in_permission_set": [{"AttachedManagedPolicies": [
+            {"Arn": "arn:aws:iam::aws:policy/ReadOnlyAccess", "Name": "ReadOnlyAccess"},
+            {"Arn": "arn:aws:iam::aws:policy/PowerUserAccess", "Name": "PowerUserAccess"},
+        ]}],
+        "list_customer_managed_policy_references_in_permission_set": [{"CustomerManagedPolicyReferences": [
+            {"Name": "s3-reader", "Path": "/team/"},
+        ]}],
+        "list_tags_for_resource": [{"Tags": [{"Key": "team", "Value": "storage"}, {"Key": "old", "Value": "x"}]}],
+        "list_permission_sets": [{"PermissionSets": [PS_ARN]}],
+    }
+    client = MagicMock()
+    client.get_paginator.side_effect = lambda operation: MagicMock(**{"paginate.return_value": pages[operation]})
+    client.describe_permission_set.return_value = {"PermissionSet": {
+        "Name": "S3Reader", "PermissionSetArn": PS_ARN, "Description": "Read S3", "SessionDuration": "PT1H",
+    }}
+    client.get_permissions_boundary_for_permission_set.return_value = {
+        "PermissionsBoundary": {"ManagedPolicyArn": "arn:aws:iam::aws:policy/ReadOnlyAccess"}
+    }
+    # Same policy, other key order, formatting and action order
+    client.get_inline_policy_for_permission_set.return_value = {"InlinePolicy": json.dumps({
+        "Statement": [{"Resource": "*", "Action": ["s3:DeleteBucket", "s3:DeleteObject"], "Effect": "Deny"}],
+        "Version": "2012-10-17",
+    }, indent=2)}
+    return client
+
+
+@pytest.fixture(name="module")
+def fixture_module():
+    module = MagicMock()
+    module.check_mode = False
+    module.region = "us-east-1"
+    module.params = {
+        "instance_arn": "arn:instance",
+        "name": "S3Reader",
+        "description": "Read S3",
+        "session_duration": "PT4H",
+        "relay_state": None,
+        "managed_policies": ["arn:aws:iam::aws:policy/ReadOnlyAccess"],
+        "customer_managed_policies": [{"name": "s3-reader", "path": "/team/"}],
+        "permissions_boundary": {"managed_policy_arn": "arn:aws:iam::aws:policy/ReadOnlyAccess",
+                                 "customer_managed_policy_reference": None},
+        "inline_policy": json.dumps(POLICY),
+        "tags": {"team": "storage"},
+        "purge_tags": True,
+        "max_workers": 4,
+    }
+    return module
+
+
+def test_ensure_permission_set_makes_only_needed_calls(client, module):
+    result = permission_set_module.ensure_permission_set(client, module, PS_ARN, None)
+
+    assert result["changed"] is True
+    assert result["provisioning_required"] is True
+    assert result["changes"] == [
+        "update_permission_set", "detach_managed_policy_from_permission_set", "untag_resource"
+    ]
+    client.update_permission_set.assert_called_once_with(
+        aws_retry=True, InstanceArn="arn:instance", PermissionSetArn=PS_ARN, SessionDuration="PT4H"
+    )
+    assert client.detach_managed_policy_from_permission_set.call_args[1]["ManagedPolicyArn"] == \
+        "arn:aws:iam::aws:policy/PowerUserAccess"
+    client.untag_resource.assert_called_once_with(
+        aws_retry=True, InstanceArn="arn:instance", ResourceArn=PS_ARN, TagKeys=["old"]
+    )
+    client.put_inline_policy_to_permission_set.assert_not_called()
+    client.put_permissions_boundary_to_permission_set.assert_not_called()
+
+
+def test_ensure_permission_set_check_mode_and_unmanaged_options(client, module):
+    module.check_mode = True
+    module.params.update(managed_policies=None, tags=None, inline_policy="", permissions_boundary=None)
+
+    result = permission_set_module.ensure_permission_set(client, module, PS_ARN, None)
+
+    assert result["changes"] == ["update_permission_set", "delete_inline_policy_from_permission_set"]
+    client.update_permission_set.assert_not_called()
+    client.delete_inline_policy_from_permission_set.assert_not_called()
+
+
+def test_ensure_permission_set_creates_and_attaches(client, module):
+    client.create_permission_set.return_value = {"PermissionSet": {"PermissionSetArn": PS_ARN}}
+
+    result = permission_set_module.ensure_permission_set(client, module, None, None)
+
+    assert result["permission_set_arn"] == PS_ARN
+    assert result["provisioning_required"] is False
+    assert result["changes"] == [
+        "create_permission_set",
+        "attach_managed_policy_to_permission_set",
+        "attach_customer_managed_policy_reference_to_permission_set",
+        "put_permissions_boundary_to_permission_set",
+        "put_inline_policy_to_permission_set",
+    ]
+    assert client.create_permission_set.call_args[1]["Tags"] == [{"Key": "team", "Value": "storage"}]
+
+
+def test_ensure_permission_set_leaves_unset_session_duration(client, module):
+    client.describe_permission_set.return_value["PermissionSet"]["SessionDuration"] = "PT8H"
+    module.params.update(session_duration=None, managed_policies=None, customer_managed_policies=None,
+                         permissions_boundary=None, inline_policy=None, tags={"team": "storage"}, purge_tags=False)
+
+    result = permission_set_module.ensure_permission_set(client, module, PS_ARN, None)
+
+    assert result["changed"] is False
+    assert result["changes"] == []
+    client.update_permission_set.assert_not_called()
+
+
+def test_ensure_permission_set_creates_with_default_session_duration(client, module):
+    client.create_permission_set.return_value = {"PermissionSet": {"PermissionSetArn": PS_ARN}}
+    module.params["session_duration"] = None
+
+    permission_set_module.ensure_permission_set(client, module, None, None)
+
+    assert client.create_permission_set.call_args[1]["SessionDuration"] == "PT1H"
+    client.update_permission_set.assert_not_called()
+
+
+def test_ensure_permission_set_updates_one_created_since_indexed(client, module):
+    # The index did not know the permission set, created by someone else since
+    client.create_permission_set.side_effect = ClientError(
+        {"Error": {"Code": "ConflictException"}}, "CreatePermissionSet"
+    )
+
+    result = permission_set_module.ensure_permission_set(client, module, None, None)
+
+    client.create_permission_set.assert_called_once()
+    assert result["permission_set_arn"] == PS_ARN
+    assert result["changes"] == [
+        "update_permission_set", "detach_managed_policy_from_permission_set", "untag_resource"
+    ]
+    assert result["provisioning_required"] is True
+    client.update_permission_set.assert_called_once()
@@ -0,0 +1,96 @@
+import gzip
+import json
+from unittest.mock import MagicMock
+
+import plugins.modules.list_users as list_users_module
+
+USERS = [
+    {
+        "UserId": "id-jane",
+        "UserName": "jane",
+        "DisplayName": "Jane Doe",
+        "Emails": [{"Value": "jane@example.com", "Type": "work", "Primary": True}],
+        "IdentityStoreId": "d-1",
+    },
+    {
+        "UserId": "id-john",
+        "UserName": "john",
+        "DisplayName": "John Doe",
+        "IdentityStoreId": "d-1",
+    },
+]
+
+
+def test_collect_users_full_list():
+    key, users = list_users_module.collect_users(USERS, None, "list")
+
+    assert key == "users"
+    assert users[0]["display_name"] == "Jane Doe"
+    assert users[0]["emails"] == [{"value": "jane@example.com", "type": "work", "primary": True}]
+
+
+def test_collect_users_projection():
+    key, users = list_users_module.collect_users(USERS, ["user_name", "emails"], "list")
+
+    assert key == "users"
+    assert users == [
+        {"user_name": "jane", "emails": [{"value": "jane@example.com", "type": "work", "primary": True}]},
+        {"user_name": "john"},
+    ]
+
+
+def test_collect_users_compact():
+    assert list_users_module.collect_users(USERS, ["user_id"], "compact") == \
+        ("user_map", {"jane": "id-jane", "john": "id-john"})
+
+    key, user_map = list_users_module.collect_users(USERS, ["user_id", "display_name"], "compact")
+    assert user_map["john"] == {"user_id": "id-john", "display_name": "John Doe"}
+
+
+def test_export_users_gzip(tmp_path):
+    path = tmp_path / "users.jsonl.gz"
+
+    records = list_users_module.export_users(iter(USERS), str(path), ["user_id", "user_name"], "gzip")
+
+    assert records == 2
+    with gzip.open(path, "rt") as export_file:
+        assert [json.loads(line) for line in export_file] == [
+            {"user_id": "id-jane", "user_name": "jane"},
+            {"user_id": "id-john", "user_name": "john"},
+        ]
+    assert [entry.name for entry in tmp_path.iterdir()] == ["users.jsonl.gz"]
+
+
+def test_lookup_users():
+    client = MagicMock()
+    by_name = {user["UserName"]: user for user in USERS}
+    client.list_users.side_effect = lambda **kwargs: {
+        "Users": [by_name[f["AttributeValue"]] for f in kwargs["Filters"] if f["AttributeValue"] in by_name]
+    }
+
+    users, missing = list_users_module.lookup_users(client, "d-1", ["john", "ghost", "jane", "john"], max_workers=3)
+
+    assert [user["UserName"] for user in users] == ["john", "jane"]
+    assert missing == ["ghost"]
+    assert client.list_users.call_count == 3
+
+
+def test_with_group_memberships():
+    client = MagicMock()
+    client.get_paginator.side_effect = lambda name: {
+        "list_groups": MagicMock(**{"paginate.return_value": [
+            {"Groups": [{"GroupId": "g-dev", "DisplayName": "developers"}, {"GroupId": "g-ops", "DisplayName": "ops"}]}
+        ]}),
+        "list_group_memberships_for_member": MagicMock(**{"paginate.side_effect": lambda **kwargs: [
+            {"GroupMemberships": [{"GroupId": "g-dev"}]},
+            {"GroupMemberships": [{"GroupId": "g-ops"}] if kwargs["MemberId"]["UserId"] == "id-john" else []},
+        ]}),
+    }[name]
+
+    users = list(list_users_module.with_group_memberships(client, "d-1", iter(USERS), max_workers=2, chunk_size=1))
+
+    key, user_map = list_users_module.collect_users(users, ["groups"], "compact")
+    assert user_map == {
+        "jane": [{"group_id": "g-dev", "display_name": "developers"}],
+        "john": [{"group_id": "g-dev", "display_name": "developers"}, {"group_id": "g-ops", "display_name": "ops"}],
+    }
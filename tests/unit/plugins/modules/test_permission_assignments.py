@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+import pytest
+import plugins.modules.permission_assignments as assignments_module
+
+PS_READ = "arn:ps-read"
+PS_ADMIN = "arn:ps-admin"
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    listings = {
+        ("111111111111", PS_READ): [{"PrincipalType": "GROUP", "PrincipalId": "g-dev"}],
+        ("111111111111", PS_ADMIN): [
+            {"PrincipalType": "GROUP", "PrincipalId": "g-ops"},
+            {"PrincipalType": "USER", "PrincipalId": "u-old"},
+        ],
+    }
+
+    def paginate(**kwargs):
+        if "PrincipalId" in kwargs:
+            return [{"AccountAssignments": [
+                {"AccountId": account_id, "PermissionSetArn": permission_set_arn, **principal}
+                for (account_id, permission_set_arn), principals in listings.items() for principal in principals
+                if principal == {"PrincipalType": kwargs["PrincipalType"], "PrincipalId": kwargs["PrincipalId"]}
+            ]}]
+        return [{"AccountAssignments": listings.get((kwargs["AccountId"], kwargs["PermissionSetArn"]), [])}]
+
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.side_effect = paginate
+    client.create_account_assignment.return_value = {
+        "AccountAssignmentCreationStatus": {"Status": "IN_PROGRESS", "RequestId": "r-1"}
+    }
+    client.delete_account_assignment.return_value = {
+        "AccountAssignmentDeletionStatus": {"Status": "IN_PROGRESS", "RequestId": "r-2"}
+    }
+    return client
+
+
+@pytest.fixture(name="module")
+def fixture_module():
+    module = MagicMock()
+    module.check_mode = False
+    module.params = {
+        "instance_arn": "arn:instance",
+        "assignments": [
+            {"target_id": account, "permission_set_arn": PS_READ, "principal_type": "GROUP",
+             "principal_id": "g-dev", "state": "present"}
+            for account in ("111111111111", "222222222222")
+        ] + [
+            {"target_id": "111111111111", "permission_set_arn": PS_ADMIN, "principal_type": "GROUP",
+             "principal_id": "g-ops", "state": "present"},
+        ],
+        "purge": True,
+        "wait": False,
+        "wait_timeout": 300,
+        "max_workers": 4,
+    }
+    return module
+
+
+def test_reconcile_assignments(client, module):
+    assignments_module.reconcile_assignments(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["counts"] == {"created": 1, "deleted": 1, "unchanged": 2, "failed": 0}
+    # One listing per (account, permission set) pair
+    assert client.get_paginator.return_value.paginate.call_count == 3
+    client.create_account_assignment.assert_called_once_with(
+        aws_retry=True, InstanceArn="arn:instance", TargetId="222222222222", TargetType="AWS_ACCOUNT",
+        PermissionSetArn=PS_READ, PrincipalType="GROUP", PrincipalId="g-dev"
+    )
+    assert client.delete_account_assignment.call_args[1]["PrincipalId"] == "u-old"
+
+
+def test_reconcile_assignments_lists_per_principal(client, module):
+    module.params["purge"] = False
+    module.params["assignments"] = [
+        {"target_id": account, "permission_set_arn": permission_set_arn, "principal_type": "GROUP",
+         "principal_id": "g-dev", "state": "present"}
+        for account in ("111111111111", "222222222222", "333333333333") for permission_set_arn in (PS_READ, PS_ADMIN)
+    ]
+
+    assignments_module.reconcile_assignments(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["counts"] == {"created": 5, "deleted": 0, "unchanged": 1, "failed": 0}
+    # One listing for the only principal instead of one per (account, permission set) pair
+    client.get_paginator.assert_called_once_with("list_account_assignments_for_principal")
+
+
+def test_reconcile_assignments_reports_failures(client, module):
+    module.params["purge"] = False
+    client.create_account_assignment.return_value = {
+        "AccountAssignmentCreationStatus": {"Status": "FAILED", "FailureReason": "Account is suspended"}
+    }
+
+    assignments_module.reconcile_assignments(client, module)
+
+    result = module.fail_json.call_args[1]
+    assert result["counts"]["failed"] == 1
+    assert result["failed"][0]["target_id"] == "222222222222"
+    assert "suspended" in result["failed"][0]["msg"]
+
+
+def test_reconcile_assignments_wait(client, module):
+    module.params.update(purge=False, wait=True)
+    client.describe_account_assignment_creation_status.return_value = {
+        "AccountAssignmentCreationStatus": {"RequestId": "r-1", "Status": "FAILED", "FailureReason": "Quota exceeded"}
+    }
+
+    assignments_module.reconcile_assignments(client, module)
+
+    result = module.fail_json.call_args[1]
+    assert result["counts"] == {"created": 0, "deleted": 0, "unchanged": 2, "failed": 1}
+    assert "Quota exceeded" in result["failed"][0]["msg"]
+
+
+def test_reconcile_assignments_ignores_group_inherited_rows(client, module):
+    # The listing of a user includes the assignments of its groups, as rows of the group
+    client.get_paginator.return_value.paginate.side_effect = lambda **kwargs: [{"AccountAssignments": [
+        {"AccountId": account, "PermissionSetArn": PS_READ, "PrincipalType": "GROUP", "PrincipalId": "g-dev"}
+        for account in ("111111111111", "222222222222", "333333333333")
+    ]}]
+    module.params["purge"] = False
+    module.params["assignments"] = [
+        {"target_id": account, "permission_set_arn": PS_READ, "principal_type": "USER",
+         "principal_id": "u-new", "state": "present"}
+        for account in ("111111111111", "222222222222", "333333333333")
+    ]
+
+    assignments_module.reconcile_assignments(client, module)
+
+    result = module.exit_json.call_args[1]
+    client.get_paginator.assert_called_once_with("list_account_assignments_for_principal")
+    assert result["counts"] == {"created": 3, "deleted": 0, "unchanged": 0, "failed": 0}
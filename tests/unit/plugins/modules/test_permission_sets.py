@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+import pytest
+import plugins.modules.permission_sets as permission_sets_module
+
+EXISTING = {
+    "arn:ps-read": {"Name": "ReadOnly", "PermissionSetArn": "arn:ps-read", "SessionDuration": "PT1H"},
+    "arn:ps-ops": {"Name": "Ops", "PermissionSetArn": "arn:ps-ops", "SessionDuration": "PT1H"},
+    "arn:ps-legacy": {"Name": "Legacy", "PermissionSetArn": "arn:ps-legacy", "SessionDuration": "PT1H"},
+}
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    pages = {
+        "list_permission_sets": [{"PermissionSets": list(EXISTING)}],
+        "list_managed_policies_in_permission_set": [{"AttachedManagedPolicies": [
+            {"Arn": "arn:aws:iam::aws:policy/ReadOnlyAccess"}
+        ]}],
+        "list_customer_managed_policy_references_in_permission_set": [{"CustomerManagedPolicyReferences": []}],
+        "list_tags_for_resource": [{"Tags": []}],
+        "list_accounts_for_provisioned_permission_set": [{"AccountIds": ["111111111111"]}],
+    }
+    client = MagicMock()
+    client.get_paginator.side_effect = lambda operation: MagicMock(**{"paginate.return_value": pages[operation]})
+    client.describe_permission_set.side_effect = lambda **kwargs: {
+        "PermissionSet": EXISTING[kwargs["PermissionSetArn"]]
+    }
+    client.get_permissions_boundary_for_permission_set.return_value = {"PermissionsBoundary": {}}
+    client.get_inline_policy_for_permission_set.return_value = {"InlinePolicy": ""}
+    client.create_permission_set.return_value = {"PermissionSet": {"PermissionSetArn": "arn:ps-new"}}
+    client.provision_permission_set.return_value = {
+        "PermissionSetProvisioningStatus": {"RequestId": "r-1", "Status": "SUCCEEDED"}
+    }
+    return client
+
+
+def desired(name, **options):
+    permission_set = dict(
+        name=name, state="present", description=None, session_duration="PT1H", relay_state=None,
+        managed_policies=["arn:aws:iam::aws:policy/ReadOnlyAccess"], customer_managed_policies=None,
+        permissions_boundary=None, inline_policy=None, tags=None, purge_tags=True,
+    )
+    permission_set.update(options)
+    return permission_set
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path):
+    module = MagicMock()
+    module.check_mode = False
+    module.region = "us-east-1"
+    module.params = {
+        "instance_arn": "arn:instance",
+        "permission_sets": [
+            desired("ReadOnly"),
+            desired("Ops", session_duration="PT8H"),
+            desired("New", managed_policies=[]),
+        ],
+        "purge": True,
+        "provision": "outdated",
+        "wait": True,
+        "wait_timeout": 60,
+        "max_workers": 4,
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    return module
+
+
+def test_reconcile_permission_sets_check_mode_plan(client, module):
+    module.check_mode = True
+
+    permission_sets_module.reconcile_permission_sets(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["plan"] == {"create": ["New"], "update": {"Ops": ["update_permission_set"]}, "delete": ["Legacy"]}
+    assert result["counts"] == {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1, "failed": 0}
+    # Each permission set is described once
+    assert client.describe_permission_set.call_count == 3
+    client.update_permission_set.assert_not_called()
+    client.provision_permission_set.assert_not_called()
+
+
+def test_reconcile_permission_sets_applies_and_provisions(client, module):
+    permission_sets_module.reconcile_permission_sets(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["counts"] == {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1, "failed": 0}
+    client.update_permission_set.assert_called_once_with(
+        aws_retry=True, InstanceArn="arn:instance", PermissionSetArn="arn:ps-ops", SessionDuration="PT8H"
+    )
+    client.delete_permission_set.assert_called_once_with(
+        aws_retry=True, InstanceArn="arn:instance", PermissionSetArn="arn:ps-legacy"
+    )
+    # Only the updated permission set is provisioned again
+    client.provision_permission_set.assert_called_once_with(
+        aws_retry=True, InstanceArn="arn:instance", PermissionSetArn="arn:ps-ops", TargetId="111111111111",
+        TargetType="AWS_ACCOUNT"
+    )
+    assert result["provisioning"]["counts"]["SUCCEEDED"] == 1
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock
 import pytest
 import plugins.modules.user as user_module
+from plugins.module_utils.cache import FileCache
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -199,7 +200,43 @@ def test_update_user(ansible_begoingto_module, aws_identity_center_user_module):
     aws_identity_center_user_module.create_or_update_user(client, ansible_begoingto_module)
     result = ansible_begoingto_module.exit_json.call_args[1]
 
+    assert result["changed"] is True
+    assert result["user"]["DisplayName"] == "TestUserUpdated"
+    client.list_users.assert_called_once()
+    operations = client.update_user.call_args[1]["Operations"]
+    assert {"AttributePath": "displayName", "AttributeValue": "TestUserUpdated"} in operations
+    assert "emails" in [operation["AttributePath"] for operation in operations]
+
+
+def test_update_user_unchanged(ansible_begoingto_module, aws_identity_center_user_module):
+    """Test that an up to date user is not written, whatever the order of its emails."""
+    ansible_begoingto_module.params["emails"].append(
+        {"value": "second@example.com", "type": "home", "primary": False}
+    )
+    client = MagicMock()
+    client.list_users.return_value = {
+        "Users": [
+            {
+                "UserId": "test-user-id",
+                "UserName": "begoingtNewoUx",
+                "Name": {"Formatted": "BegoingNew ToxyNew", "FamilyName": "ToxyNew", "GivenName": "BegoingNew"},
+                "DisplayName": "begoingtNewoUx",
+                "Emails": [
+                    {"Value": "second@example.com", "Type": "home", "Primary": False},
+                    {"Value": "begoingtoxuxxnew.me@gmail.com", "Type": "work", "Primary": True}
+                ],
+                "UserType": "DEVELOPER",
+                "IdentityStoreId": "test-identity-store-id"
+            }
+        ]
+    }
+    ansible_begoingto_module.params["user_type"] = "DEVELOPER"
+    aws_identity_center_user_module.create_or_update_user(client, ansible_begoingto_module)
+    result = ansible_begoingto_module.exit_json.call_args[1]
+
     assert result["changed"] is False
+    client.update_user.assert_not_called()
+    client.list_users.assert_called_once()
 
 # def test_delete_user(ansible_begoingto_module, aws_identity_center_user_module):
 #     """Test deleting an existing user (state=absent)."""
@@ -257,4 +294,32 @@ def test_update_user(ansible_begoingto_module, aws_identity_center_user_module):
 #     )
 #     client.delete_user.assert_not_called()
 #     client.create_user.assert_not_called()
-#     client.update_user.assert_not_called()
\ No newline at end of file
+#     client.update_user.assert_not_called()
+
+
+def test_delete_user_by_name(ansible_begoingto_module, aws_identity_center_user_module, tmp_path):
+    """state=absent resolves the user from user_name alone."""
+    ansible_begoingto_module.params = {
+        "identity_store_id": "test-identity-store-delete",
+        "user_name": "leaver",
+        "state": "absent",
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    cache = FileCache("idc_id", cache_dir=str(tmp_path))
+    cache.set("test-identity-store-delete|user|leaver", "leaver-id")
+    client = MagicMock()
+    client.get_user_id.return_value = {"UserId": "leaver-id"}
+
+    aws_identity_center_user_module.delete_user(client, ansible_begoingto_module)
+
+    client.get_user_id.assert_called_once_with(
+        IdentityStoreId="test-identity-store-delete",
+        AlternateIdentifier={"UniqueAttribute": {"AttributePath": "userName", "AttributeValue": "leaver"}}
+    )
+    client.delete_user.assert_called_once_with(IdentityStoreId="test-identity-store-delete", UserId="leaver-id")
+    client.list_users.assert_not_called()
+    assert ansible_begoingto_module.exit_json.call_args[1]["changed"] is True
+    # The idc_id lookup no longer resolves the deleted user from its cache file
+    assert cache.get("test-identity-store-delete|user|leaver") is None
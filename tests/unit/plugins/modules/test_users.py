@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock
+import pytest
+import plugins.modules.users as users_module
+from plugins.module_utils.cache import FileCache
+
+
+def desired_user(user_name, display_name, state="present"):
+    return {
+        "user_name": user_name,
+        "name": {"formatted": display_name, "family_name": "Doe", "given_name": display_name.split()[0]},
+        "display_name": display_name,
+        "emails": [{"value": f"{user_name}@example.com", "type": "work", "primary": True}],
+        "user_type": None,
+        "state": state,
+    }
+
+
+def existing_user(user_name, display_name, user_id):
+    return {
+        "UserId": user_id,
+        "UserName": user_name,
+        "Name": {"Formatted": display_name, "FamilyName": "Doe", "GivenName": display_name.split()[0]},
+        "DisplayName": display_name,
+        "Emails": [{"Value": f"{user_name}@example.com", "Type": "work", "Primary": True}],
+    }
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"Users": [existing_user("jane", "Jane Doe", "id-jane"), existing_user("john", "John Doe", "id-john")]},
+        {"Users": [existing_user("old", "Old Doe", "id-old")]},
+    ]
+    client.create_user.return_value = {"UserId": "id-new"}
+    return client
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path):
+    module = MagicMock()
+    module.check_mode = False
+    module.params = {
+        "identity_store_id": "test-identity-store-id",
+        "users": [
+            desired_user("jane", "Jane Doe"),
+            desired_user("john", "Johnny Doe"),
+            desired_user("new", "New Doe"),
+        ],
+        "purge": False,
+        "max_workers": 4,
+        "cache": True,
+        "cache_ttl": 60,
+        "cache_dir": str(tmp_path),
+    }
+    return module
+
+
+def test_reconcile_users(client, module):
+    users_module.reconcile_users(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["changed"] is True
+    assert result["counts"] == {"created": 1, "updated": 1, "deleted": 0, "unchanged": 1, "failed": 0}
+    assert [user["action"] for user in result["users"]] == ["unchanged", "updated", "created"]
+    client.get_paginator.assert_called_once_with("list_users")
+    client.create_user.assert_called_once()
+    assert client.update_user.call_args[1]["UserId"] == "id-john"
+    client.delete_user.assert_not_called()
+
+
+def test_reconcile_users_purge_and_absent(client, module, tmp_path):
+    module.params["users"] = [desired_user("jane", "Jane Doe"), desired_user("john", "John Doe", state="absent")]
+    module.params["purge"] = True
+    cache = FileCache("idc_id", cache_dir=str(tmp_path))
+    cache.set_many({"test-identity-store-id|user|jane": "id-jane", "test-identity-store-id|user|john": "id-john",
+                    "test-identity-store-id|user|old": "id-old"})
+
+    users_module.reconcile_users(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["counts"]["deleted"] == 2
+    deleted = sorted(call[1]["UserId"] for call in client.delete_user.call_args_list)
+    assert deleted == ["id-john", "id-old"]
+    # The idc_id lookup no longer resolves the deleted users from its cache file
+    assert cache.get_many(["test-identity-store-id|user|jane", "test-identity-store-id|user|john",
+                           "test-identity-store-id|user|old"]) == {"test-identity-store-id|user|jane": "id-jane"}
+
+
+def test_reconcile_users_check_mode(client, module):
+    module.check_mode = True
+
+    users_module.reconcile_users(client, module)
+
+    result = module.exit_json.call_args[1]
+    assert result["counts"]["created"] == 1
+    client.create_user.assert_not_called()
+    client.update_user.assert_not_called()
+
+
+def test_reconcile_users_reports_failures(client, module):
+    client.create_user.side_effect = Exception("throttled")
+
+    users_module.reconcile_users(client, module)
+
+    result = module.fail_json.call_args[1]
+    assert result["counts"]["failed"] == 1
+    assert result["users"][2]["action"] == "failed"